@@ -2,8 +2,8 @@ from datetime import datetime
 from typing import Any, Dict
 import json
 import os
-import httpx
 from common.signing import signer
+from common.http import http_clients
 
 
 class AuditLogger:
@@ -53,12 +53,12 @@ class AuditLogger:
             return
 
         try:
-            async with httpx.AsyncClient(timeout=10) as client:
-                await client.post(
-                    f"{backend_url}/internal/audit/events",
-                    headers={"x-internal-token": internal_token},
-                    json=log_entry,
-                )
+            await http_clients.get(backend_url).post(
+                f"{backend_url}/internal/audit/events",
+                headers={"x-internal-token": internal_token},
+                json=log_entry,
+                timeout=10,
+            )
         except Exception:
             # best-effort only; local JSONL remains authoritative fallback
             return
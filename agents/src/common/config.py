@@ -33,3 +33,23 @@ class Settings(BaseSettings):
 
 
 settings = Settings()
+
+# The repository checkout's registry, next to agents/
+_REPO_POLICY_REGISTRY = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "policy-registry"
+)
+
+
+def policy_registry_path() -> str:
+    """
+    The Policy Registry directory: ``POLICY_REGISTRY_PATH`` if set, else the
+    first that exists of ./policy-registry, the repository checkout's and
+    /policy-registry (where docker-compose mounts it).
+    """
+    configured = os.getenv("POLICY_REGISTRY_PATH")
+    if configured:
+        return configured
+    for path in ("policy-registry", _REPO_POLICY_REGISTRY, "/policy-registry"):
+        if os.path.isdir(path):
+            return os.path.normpath(path)
+    return "policy-registry"
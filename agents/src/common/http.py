@@ -0,0 +1,82 @@
+import asyncio
+import importlib.util
+import os
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+# HTTP/2 support in httpx needs the optional 'h2' package
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+
+class HTTPClientManager:
+    """
+    Process-wide pool of keep-alive ``httpx.AsyncClient`` instances.
+
+    Agents talk to the same few hosts (backend, MESOB) over and over; a fresh
+    client per call meant a new TCP/TLS handshake for every audit event.
+    Clients are shared per host, so each host gets its own connection limit,
+    and per event loop, because httpx connection pools cannot cross loops.
+    HTTP/2 is used when enabled and the optional ``h2`` package is installed.
+    """
+
+    def __init__(
+        self,
+        max_connections_per_host: Optional[int] = None,
+        max_keepalive_per_host: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+    ):
+        self.max_connections_per_host = max_connections_per_host or int(
+            os.getenv("HTTP_MAX_CONNECTIONS_PER_HOST", "20")
+        )
+        self.max_keepalive_per_host = max_keepalive_per_host or int(
+            os.getenv("HTTP_MAX_KEEPALIVE_PER_HOST", "10")
+        )
+        self.keepalive_expiry = keepalive_expiry or float(
+            os.getenv("HTTP_KEEPALIVE_EXPIRY_SECONDS", "30")
+        )
+        if http2 is None:
+            http2 = os.getenv("HTTP_CLIENT_HTTP2", "false").lower() == "true"
+        if http2 and not HTTP2_AVAILABLE:
+            print("[HTTP] HTTP/2 requested but 'h2' is not installed; using HTTP/1.1")
+            http2 = False
+        self.http2 = http2
+        # event loop -> {scheme://host: client}
+        self._clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def _host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Returns the shared client for the host of ``url``."""
+        loop = asyncio.get_running_loop()
+        clients: Dict[str, httpx.AsyncClient] = self._clients.setdefault(loop, {})
+        key = self._host_key(url)
+        client = clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections_per_host,
+                    max_keepalive_connections=self.max_keepalive_per_host,
+                    keepalive_expiry=self.keepalive_expiry,
+                ),
+                timeout=30,
+            )
+            clients[key] = client
+        return client
+
+    async def aclose(self):
+        """Closes the clients owned by the running event loop."""
+        loop = asyncio.get_running_loop()
+        clients = self._clients.pop(loop, {})
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientManager()
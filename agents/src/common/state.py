@@ -18,10 +18,19 @@ class AgentState(TypedDict):
     document_id: str
     # Path to original file in storage
     file_path: str
+    # SHA-256 of the document bytes (content-addressed cache key)
+    document_sha256: str
+    # Playbook selection and service context for compliance evaluation
+    jurisdiction_key: str
+    process_id: str
+    service: str
+    action: str
     # Extracted data (masked for safety)
     extracted_data: Dict[str, Any]
     # Compliance findings
     findings: List[Dict[str, Any]]
+    # Deterministic ComplianceReport (status, readiness_score, issues)
+    compliance_report: Dict[str, Any]
     # Privacy/Safety status
     pii_masked: bool
     # Confidence scores for various stages
@@ -52,6 +52,10 @@ class DeterministicComplianceEngine:
                 }
             )
 
+        # Image-quality warnings raised by the pre-OCR quality gate
+        quality = extracted_data.get("quality") or {}
+        issues.extend(quality.get("issues") or [])
+
         # Simple quality checks from extracted_data.features
         features = extracted_data.get("features") or {}
         if features.get("has_stamp") is False:
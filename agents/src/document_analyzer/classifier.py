@@ -0,0 +1,123 @@
+import os
+import sys
+import functools
+import numpy as np
+from PIL import Image
+from typing import Dict, Any, List, Optional, Tuple
+from document_analyzer.templates import (
+    TemplateRegistry,
+    extract_fields,
+    template_registry,
+)
+from vision_router.preprocess import prepare_image
+
+# The page is reduced to a GRID x GRID ink-density map; each bit says whether
+# a cell is darker than the page's median cell. Headers, tables, photo boxes
+# and seals land in the same cells on every copy of a form, while names and
+# numbers filled into it move only a few bits.
+FINGERPRINT_GRID = 16
+FINGERPRINT_BITS = FINGERPRINT_GRID * FINGERPRINT_GRID
+
+# Largest Hamming distance (in bits) still accepted as the same layout.
+MAX_FINGERPRINT_DISTANCE = int(os.getenv("DOCUMENT_CLASSIFIER_MAX_DISTANCE", "40"))
+
+CLASSIFIER_ENABLED = os.getenv("DOCUMENT_CLASSIFIER", "true").lower() != "false"
+
+# When a page matches a template with field regions, OCR only those regions.
+TEMPLATE_FAST_PATH = os.getenv("TEMPLATE_FAST_PATH", "true").lower() != "false"
+
+
+def layout_fingerprint(image: Image.Image) -> np.ndarray:
+    """
+    Layout fingerprint of an OCR-ready (cropped, deskewed) page: a boolean
+    GRID x GRID map of the cells darker than the median cell.
+    """
+    gray = image if image.mode == "L" else image.convert("L")
+    # Integer reduce first so the box filter only touches a small image
+    factor = max(1, min(gray.size) // (FINGERPRINT_GRID * 4))
+    if factor > 1:
+        gray = gray.reduce(factor)
+    grid = np.asarray(
+        gray.resize((FINGERPRINT_GRID, FINGERPRINT_GRID), Image.Resampling.BOX),
+        dtype=np.float32,
+    )
+    return grid < np.median(grid)
+
+
+def fingerprint_hex(bits: np.ndarray) -> str:
+    return np.packbits(bits.ravel()).tobytes().hex()
+
+
+def fingerprint_bits(value: str) -> np.ndarray:
+    bits = np.unpackbits(np.frombuffer(bytes.fromhex(value), dtype=np.uint8))
+    return bits[:FINGERPRINT_BITS].astype(bool)
+
+
+class TemplateIndex:
+    """
+    Reference fingerprints of every template in the registry, stacked into
+    one matrix so a page is matched against all of them with one XOR.
+    """
+
+    def __init__(self, registry: TemplateRegistry):
+        self.registry = registry
+        ids: List[str] = []
+        rows: List[np.ndarray] = []
+        for template in registry.all():
+            for value in template.fingerprints:
+                try:
+                    rows.append(fingerprint_bits(value))
+                    ids.append(template.id)
+                except ValueError as e:
+                    print(f"[CLASSIFIER] Bad fingerprint in {template.id}: {e}")
+        self.template_ids = ids
+        self.fingerprints = (
+            np.stack(rows) if rows else np.zeros((0, FINGERPRINT_BITS), dtype=bool)
+        )
+
+    def nearest(self, bits: np.ndarray) -> Optional[Tuple[str, int]]:
+        if not self.template_ids:
+            return None
+        distances = np.count_nonzero(self.fingerprints != bits.ravel(), axis=1)
+        best = int(np.argmin(distances))
+        return self.template_ids[best], int(distances[best])
+
+
+@functools.lru_cache(maxsize=None)
+def _index(registry: TemplateRegistry) -> TemplateIndex:
+    return TemplateIndex(registry)
+
+
+def classify_page(
+    image: Image.Image, registry: Optional[TemplateRegistry] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Matches an OCR-ready page against the known templates before any OCR.
+
+    Returns {"template_id", "document_type", "distance"} for the closest
+    template within ``MAX_FINGERPRINT_DISTANCE``, or None. With
+    ``TEMPLATE_FAST_PATH`` the match also carries a ``field_extractor``
+    that OCRs only the template's field regions.
+    """
+    if not CLASSIFIER_ENABLED:
+        return None
+    registry = registry or template_registry
+    nearest = _index(registry).nearest(layout_fingerprint(image))
+    if nearest is None or nearest[1] > MAX_FINGERPRINT_DISTANCE:
+        return None
+    template = registry.get(nearest[0])
+    match: Dict[str, Any] = {
+        "template_id": template.id,
+        "document_type": template.document_type,
+        "distance": nearest[1],
+    }
+    if TEMPLATE_FAST_PATH and template.fields:
+        match["field_extractor"] = functools.partial(extract_fields, template)
+    return match
+
+
+if __name__ == "__main__":
+    # Prints the fingerprint of reference scans, for a template's ``fingerprints``
+    for path in sys.argv[1:]:
+        page = prepare_image(Image.open(path))["ocr_image"]
+        print(f"{path}: {fingerprint_hex(layout_fingerprint(page))}")
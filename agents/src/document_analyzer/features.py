@@ -0,0 +1,206 @@
+import numpy as np
+from typing import Dict, Tuple
+from vision_router.preprocess import otsu_threshold, to_grayscale
+
+# Detectors sample the page down to this long edge (~70 DPI for A4) with a
+# strided view; stamps and signatures are large enough to survive it.
+DETECT_LONG_EDGE = 800
+
+# Ink colour masks (0-255 channel differences). Ethiopian office stamps are
+# blue, violet or red; black/grey print has near-zero chroma.
+STAMP_MIN_CHANNEL_LEAD = 40
+STAMP_CELL = 4
+STAMP_CELL_MIN_INK = 0.08
+# A stamp is roughly round or square, at least ~1.5 cm across on A4, and its
+# ring plus inner lettering fills a fair share of its box.
+STAMP_MIN_SIZE = 0.07
+STAMP_MAX_SIZE = 0.45
+STAMP_MAX_ASPECT = 1.8
+STAMP_MIN_FILL = 0.1
+# Solid blocks of colour (logos, highlighted cells) are not stamps
+STAMP_MAX_FILL = 0.7
+
+# A signature is a stroke cluster much taller than a printed line, wider
+# than tall, and sparse: the pen covers little of its bounding box.
+SIGNATURE_CELL = 3
+SIGNATURE_MIN_HEIGHT_RATIO = 2.2
+SIGNATURE_MIN_ASPECT = 1.2
+SIGNATURE_MAX_ASPECT = 10.0
+SIGNATURE_MIN_FILL = 0.04
+SIGNATURE_MAX_FILL = 0.40
+SIGNATURE_MAX_WIDTH = 0.6
+# Tables and boxes are ruled with straight lines spanning their whole width
+SIGNATURE_MAX_STRAIGHT = 0.8
+
+
+def _sample(rgb: np.ndarray) -> np.ndarray:
+    """Strided subsample to ~DETECT_LONG_EDGE; a no-op on already small pages."""
+    step = max(1, max(rgb.shape[:2]) // DETECT_LONG_EDGE)
+    if step == 1:
+        return rgb
+    return np.ascontiguousarray(rgb[::step, ::step])
+
+
+def _cells(mask: np.ndarray, cell: int, min_share: float) -> np.ndarray:
+    """Marks ``cell`` x ``cell`` blocks where at least ``min_share`` of pixels are set."""
+    height = mask.shape[0] // cell * cell
+    width = mask.shape[1] // cell * cell
+    blocks = mask[:height, :width].reshape(height // cell, cell, width // cell, cell)
+    counts = blocks.sum(axis=(1, 3), dtype=np.uint16)
+    return counts >= max(1, int(np.ceil(min_share * cell * cell)))
+
+
+def connected_components(mask: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    8-connected components of a boolean mask, vectorized over row runs:
+    runs that touch in adjacent rows are merged by min-label propagation
+    with pointer jumping. Returns per-component area, bounding box (top,
+    left, bottom, right; exclusive) and longest horizontal run.
+    """
+    empty = {
+        k: np.zeros(0, dtype=np.int64)
+        for k in ("area", "top", "left", "bottom", "right", "longest_run")
+    }
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    start_rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    n = len(starts)
+    if n == 0:
+        return empty
+
+    # Runs are in (row, start) order; key them by position on one long line
+    stride = width + 2
+    start_keys = start_rows * stride + starts
+    end_keys = start_rows * stride + ends
+
+    # For each run, the runs in the previous row overlapping [start-1, end+1)
+    lo = np.searchsorted(end_keys, start_keys - stride, side="left")
+    hi = np.searchsorted(start_keys, end_keys - stride + 1, side="left")
+    row_first = np.searchsorted(start_rows, start_rows - 1, side="left")
+    row_last = np.searchsorted(start_rows, start_rows - 1, side="right")
+    lo = np.maximum(lo, row_first)
+    hi = np.minimum(hi, row_last)
+    counts = np.maximum(hi - lo, 0)
+    a = np.repeat(np.arange(n), counts)
+    b = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+
+    labels = np.arange(n)
+    while True:
+        merged = np.minimum(labels[a], labels[b])
+        updated = labels.copy()
+        np.minimum.at(updated, a, merged)
+        np.minimum.at(updated, b, merged)
+        updated = updated[updated]
+        if np.array_equal(updated, labels):
+            break
+        labels = updated
+
+    roots, comp = np.unique(labels, return_inverse=True)
+    k = len(roots)
+    top = np.full(k, height, dtype=np.int64)
+    left = np.full(k, width, dtype=np.int64)
+    bottom = np.zeros(k, dtype=np.int64)
+    right = np.zeros(k, dtype=np.int64)
+    np.minimum.at(top, comp, start_rows)
+    np.minimum.at(left, comp, starts)
+    np.maximum.at(bottom, comp, start_rows + 1)
+    np.maximum.at(right, comp, ends)
+    lengths = ends - starts
+    longest_run = np.zeros(k, dtype=np.int64)
+    np.maximum.at(longest_run, comp, lengths)
+    area = np.bincount(comp, weights=lengths, minlength=k).astype(np.int64)
+    return {
+        "area": area,
+        "top": top,
+        "left": left,
+        "bottom": bottom,
+        "right": right,
+        "longest_run": longest_run,
+    }
+
+
+def _boxes(
+    components: Dict[str, np.ndarray],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    h = components["bottom"] - components["top"]
+    w = components["right"] - components["left"]
+    fill = components["area"] / np.maximum(h * w, 1)
+    return h, w, fill
+
+
+def stamp_ink(rgb: np.ndarray) -> np.ndarray:
+    """Blue, violet and red ink: one channel clearly leads the other two."""
+    r, g, b = (rgb[..., i].astype(np.int16) for i in range(3))
+    lead = STAMP_MIN_CHANNEL_LEAD
+    blue = b - np.maximum(r, g) >= lead
+    red = r - np.maximum(g, b) >= lead
+    violet = np.minimum(r, b) - g >= lead
+    return blue | red | violet
+
+
+def detect_stamp(rgb: np.ndarray) -> bool:
+    """A compact, roughly round blob of stamp-coloured ink."""
+    sample = _sample(rgb)
+    cells = _cells(stamp_ink(sample), STAMP_CELL, STAMP_CELL_MIN_INK)
+    if not cells.any():
+        return False
+    h, w, fill = _boxes(connected_components(cells))
+    short_edge = min(cells.shape)
+    size = np.maximum(h, w)
+    aspect = np.maximum(h, w) / np.maximum(np.minimum(h, w), 1)
+    return bool(
+        np.any(
+            (size >= STAMP_MIN_SIZE * short_edge)
+            & (size <= STAMP_MAX_SIZE * short_edge)
+            & (aspect <= STAMP_MAX_ASPECT)
+            & (fill >= STAMP_MIN_FILL)
+            & (fill <= STAMP_MAX_FILL)
+        )
+    )
+
+
+def detect_signature(rgb: np.ndarray) -> bool:
+    """
+    A handwritten stroke cluster: connected ink much taller than the median
+    printed line, wider than tall and sparse (low stroke density).
+    """
+    sample = _sample(rgb)
+    gray = to_grayscale(sample)
+    ink = gray <= otsu_threshold(gray)
+    cells = _cells(ink, SIGNATURE_CELL, 0.0)
+    if not cells.any():
+        return False
+    components = connected_components(cells)
+    h, w, fill = _boxes(components)
+    # Median height of text-sized blobs; specks don't count
+    sized = h[components["area"] >= 4]
+    if len(sized) == 0:
+        return False
+    line_height = max(float(np.median(sized)), 1.0)
+    aspect = w / np.maximum(h, 1)
+    return bool(
+        np.any(
+            (h >= SIGNATURE_MIN_HEIGHT_RATIO * line_height)
+            & (aspect >= SIGNATURE_MIN_ASPECT)
+            & (aspect <= SIGNATURE_MAX_ASPECT)
+            & (fill >= SIGNATURE_MIN_FILL)
+            & (fill <= SIGNATURE_MAX_FILL)
+            & (w <= SIGNATURE_MAX_WIDTH * cells.shape[1])
+            & (components["longest_run"] <= SIGNATURE_MAX_STRAIGHT * w)
+        )
+    )
+
+
+def detect_features(rgb: np.ndarray) -> Dict[str, bool]:
+    """
+    Feature flags for one page, computed on the downscaled RGB array the OCR
+    pass already decoded. Module-level so it can be sent to the OCR pool.
+    """
+    sample = _sample(rgb)
+    return {
+        "has_stamp": detect_stamp(sample),
+        "has_signature": detect_signature(sample),
+    }
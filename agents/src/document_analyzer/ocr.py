@@ -1,7 +1,11 @@
-import pytesseract
 from PIL import Image
+import functools
 import io
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from document_analyzer.classifier import classify_page
+from document_analyzer.features import detect_features
+from document_analyzer.templates import template_registry, extract_fields
+from vision_router.analysis import DocumentAnalysis, analyze_image
 
 
 class DocumentAnalyzer:
@@ -10,47 +14,92 @@ class DocumentAnalyzer:
     and feature detection (stamps, signatures).
     """
 
-    def analyze(self, image_bytes: bytes) -> Dict[str, Any]:
-        """Analyzes a document image and extracts structured data."""
+    FIELDS = ["document_number", "expiry_date", "full_name"]
+
+    def analyze(
+        self, image_bytes: bytes, template_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Analyzes a document image and extracts structured data. With a known
+        ``template_id``, or a page whose layout matches a template, only the
+        template's field regions are OCRed.
+        """
         try:
             image = Image.open(io.BytesIO(image_bytes))
+            template = template_registry.get(template_id) if template_id else None
+            field_extractor = (
+                functools.partial(extract_fields, template) if template else None
+            )
 
-            # 1. Base OCR
-            text = pytesseract.image_to_string(image, lang="eng+amh")
-
-            # 2. Mock Layout & Feature Detection
-            # In production, these would use specialized models like LayoutLM or YOLO
-            has_stamp = self._detect_stamps(image)
-            has_signature = self._detect_signatures(image)
-
-            # 3. Extract Fields (Mocked extraction logic)
-            fields = {
-                "document_number": self._extract_field(text, "number"),
-                "expiry_date": self._extract_field(text, "expiry"),
-                "full_name": self._extract_field(text, "name"),
-            }
-
-            return {
-                "raw_text": text,
-                "fields": fields,
-                "features": {"has_stamp": has_stamp, "has_signature": has_signature},
-                "confidence": {"text": 0.88, "layout": 0.75},
-                "readiness_score": 0.85 if has_stamp and has_signature else 0.5,
-            }
+            # 1. Single pass over the page: preprocessing, OCR (language pack
+            #    chosen by script detection) and feature detection together
+            page = analyze_image(
+                image,
+                feature_detector=detect_features,
+                field_extractor=field_extractor,
+                classifier=classify_page,
+            )
+            return self.analyze_document(
+                DocumentAnalysis(pages=[page]), template_id=template_id
+            )
         except Exception as e:
             return {"error": str(e), "readiness_score": 0}
 
-    def _detect_stamps(self, image: Image.Image) -> bool:
-        # Placeholder for computer vision stamp detection
-        return True
+    def analyze_document(
+        self, analysis: DocumentAnalysis, template_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Builds the structured result from an existing analysis (e.g. the one
+        the vision router produced) without decoding or OCRing again. Fields
+        of a document of known template (given or classified) are read with
+        that template's patterns only.
+        """
+        text = analysis.raw_text
+        template_id = template_id or next(
+            (p.template_id for p in analysis.pages if p.template_id), None
+        )
+        features = analysis.features
+        has_stamp = features.get("has_stamp", False)
+        has_signature = features.get("has_signature", False)
+
+        # 2. Fields: read from template regions if that path ran, otherwise
+        #    matched against the full page text
+        extracted = analysis.fields
+        fields = {
+            name: extracted[name]["value"]
+            if name in extracted
+            else self._extract_field(text, name, template_id)
+            for name in self.FIELDS
+        }
 
-    def _detect_signatures(self, image: Image.Image) -> bool:
-        # Placeholder for computer vision signature detection
-        return True
+        return {
+            "raw_text": text,
+            "ocr_lang": analysis.pages[0].lang if analysis.pages else None,
+            "document_type": next(iter(analysis.document_types), None),
+            "fields": fields,
+            "features": {"has_stamp": has_stamp, "has_signature": has_signature},
+            "confidence": {
+                "text": analysis.confidence,
+                "layout": 0.75,
+                "fields": {
+                    name: extracted[name]["confidence"]
+                    if name in extracted
+                    else analysis.field_confidence(value)
+                    for name, value in fields.items()
+                },
+            },
+            "readiness_score": 0.85 if has_stamp and has_signature else 0.5,
+        }
 
-    def _extract_field(self, text: str, field_type: str) -> str:
-        # Placeholder for regex/NLP field extraction
-        return "EXTRACTED_VALUE"
+    def _extract_field(
+        self, text: str, field: str, template_id: Optional[str] = None
+    ) -> Optional[str]:
+        """First match of the template's (or any template's) pattern for ``field``."""
+        for spec in template_registry.field_specs(field, template_id):
+            value = spec.match(text)
+            if value:
+                return value
+        return None
 
 
 document_analyzer = DocumentAnalyzer()
@@ -0,0 +1,145 @@
+import os
+import re
+import yaml
+from PIL import Image
+from pydantic import BaseModel, Field, PrivateAttr
+from typing import Dict, Any, List, Optional, Tuple
+from common.config import policy_registry_path
+from vision_router.confidence import field_confidence, mean_confidence
+from vision_router.script import COMBINED_LANG, ocr_image
+
+
+class FieldSpec(BaseModel):
+    """One field on a document template: where it is and how to read it."""
+
+    region: Tuple[float, float, float, float]
+    pattern: str
+    lang: Optional[str] = None
+
+    _regex: re.Pattern = PrivateAttr()
+
+    def model_post_init(self, __context: Any):
+        # Compiled once when the template loads, not per page
+        self._regex = re.compile(self.pattern, re.IGNORECASE)
+
+    def match(self, text: str) -> Optional[str]:
+        found = self._regex.search(text)
+        if found is None:
+            return None
+        value = found.groupdict().get("value") or found.group(0)
+        return value.strip()
+
+
+class DocumentTemplate(BaseModel):
+    id: str
+    document_type: str
+    title: Optional[str] = None
+    version: Optional[str] = None
+    fields: Dict[str, FieldSpec] = Field(default_factory=dict)
+    # Layout fingerprints (hex) of reference scans; see document_analyzer.classifier
+    fingerprints: List[str] = Field(default_factory=list)
+
+
+class TemplateRegistry:
+    """
+    Document templates stored alongside the playbooks in the Policy Registry
+    (``<registry>/templates/*.yaml``). Loaded and compiled once.
+    """
+
+    def __init__(self, registry_path: str = "policy-registry"):
+        self.registry_path = registry_path
+        self._templates: Optional[Dict[str, DocumentTemplate]] = None
+
+    def _load(self) -> Dict[str, DocumentTemplate]:
+        if self._templates is None:
+            templates = {}
+            directory = os.path.join(self.registry_path, "templates")
+            if os.path.isdir(directory):
+                for name in sorted(os.listdir(directory)):
+                    if not name.endswith((".yaml", ".yml")):
+                        continue
+                    try:
+                        with open(os.path.join(directory, name), "r") as f:
+                            template = DocumentTemplate(**yaml.safe_load(f))
+                        templates[template.id] = template
+                    except Exception as e:
+                        print(f"[TEMPLATES] Error loading {name}: {e}")
+            self._templates = templates
+        return self._templates
+
+    def get(self, template_id: str) -> Optional[DocumentTemplate]:
+        return self._load().get(template_id)
+
+    def all(self) -> List[DocumentTemplate]:
+        return list(self._load().values())
+
+    def field_specs(
+        self, field: str, template_id: Optional[str] = None
+    ) -> List[FieldSpec]:
+        """
+        Specs for ``field``, for whole-page extraction: the classified
+        template's only when ``template_id`` is known (another template's
+        pattern would read a TIN as a license number), else every template's.
+        """
+        if template_id is not None:
+            template = self.get(template_id)
+            if template is not None:
+                return [template.fields[field]] if field in template.fields else []
+        return [t.fields[field] for t in self._load().values() if field in t.fields]
+
+
+def _crop(image: Image.Image, region: Tuple[float, float, float, float]) -> Image.Image:
+    left, top, right, bottom = region
+    width, height = image.size
+    return image.crop(
+        (
+            int(left * width),
+            int(top * height),
+            max(int(left * width) + 1, int(right * width)),
+            max(int(top * height) + 1, int(bottom * height)),
+        )
+    )
+
+
+def extract_fields(template: DocumentTemplate, image: Image.Image) -> Dict[str, Any]:
+    """
+    Template fast path: OCRs only the template's field regions of the
+    (preprocessed) page and applies each field's compiled pattern.
+
+    Returns the OCR result for the regions in the shape ``ocr_image``
+    produces (text, words in page coordinates, confidence, passes) plus
+    ``fields``: name -> {"value", "confidence"}.
+    """
+    words: List[Dict[str, Any]] = []
+    texts: List[str] = []
+    fields: Dict[str, Dict[str, Any]] = {}
+    passes = 0
+    langs = set()
+    width, height = image.size
+    for name, spec in template.fields.items():
+        ocr = ocr_image(_crop(image, spec.region), spec.lang)
+        passes += ocr["passes"]
+        langs.add(ocr["lang"])
+        dx, dy = int(spec.region[0] * width), int(spec.region[1] * height)
+        region_words = [
+            {**w, "left": w.get("left", 0) + dx, "top": w.get("top", 0) + dy}
+            for w in ocr["words"]
+        ]
+        words.extend(region_words)
+        texts.append(ocr["text"])
+        value = spec.match(ocr["text"])
+        fields[name] = {
+            "value": value,
+            "confidence": field_confidence(region_words, value) if value else None,
+        }
+    return {
+        "text": "\n\n".join(t for t in texts if t),
+        "lang": langs.pop() if len(langs) == 1 else COMBINED_LANG,
+        "confidence": mean_confidence(words),
+        "words": words,
+        "passes": passes,
+        "fields": fields,
+    }
+
+
+template_registry = TemplateRegistry(policy_registry_path())
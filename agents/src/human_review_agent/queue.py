@@ -1,8 +1,10 @@
 from typing import Dict, Any
-import httpx
 import os
+import copy
 from common.state import AgentState
+from common.http import http_clients
 from audit_agent.activity import audit_logger
+from safety_agent.masking import safety_agent
 
 
 class HumanReviewAgent:
@@ -15,11 +17,17 @@ class HumanReviewAgent:
         """
         Submits a document processing state to the human review queue via Backend API.
         """
+        extracted_data = state.get("extracted_data") or {}
+        if not state.get("pii_masked"):
+            # Escalated straight from OCR, before the safety node ran; the
+            # span index under "pii" tells the reviewer what was redacted
+            extracted_data = copy.deepcopy(extracted_data)
+            extracted_data.update(safety_agent.extract_and_mask(extracted_data))
         queue_item = {
             "document_id": state.get("document_id"),
             "file_path": state.get("file_path"),
             "reason": reason,
-            "extracted_data": state.get("extracted_data"),
+            "extracted_data": extracted_data,
             "status": "PENDING_REVIEW",
         }
 
@@ -34,12 +42,11 @@ class HumanReviewAgent:
         try:
             # Note: BACKEND_URL needs to be in settings. Using a placeholder for now.
             backend_url = os.getenv("BACKEND_API_URL", "http://localhost:3000/v1")
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{backend_url}/review/submit", json=queue_item
-                )
-                response.raise_for_status()
-                print(f"[HUMAN REVIEW] Submitted to backend: {response.status_code}")
+            response = await http_clients.get(backend_url).post(
+                f"{backend_url}/review/submit", json=queue_item, timeout=5
+            )
+            response.raise_for_status()
+            print(f"[HUMAN REVIEW] Submitted to backend: {response.status_code}")
         except Exception as e:
             print(f"[HUMAN REVIEW ERROR] Failed to submit to backend: {e}")
             # Fallback: In a real system, we might use a local queue/retry mechanism
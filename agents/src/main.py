@@ -1,12 +1,20 @@
 import asyncio
 import os
+from typing import Dict, List
 from temporalio.client import Client
 from temporalio.worker import Worker, UnsandboxedWorkflowRunner
 from policy_research_agent.workflows import ResearchWorkflow
 from orchestrator.document_analysis_workflow import (
+    ANALYSIS_STAGES,
+    ANALYSIS_STAGE_ACTIVITIES,
     DocumentAnalysisWorkflow,
     run_document_analysis,
+    spool_dir,
+    stage_max_concurrency,
+    stage_task_queue,
 )
+from vision_router.executor import ocr_executor
+from common.http import http_clients
 
 
 async def main():
@@ -16,16 +24,67 @@ async def main():
         raise RuntimeError("TEMPORAL_HOST must be set in production.")
     client = await Client.connect(temporal_host)
 
-    # Run the worker with unsandboxed runner for complex agentic workflows
-    worker = Worker(
-        client,
-        task_queue=os.getenv("TEMPORAL_TASK_QUEUE", "govassist-tasks"),
-        workflows=[ResearchWorkflow, DocumentAnalysisWorkflow],
-        activities=[run_document_analysis],
-        workflow_runner=UnsandboxedWorkflowRunner(),
+    # Size the OCR process pool for this worker pod (defaults to CPU count)
+    ocr_executor.configure(
+        max_workers=int(os.getenv("OCR_POOL_SIZE") or os.cpu_count() or 1),
+        timeout=float(os.getenv("OCR_JOB_TIMEOUT_SECONDS", "120")),
     )
+
+    task_queue = os.getenv("TEMPORAL_TASK_QUEUE", "govassist-tasks")
+    run_workflows = os.getenv("WORKER_RUN_WORKFLOWS", "true").lower() != "false"
+    # Analysis stages served by this pod, e.g. WORKER_ANALYSIS_STAGES=ocr
+    stages = [
+        stage.strip()
+        for stage in os.getenv(
+            "WORKER_ANALYSIS_STAGES", ",".join(ANALYSIS_STAGES)
+        ).split(",")
+        if stage.strip()
+    ]
+
+    if "fetch" in stages:
+        # Fail at startup, not on the first document, without a shared spool
+        spool_dir()
+
+    # Stages sharing a task queue share one worker (one poller per queue)
+    queues: Dict[str, List[str]] = {task_queue: []} if run_workflows else {}
+    for stage in stages:
+        queues.setdefault(stage_task_queue(stage), []).append(stage)
+
+    workers = []
+    for queue, queue_stages in queues.items():
+        # SDK default unless every stage on the queue sets a limit
+        limits = [stage_max_concurrency(stage) for stage in queue_stages]
+        max_concurrent = sum(limits) if limits and all(limits) else None
+        activities = [ANALYSIS_STAGE_ACTIVITIES[stage] for stage in queue_stages]
+        if queue == task_queue and run_workflows:
+            # Run the worker with unsandboxed runner for complex agentic workflows
+            workers.append(
+                Worker(
+                    client,
+                    task_queue=queue,
+                    workflows=[ResearchWorkflow, DocumentAnalysisWorkflow],
+                    activities=[run_document_analysis, *activities],
+                    workflow_runner=UnsandboxedWorkflowRunner(),
+                    max_concurrent_activities=max_concurrent,
+                )
+            )
+        else:
+            workers.append(
+                Worker(
+                    client,
+                    task_queue=queue,
+                    activities=activities,
+                    max_concurrent_activities=max_concurrent,
+                )
+            )
+        print(f"Worker polling {queue}: stages={queue_stages or ['workflows']}")
+
     print("Worker started...")
-    await worker.run()
+    try:
+        await asyncio.gather(*(worker.run() for worker in workers))
+    finally:
+        await http_clients.aclose()
+        ocr_executor.shutdown(wait=False)
 
 
 if __name__ == "__main__":
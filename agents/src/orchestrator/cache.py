@@ -0,0 +1,167 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_sha256(file_path: str) -> str:
+    """Hashes a file in chunks so large scans are never fully in memory."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AnalysisCache:
+    """
+    Content-addressed cache of expensive pipeline stage results.
+
+    Citizens re-upload the same TIN certificate or lease across renewals and
+    retries; keyed on the document bytes plus everything that can change the
+    output (OCR engine/version, language set, playbook version), a repeat
+    upload skips OCR and masking entirely. Entries are JSON files on local
+    disk, evicted least-recently-used once ``max_bytes`` is exceeded.
+
+    Callers store PII-masked results only. The directory and its files are
+    readable by the worker's user alone.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        enabled: Optional[bool] = None,
+    ):
+        self.cache_dir = cache_dir or os.getenv(
+            "ANALYSIS_CACHE_DIR", "/tmp/gae_analysis_cache"
+        )
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+        )
+        self.enabled = (
+            enabled
+            if enabled is not None
+            else os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() != "false"
+        )
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    @staticmethod
+    def make_key(
+        document_sha256: str,
+        ocr_engine: str,
+        languages: str,
+        playbook_version: Optional[str],
+        pii_detectors: Optional[str] = None,
+    ) -> str:
+        """Derives the cache key from the document hash and pipeline inputs."""
+        material = "|".join(
+            [
+                document_sha256,
+                ocr_engine,
+                languages,
+                playbook_version or "none",
+                pii_detectors or "none",
+            ]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()
+
+    def _path(self, key: str, stage: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{stage}.json")
+
+    def _current_size(self) -> int:
+        if self._size is None:
+            os.makedirs(self.cache_dir, mode=0o700, exist_ok=True)
+            self._size = sum(
+                entry.stat().st_size
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            )
+        return self._size
+
+    def get(self, key: str, stage: str) -> Optional[Dict[str, Any]]:
+        """Returns the cached stage result, or None on a miss."""
+        if not self.enabled:
+            return None
+        path = self._path(key, stage)
+        try:
+            with open(path, "r") as f:
+                value = json.load(f)
+            # Reads refresh recency; eviction goes by mtime.
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return value
+
+    def put(self, key: str, stage: str, value: Dict[str, Any]):
+        """Stores a stage result and evicts old entries past the size bound."""
+        if not self.enabled:
+            return
+        data = json.dumps(value).encode()
+        if len(data) > self.max_bytes:
+            return
+        path = self._path(key, stage)
+        with self._lock:
+            size = self._current_size()
+            try:
+                size -= os.path.getsize(path)
+            except OSError:
+                pass
+            tmp_path = f"{path}.tmp"
+            try:
+                fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_path, path)
+            except OSError as e:
+                logger.warning("Failed to write analysis cache entry: %s", e)
+                return
+            self._size = size + len(data)
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        entries = sorted(
+            (
+                entry
+                for entry in os.scandir(self.cache_dir)
+                if entry.name.endswith(".json")
+            ),
+            key=lambda entry: entry.stat().st_mtime,
+        )
+        for entry in entries:
+            if self._size <= self.max_bytes:
+                break
+            try:
+                entry_size = entry.stat().st_size
+                os.remove(entry.path)
+            except OSError:
+                continue
+            self._size -= entry_size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Returns hit/miss/eviction counters for metrics."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size_bytes": self._size or 0,
+        }
+
+
+analysis_cache = AnalysisCache()
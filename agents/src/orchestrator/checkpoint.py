@@ -0,0 +1,160 @@
+import os
+import copy
+import asyncio
+import hashlib
+import inspect
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from temporalio import activity
+
+from orchestrator.cache import AnalysisCache, analysis_cache
+from safety_agent.masking import safety_agent
+from safety_agent.walker import PII_INDEX_KEY
+
+# Where node outputs wait for a retried attempt. A retry can only resume from
+# what it can read: set CHECKPOINT_DIR to a volume shared by the worker pods,
+# or a retry scheduled on another pod runs every node again. Unset, outputs go
+# to the pod-local analysis cache (and are not kept when it is disabled).
+CHECKPOINT_DIR = os.getenv("CHECKPOINT_DIR", "")
+checkpoint_store = (
+    AnalysisCache(CHECKPOINT_DIR, enabled=True) if CHECKPOINT_DIR else analysis_cache
+)
+
+NodeFn = Callable[[Dict[str, Any]], Union[Dict[str, Any], Awaitable[Dict[str, Any]]]]
+
+
+class NodeCheckpoint:
+    """
+    Records each orchestrator node's state update as it completes.
+
+    Updates are stored, PII-masked, in ``checkpoint_store`` under ``ref``;
+    inside a Temporal activity the heartbeat details carry only the finished
+    node names and ``ref``, so node outputs never reach the Temporal history
+    or its size limits. A retried attempt reads the names back, reloads the
+    outputs from the store and replays finished nodes instantly instead of
+    redoing OCR or re-submitting to review. Nodes whose output it cannot
+    read (another pod's local disk, evicted, store disabled) run again; they
+    are logged and counted in ``lost_nodes``.
+    """
+
+    # Finished nodes that retries had to run again, since process start
+    lost_nodes = 0
+
+    def __init__(
+        self,
+        completed: Optional[Dict[str, Dict[str, Any]]] = None,
+        heartbeat: Optional[Callable[..., None]] = None,
+        ref: Optional[str] = None,
+        store: Optional[AnalysisCache] = None,
+    ):
+        self.completed: Dict[str, Dict[str, Any]] = dict(completed or {})
+        self.resumed = list(self.completed)
+        self.lost: List[str] = []
+        self.ref = ref
+        self.store = store or checkpoint_store
+        self._heartbeat = heartbeat
+
+    @staticmethod
+    def _stage(node: str) -> str:
+        return f"checkpoint-{node}"
+
+    @classmethod
+    def load(
+        cls,
+        ref: str,
+        nodes: List[str],
+        heartbeat: Optional[Callable[..., None]] = None,
+        store: Optional[AnalysisCache] = None,
+    ) -> "NodeCheckpoint":
+        """Reloads the outputs of ``nodes``, in order, up to the first one missing."""
+        store = store or checkpoint_store
+        completed = {}
+        for node in nodes:
+            output = store.get(ref, cls._stage(node))
+            if output is None:
+                break
+            completed[node] = output
+        checkpoint = cls(completed=completed, heartbeat=heartbeat, ref=ref, store=store)
+        checkpoint.lost = nodes[len(completed) :]
+        if checkpoint.lost:
+            cls.lost_nodes += len(checkpoint.lost)
+            print(
+                f"[CHECKPOINT] Outputs of {checkpoint.lost} not found under {ref[:12]} "
+                f"(retry on another pod without a shared CHECKPOINT_DIR?); "
+                "running them again"
+            )
+        return checkpoint
+
+    @classmethod
+    def from_activity(cls) -> "NodeCheckpoint":
+        """Restores completed nodes from the previous attempt's heartbeats."""
+        info = activity.info()
+        ref = hashlib.sha256(
+            f"{info.workflow_id}|{info.workflow_run_id}|{info.activity_id}".encode()
+        ).hexdigest()
+        details = info.heartbeat_details
+        nodes: List[str] = []
+        if details and isinstance(details[0], dict):
+            nodes = details[0].get("completed") or []
+            ref = details[0].get("ref") or ref
+        return cls.load(ref, list(nodes), heartbeat=activity.heartbeat)
+
+    def get(self, node: str) -> Optional[Dict[str, Any]]:
+        return self.completed.get(node)
+
+    def record(self, node: str, output: Dict[str, Any]):
+        self.completed[node] = output
+        if self.ref is not None:
+            # Copy first: masking works in place and the graph still needs
+            # this output as it is
+            masked = copy.deepcopy(output)
+            safety_agent.mask_structure(masked)
+            masked.pop(PII_INDEX_KEY, None)
+            self.store.put(self.ref, self._stage(node), masked)
+        self.heartbeat(node)
+
+    def heartbeat(self, current: Optional[str] = None):
+        """Reports progress; a no-op outside an activity."""
+        if self._heartbeat is None:
+            return
+        self._heartbeat(
+            {"completed": list(self.completed), "ref": self.ref, "last_node": current}
+        )
+
+    async def pulse(self, interval: float):
+        """Heartbeats periodically so long-running nodes don't time out."""
+        while True:
+            await asyncio.sleep(interval)
+            self.heartbeat()
+
+
+current_checkpoint: ContextVar[Optional[NodeCheckpoint]] = ContextVar(
+    "current_checkpoint", default=None
+)
+
+
+def checkpointed(name: str, fn: NodeFn) -> Callable[[Dict[str, Any]], Awaitable]:
+    """
+    Wraps a graph node so its output is recorded in, and replayed from, the
+    checkpoint bound to ``current_checkpoint`` (if any).
+    """
+
+    async def node(state: Dict[str, Any]) -> Dict[str, Any]:
+        checkpoint = current_checkpoint.get()
+        if checkpoint is not None:
+            saved = checkpoint.get(name)
+            if saved is not None:
+                print(f"--- NODE: {name} (resumed from checkpoint) ---")
+                return saved
+
+        if inspect.iscoroutinefunction(fn):
+            result = await fn(state)
+        else:
+            result = await asyncio.to_thread(fn, state)
+
+        if checkpoint is not None:
+            checkpoint.record(name, result)
+        return result
+
+    return node
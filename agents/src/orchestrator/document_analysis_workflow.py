@@ -1,65 +1,201 @@
 import os
+import json
 import base64
+import asyncio
+import contextlib
+import hashlib
 import tempfile
-from typing import Any, Dict, List
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
 import httpx
 from temporalio import workflow, activity
 
-from orchestrator.graph import orchestrator
+from orchestrator.graph import (
+    orchestrator,
+    evaluation_orchestrator,
+    quality_gate_node,
+    safety_agent_node,
+    vision_router_node,
+)
+from orchestrator.checkpoint import NodeCheckpoint, current_checkpoint
+from orchestrator.progress import PROGRESS_ENABLED, ProgressReporter, current_progress
+from common.http import http_clients
 
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+# Base64 slices must stay a multiple of 4 characters to decode independently.
+BASE64_SLICE_SIZE = 4 * 1024 * 1024
+HEARTBEAT_INTERVAL_SECONDS = 20
 
-@activity.defn
-async def run_document_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+# Downloaded documents are named with this prefix, so leftovers of runs whose
+# OCR stage never deleted them (it failed for good, or read its own copy on
+# another pod) can be swept; each fetch removes those older than the max age.
+SPOOL_PREFIX = "gae-doc-"
+DOCUMENT_SPOOL_MAX_AGE_SECONDS = float(
+    os.getenv("DOCUMENT_SPOOL_MAX_AGE_SECONDS", "3600")
+)
+
+# Pipeline stages that can each be routed to their own task queue, so OCR
+# worker pods scale separately from IO-bound fetch/report pods.
+ANALYSIS_STAGES = ["fetch", "ocr", "evaluate", "report"]
+
+
+def stage_task_queue(stage: str) -> str:
+    """Task queue for one analysis stage; defaults to the shared worker queue."""
+    return os.getenv(f"TEMPORAL_{stage.upper()}_TASK_QUEUE") or os.getenv(
+        "TEMPORAL_TASK_QUEUE", "govassist-tasks"
+    )
+
+
+def stage_max_concurrency(stage: str) -> Optional[int]:
+    """Per-stage ``max_concurrent_activities``; None keeps the SDK default."""
+    value = os.getenv(f"TEMPORAL_{stage.upper()}_MAX_CONCURRENT_ACTIVITIES")
+    return int(value) if value else None
+
+
+def spool_dir() -> Optional[str]:
     """
-    Activity: fetch document bytes from backend, run orchestrator, return compliance report.
+    Directory the fetch stage leaves documents in for the OCR stage; None is
+    the local temp directory. When the two stages are on different task
+    queues they run on different pods, so ``DOCUMENT_SPOOL_DIR`` must then
+    be a volume both can reach.
+    """
+    directory = os.getenv("DOCUMENT_SPOOL_DIR") or None
+    if directory is None and stage_task_queue("fetch") != stage_task_queue("ocr"):
+        raise RuntimeError(
+            "DOCUMENT_SPOOL_DIR must be a volume shared with the OCR workers "
+            "when the fetch and OCR stages run on different task queues."
+        )
+    return directory
+
+
+def sweep_spool(
+    directory: Optional[str], max_age: float = DOCUMENT_SPOOL_MAX_AGE_SECONDS
+) -> int:
+    """Removes downloaded documents older than ``max_age`` seconds."""
+    cutoff = time.time() - max_age
+    removed = 0
+    for entry in os.scandir(directory or tempfile.gettempdir()):
+        if not entry.name.startswith(SPOOL_PREFIX):
+            continue
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.unlink(entry.path)
+                removed += 1
+        except OSError:
+            continue
+    return removed
+
+
+def _suffix_for(mime_type: Optional[str]) -> str:
+    """Maps a MIME type onto the temp-file suffix the OCR stack dispatches on."""
+    if isinstance(mime_type, str) and "pdf" in mime_type:
+        return ".pdf"
+    if isinstance(mime_type, str) and "png" in mime_type:
+        return ".png"
+    if isinstance(mime_type, str) and "jpeg" in mime_type:
+        return ".jpg"
+    return ".bin"
+
+
+async def download_document(
+    client: httpx.AsyncClient,
+    backend_url: str,
+    document_id: str,
+    headers: Dict[str, str],
+    directory: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Streams document bytes from the backend into a temp file in ``directory``.
+
+    Negotiates the raw ``application/octet-stream`` download so chunks go
+    straight to disk; older backends that only answer with the JSON
+    ``bytes_base64`` shape are decoded slice by slice instead.
+    Returns the temp file path, MIME type, size and SHA-256 of the bytes.
     """
+    digest = hashlib.sha256()
+    size = 0
+    tmp_path: Optional[str] = None
+
+    try:
+        async with client.stream(
+            "GET",
+            f"{backend_url}/internal/documents/{document_id}/download",
+            headers={
+                **headers,
+                "accept": "application/octet-stream, application/json;q=0.5",
+            },
+            timeout=60,
+        ) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "")
+
+            if "application/json" in content_type:
+                # Legacy shape: the backend has already buffered the whole body.
+                body = json.loads(await response.aread())
+                mime_type = body.get("mime_type")
+                bytes_base64 = body.get("bytes_base64")
+                if not bytes_base64:
+                    raise RuntimeError(
+                        "Backend did not return bytes_base64 for document download."
+                    )
+                chunks = (
+                    base64.b64decode(bytes_base64[start : start + BASE64_SLICE_SIZE])
+                    for start in range(0, len(bytes_base64), BASE64_SLICE_SIZE)
+                )
+            else:
+                mime_type = response.headers.get("x-document-mime-type") or content_type
+                chunks = None
+
+            with tempfile.NamedTemporaryFile(
+                delete=False,
+                prefix=SPOOL_PREFIX,
+                suffix=_suffix_for(mime_type),
+                dir=directory,
+            ) as tmp:
+                tmp_path = tmp.name
+                if chunks is None:
+                    async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                        tmp.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+                else:
+                    for chunk in chunks:
+                        tmp.write(chunk)
+                        digest.update(chunk)
+                        size += len(chunk)
+    except BaseException:
+        if tmp_path:
+            os.unlink(tmp_path)
+        raise
+
+    return {
+        "path": tmp_path,
+        "mime_type": mime_type,
+        "size": size,
+        "sha256": digest.hexdigest(),
+    }
+
+
+def _backend_auth() -> Tuple[str, Dict[str, str]]:
     backend_url = os.getenv("BACKEND_API_URL", "http://localhost:3000")
     internal_token = os.getenv("INTERNAL_API_TOKEN", "")
     if not internal_token:
         raise RuntimeError(
             "INTERNAL_API_TOKEN must be set for document analysis activity."
         )
+    return backend_url, {"x-internal-token": internal_token}
 
-    document_id: str = payload["document_id"]
-    analysis_id: str = payload["analysis_id"]
-    jurisdiction_key: str = payload.get("jurisdiction_key", "addis-ababa")
-    process_id: str = payload.get("process_id", "trade-license")
-    documents: List[str] = payload.get("documents", [])
-
-    headers = {"x-internal-token": internal_token}
 
-    async with httpx.AsyncClient(timeout=60) as client:
-        download = await client.get(
-            f"{backend_url}/internal/documents/{document_id}/download", headers=headers
-        )
-        download.raise_for_status()
-        body = download.json()
-        mime_type = body.get("mime_type")
-        bytes_base64 = body.get("bytes_base64")
-        if not bytes_base64:
-            raise RuntimeError(
-                "Backend did not return bytes_base64 for document download."
-            )
-        file_bytes = base64.b64decode(bytes_base64)
-
-    # Write to temp file for OCR stack that expects a file path
-    suffix = ".bin"
-    if isinstance(mime_type, str) and "pdf" in mime_type:
-        suffix = ".pdf"
-    elif isinstance(mime_type, str) and "png" in mime_type:
-        suffix = ".png"
-    elif isinstance(mime_type, str) and "jpeg" in mime_type:
-        suffix = ".jpg"
-
-    with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-        tmp.write(file_bytes)
-        tmp_path = tmp.name
-
-    # Seed orchestrator state with user-provided document types for deterministic engine
-    state: Dict[str, Any] = {
-        "document_id": document_id,
-        "file_path": tmp_path,
+def _initial_state(payload: Dict[str, Any], document: Dict[str, Any]) -> Dict[str, Any]:
+    # Document types the user declared; the vision router adds the ones it
+    # classifies from the page layout
+    documents: List[str] = payload.get("documents", [])
+    return {
+        "document_id": payload["document_id"],
+        "file_path": document["path"],
+        "document_sha256": document["sha256"],
         "extracted_data": {"documents": documents},
         "confidence": {},
         "status": "PROCESSING",
@@ -68,32 +204,178 @@ async def run_document_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
         "messages": [],
         "audit_ids": [],
         "artifacts": [],
-        "jurisdiction_key": jurisdiction_key,
-        "process_id": process_id,
+        "jurisdiction_key": payload.get("jurisdiction_key", "addis-ababa"),
+        "process_id": payload.get("process_id", "trade-license"),
         "service": "Trade License",
         "action": "renewal",
     }
 
-    final_state = await orchestrator.ainvoke(state)
 
-    compliance_report = final_state.get("compliance_report") or {
+def _compliance_report(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    return final_state.get("compliance_report") or {
         "status": final_state.get("status", "UNCERTAIN"),
         "readiness_score": 0,
         "issues": [],
     }
 
+
+@contextlib.asynccontextmanager
+async def _streaming_progress(analysis_id: Optional[str]):
+    """
+    Binds a ProgressReporter for ``analysis_id`` so the vision router posts
+    pages as they finish; whatever is still buffered is posted on exit, also
+    when the stage fails or is cancelled.
+    """
+    if not PROGRESS_ENABLED or not analysis_id or not os.getenv("INTERNAL_API_TOKEN"):
+        yield None
+        return
+    backend_url, headers = _backend_auth()
+    reporter = ProgressReporter(analysis_id, backend_url, headers)
+    token = current_progress.set(reporter)
+    try:
+        yield reporter
+    finally:
+        current_progress.reset(token)
+        await asyncio.shield(reporter.flush())
+
+
+async def _run_checkpointed(graph, state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Runs a graph, resuming from nodes finished by a previous attempt on this
+    pod, or on any pod when ``CHECKPOINT_DIR`` is a shared volume.
+    """
+    checkpoint = NodeCheckpoint.from_activity()
+    if checkpoint.resumed:
+        print(f"[ANALYSIS] Resuming after completed nodes: {checkpoint.resumed}")
+    token = current_checkpoint.set(checkpoint)
+    pulse = asyncio.create_task(checkpoint.pulse(HEARTBEAT_INTERVAL_SECONDS))
+    try:
+        return await graph.ainvoke(state)
+    finally:
+        pulse.cancel()
+        current_checkpoint.reset(token)
+
+
+async def _post_complete(analysis_id: str, compliance_report: Dict[str, Any]):
+    backend_url, headers = _backend_auth()
     # Update backend analysis record
-    async with httpx.AsyncClient(timeout=60) as client:
-        resp = await client.post(
-            f"{backend_url}/internal/analyses/{analysis_id}/complete",
-            headers=headers,
-            json={"results": compliance_report},
-        )
-        resp.raise_for_status()
+    resp = await http_clients.get(backend_url).post(
+        f"{backend_url}/internal/analyses/{analysis_id}/complete",
+        headers=headers,
+        json={"results": compliance_report},
+        timeout=60,
+    )
+    resp.raise_for_status()
+
+
+@activity.defn
+async def run_document_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Activity: fetch document bytes from backend, run orchestrator, return compliance report.
 
+    Single-activity pipeline kept for workflows started before the stages
+    were split; new runs go through the per-stage activities below.
+    """
+    backend_url, headers = _backend_auth()
+    analysis_id: str = payload["analysis_id"]
+
+    download = await download_document(
+        http_clients.get(backend_url), backend_url, payload["document_id"], headers
+    )
+
+    try:
+        async with _streaming_progress(analysis_id):
+            final_state = await _run_checkpointed(
+                orchestrator, _initial_state(payload, download)
+            )
+    finally:
+        os.unlink(download["path"])
+
+    compliance_report = _compliance_report(final_state)
+    await _post_complete(analysis_id, compliance_report)
     return {"analysis_id": analysis_id, "results": compliance_report}
 
 
+@activity.defn
+async def fetch_document(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Activity (IO): stream the document into the spool directory (see
+    ``spool_dir``), sweeping out documents no OCR stage picked up.
+    """
+    backend_url, headers = _backend_auth()
+    directory = spool_dir()
+    removed = await asyncio.to_thread(sweep_spool, directory)
+    if removed:
+        print(f"[ANALYSIS] Removed {removed} stale spooled document(s)")
+    return await download_document(
+        http_clients.get(backend_url),
+        backend_url,
+        payload["document_id"],
+        headers,
+        directory=directory,
+    )
+
+
+@activity.defn
+async def ocr_document(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Activity (CPU): quality-gate the fetched document, then run the vision
+    router over it unless the image was rejected. The OCR output is masked
+    before it is returned, as it is kept in the workflow history.
+    """
+    document: Dict[str, Any] = payload["document"]
+    if not os.path.exists(document["path"]):
+        # Spool file lives on another pod or was cleaned up by an earlier attempt
+        backend_url, headers = _backend_auth()
+        document = await download_document(
+            http_clients.get(backend_url), backend_url, payload["document_id"], headers
+        )
+
+    state = _initial_state(payload, document)
+    pulse = asyncio.create_task(
+        NodeCheckpoint(heartbeat=activity.heartbeat).pulse(HEARTBEAT_INTERVAL_SECONDS)
+    )
+    try:
+        gate = await quality_gate_node(state)
+        if gate.get("compliance_report"):
+            # Rejected before OCR; evaluate_document passes the report through
+            return gate
+        async with _streaming_progress(payload.get("analysis_id")):
+            ocr = await vision_router_node({**state, **gate})
+        masked = await asyncio.to_thread(safety_agent_node, {**state, **ocr})
+        return {**ocr, **masked}
+    finally:
+        pulse.cancel()
+        os.unlink(document["path"])
+
+
+@activity.defn
+async def evaluate_document(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Activity: mask PII, evaluate compliance and escalate to review if needed.
+    Returns the ComplianceReport.
+    """
+    state = {**_initial_state(payload, payload["document"]), **payload["ocr"]}
+    final_state = await _run_checkpointed(evaluation_orchestrator, state)
+    return _compliance_report(final_state)
+
+
+@activity.defn
+async def report_analysis(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Activity (IO): post the ComplianceReport to the backend."""
+    await _post_complete(payload["analysis_id"], payload["results"])
+    return {"analysis_id": payload["analysis_id"], "results": payload["results"]}
+
+
+# Stage name -> activity, used by the worker to register per-queue workers
+ANALYSIS_STAGE_ACTIVITIES = {
+    "fetch": fetch_document,
+    "ocr": ocr_document,
+    "evaluate": evaluate_document,
+    "report": report_analysis,
+}
+
+
 @workflow.defn
 class DocumentAnalysisWorkflow:
     @workflow.run
@@ -102,20 +384,54 @@ class DocumentAnalysisWorkflow:
         Workflow: run a single document analysis job.
         """
         try:
-            return await workflow.execute_activity(
-                run_document_analysis,
-                payload,
-                start_to_close_timeout=60 * 10,
-            )
+            if not workflow.patched("split-analysis-stages"):
+                return await workflow.execute_activity(
+                    run_document_analysis,
+                    payload,
+                    start_to_close_timeout=timedelta(minutes=10),
+                    # Heartbeats carry node checkpoints; a stalled worker is retried
+                    heartbeat_timeout=timedelta(seconds=HEARTBEAT_INTERVAL_SECONDS * 3),
+                )
+            return await self._run_stages(payload)
         except Exception as e:
             backend_url = os.getenv("BACKEND_API_URL", "http://localhost:3000")
             internal_token = os.getenv("INTERNAL_API_TOKEN", "")
             analysis_id = payload.get("analysis_id")
             if internal_token and analysis_id:
-                async with httpx.AsyncClient(timeout=30) as client:
-                    await client.post(
-                        f"{backend_url}/internal/analyses/{analysis_id}/fail",
-                        headers={"x-internal-token": internal_token},
-                        json={"error": str(e)},
-                    )
+                await http_clients.get(backend_url).post(
+                    f"{backend_url}/internal/analyses/{analysis_id}/fail",
+                    headers={"x-internal-token": internal_token},
+                    json={"error": str(e)},
+                    timeout=30,
+                )
             raise
+
+    async def _run_stages(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Runs fetch -> OCR -> mask+evaluate -> report, each on its own queue."""
+        heartbeat_timeout = timedelta(seconds=HEARTBEAT_INTERVAL_SECONDS * 3)
+        document = await workflow.execute_activity(
+            fetch_document,
+            payload,
+            task_queue=stage_task_queue("fetch"),
+            start_to_close_timeout=timedelta(minutes=2),
+        )
+        ocr = await workflow.execute_activity(
+            ocr_document,
+            {**payload, "document": document},
+            task_queue=stage_task_queue("ocr"),
+            start_to_close_timeout=timedelta(minutes=10),
+            heartbeat_timeout=heartbeat_timeout,
+        )
+        results = await workflow.execute_activity(
+            evaluate_document,
+            {**payload, "document": document, "ocr": ocr},
+            task_queue=stage_task_queue("evaluate"),
+            start_to_close_timeout=timedelta(minutes=5),
+            heartbeat_timeout=heartbeat_timeout,
+        )
+        return await workflow.execute_activity(
+            report_analysis,
+            {"analysis_id": payload["analysis_id"], "results": results},
+            task_queue=stage_task_queue("report"),
+            start_to_close_timeout=timedelta(minutes=1),
+        )
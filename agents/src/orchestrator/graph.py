@@ -1,21 +1,112 @@
+import copy
+import asyncio
 from typing import Dict, Any, Literal
 from langgraph.graph import StateGraph, END
 from common.state import AgentState
-from vision_router.router import vision_router
+from vision_router.router import vision_router, OCR_LANG_KEY
+from vision_router.quality import QUALITY_GATE_ENABLED, assess_file
+from safety_agent.detectors import pii_detectors
 from safety_agent.masking import safety_agent
+from safety_agent.walker import PII_INDEX_KEY, content_digest
 from regulation_expert.retrieval import get_regulation_expert
 from compliance_agent.evaluator import get_compliance_agent
 from human_review_agent.queue import human_review_agent
 from audit_agent.activity import audit_logger
 from procedural_guide.guide import procedural_guide
+from orchestrator.cache import analysis_cache, file_sha256
+from orchestrator.checkpoint import checkpointed
+from orchestrator.progress import current_progress
+
+# Keys of extracted_data read from the file by OCR. Only these are cached
+# masked by the safety node; everything else comes from the current request.
+OCR_TEXT_KEYS = ("raw_text", "local_text", "pages", "fields")
+
+
+def _cache_key(state: AgentState) -> str:
+    """Content-addressed key for the OCR and masking stage results."""
+    document_sha256 = state.get("document_sha256") or file_sha256(state["file_path"])
+    playbook = (
+        procedural_guide.get_playbook(
+            state.get("jurisdiction_key", "addis-ababa"),
+            state.get("process_id", "trade-license"),
+        )
+        or {}
+    )
+    return analysis_cache.make_key(
+        document_sha256,
+        vision_router.engine_id(),
+        OCR_LANG_KEY,
+        playbook.get("version"),
+        pii_detectors.version,
+    )
+
+
+async def quality_gate_node(state: AgentState) -> Dict[str, Any]:
+    """
+    Millisecond image-quality check ahead of OCR. Unusable uploads (blurry,
+    dark, washed out, page too small) are rejected with remediation advice
+    instead of spending an OCR pass, the vision-LLM fallback and a review.
+    """
+    print("--- NODE: QUALITY GATE ---")
+    if not QUALITY_GATE_ENABLED:
+        return {}
+    try:
+        result = await asyncio.to_thread(assess_file, state["file_path"])
+    except Exception as e:
+        # Not a decodable image (corrupt, unknown format): let OCR try it and
+        # escalate to review on failure instead of failing the activity
+        print(f"[QUALITY GATE] Could not assess upload, passing it to OCR: {e}")
+        return {
+            "extracted_data": {
+                **state.get("extracted_data", {}),
+                "quality": {"usable": None, "issues": [], "error": str(e)},
+            }
+        }
+    await audit_logger.log_event("quality_check", "vision_router", result)
+    update: Dict[str, Any] = {
+        "extracted_data": {**state.get("extracted_data", {}), "quality": result}
+    }
+    if not result["usable"]:
+        update["status"] = "FAIL"
+        update["compliance_report"] = {
+            "status": "FAIL",
+            "readiness_score": 0,
+            "issues": result["issues"],
+        }
+    return update
+
+
+def image_rejected(state: AgentState) -> bool:
+    quality = state.get("extracted_data", {}).get("quality") or {}
+    return quality.get("usable") is False
 
 
 async def vision_router_node(state: AgentState) -> Dict[str, Any]:
     print("--- NODE: VISION ROUTER ---")
-    result = await vision_router.process_document(state["file_path"])
-    await audit_logger.log_event("ocr_extraction", "vision_router", result)
+    cache_key = _cache_key(state)
+    result = analysis_cache.get(cache_key, "vision_router")
+    cache_hit = result is not None
+    if not cache_hit:
+        # Stream finished pages to the backend when running inside an analysis
+        progress = current_progress.get()
+        result = await vision_router.process_document(
+            state["file_path"], on_page=progress.page_done if progress else None
+        )
+        if not result.get("error"):
+            # The cache holds masked OCR output only; the safety node reuses
+            # the span index that comes with it on a hit
+            masked = copy.deepcopy(result)
+            safety_agent.mask_structure(masked)
+            analysis_cache.put(cache_key, "vision_router", masked)
+    await audit_logger.log_event(
+        "ocr_extraction", "vision_router", {**result, "cache_hit": cache_hit}
+    )
+    extracted_data = state.get("extracted_data", {})
+    # Document types classified from the page layout join any the user declared
+    documents = list(extracted_data.get("documents", []))
+    documents += [d for d in result.get("document_types", []) if d not in documents]
     return {
-        "extracted_data": {**state.get("extracted_data", {}), **result},
+        "extracted_data": {**extracted_data, **result, "documents": documents},
         "confidence": {"ocr": result.get("confidence", 0)},
         "status": "MANUAL_REVIEW" if result.get("needs_escalation") else "PROCESSING",
     }
@@ -23,8 +114,45 @@ async def vision_router_node(state: AgentState) -> Dict[str, Any]:
 
 def safety_agent_node(state: AgentState) -> Dict[str, Any]:
     print("--- NODE: SAFETY AGENT ---")
-    result = safety_agent.extract_and_mask(state["extracted_data"])
-    return {"extracted_data": {**state["extracted_data"], **result}, "pii_masked": True}
+    cache_key = _cache_key(state)
+    cached = analysis_cache.get(cache_key, "safety_agent") or {}
+    # Masking works in place; the state's nested data is not ours to change
+    extracted_data = copy.deepcopy(state["extracted_data"])
+    sources = {
+        key: content_digest(extracted_data[key])
+        for key in OCR_TEXT_KEYS
+        if key in extracted_data
+    }
+    # A cached masked field is used only for the same OCR output; its
+    # subtree index lets the walk skip it and scan just the rest
+    subtrees = {
+        key: cached[key]["index"]
+        for key in sources
+        if key in cached and cached[key]["source"] == sources[key]
+    }
+    for key in subtrees:
+        extracted_data[key] = cached[key]["masked"]
+    if subtrees:
+        extracted_data[PII_INDEX_KEY] = {
+            "version": safety_agent.registry.version,
+            "subtrees": subtrees,
+        }
+    result = safety_agent.extract_and_mask(extracted_data)
+    extracted_data.update(result)
+    if sources and len(subtrees) < len(sources):
+        analysis_cache.put(
+            cache_key,
+            "safety_agent",
+            {
+                key: {
+                    "source": source,
+                    "masked": extracted_data[key],
+                    "index": result["pii"]["subtrees"][key],
+                }
+                for key, source in sources.items()
+            },
+        )
+    return {"extracted_data": extracted_data, "pii_masked": True}
 
 
 async def compliance_evaluator_node(state: AgentState) -> Dict[str, Any]:
@@ -66,7 +194,17 @@ async def human_review_node(state: AgentState) -> Dict[str, Any]:
     return {"status": "MANUAL_REVIEW"}
 
 
-def route_after_vision(state: AgentState) -> Literal["safety_agent", "human_review"]:
+def route_after_quality(state: AgentState) -> Literal["vision_router", "end"]:
+    if image_rejected(state):
+        return "end"
+    return "vision_router"
+
+
+def route_after_vision(
+    state: AgentState,
+) -> Literal["safety_agent", "human_review", "end"]:
+    if image_rejected(state):
+        return "end"
     if state["status"] == "MANUAL_REVIEW":
         return "human_review"
     return "safety_agent"
@@ -78,23 +216,48 @@ def route_after_compliance(state: AgentState) -> Literal["human_review", "end"]:
     return "end"
 
 
-def create_orchestrator():
+def create_orchestrator(include_vision: bool = True):
+    """
+    Builds the analysis graph. ``include_vision=False`` builds the graph used
+    after a separate OCR activity (quality gate plus OCR): it starts by
+    routing on the OCR outcome.
+    """
     workflow = StateGraph(AgentState)
 
-    # Add Nodes
-    workflow.add_node("vision_router", vision_router_node)
-    workflow.add_node("safety_agent", safety_agent_node)
-    workflow.add_node("compliance_evaluator", compliance_evaluator_node)
-    workflow.add_node("human_review", human_review_node)
+    # Add Nodes (checkpointed so activity retries resume mid-graph)
+    if include_vision:
+        workflow.add_node(
+            "quality_gate", checkpointed("quality_gate", quality_gate_node)
+        )
+        workflow.add_node(
+            "vision_router", checkpointed("vision_router", vision_router_node)
+        )
+    workflow.add_node("safety_agent", checkpointed("safety_agent", safety_agent_node))
+    workflow.add_node(
+        "compliance_evaluator",
+        checkpointed("compliance_evaluator", compliance_evaluator_node),
+    )
+    workflow.add_node("human_review", checkpointed("human_review", human_review_node))
 
     # Add Edges
-    workflow.set_entry_point("vision_router")
-
-    workflow.add_conditional_edges(
-        "vision_router",
-        route_after_vision,
-        {"safety_agent": "safety_agent", "human_review": "human_review"},
-    )
+    after_vision = {
+        "safety_agent": "safety_agent",
+        "human_review": "human_review",
+        "end": END,
+    }
+    if include_vision:
+        workflow.set_entry_point("quality_gate")
+        workflow.add_conditional_edges(
+            "quality_gate",
+            route_after_quality,
+            {"vision_router": "vision_router", "end": END},
+        )
+        workflow.add_conditional_edges(
+            "vision_router", route_after_vision, after_vision
+        )
+    else:
+        # A rejected image reaches this graph with its report already set
+        workflow.set_conditional_entry_point(route_after_vision, after_vision)
 
     workflow.add_edge("safety_agent", "compliance_evaluator")
 
@@ -110,3 +273,4 @@ def create_orchestrator():
 
 
 orchestrator = create_orchestrator()
+evaluation_orchestrator = create_orchestrator(include_vision=False)
@@ -0,0 +1,91 @@
+import os
+import time
+import asyncio
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from common.http import http_clients
+from safety_agent.masking import safety_agent
+from vision_router.analysis import PageAnalysis
+
+# Finished pages are posted in batches: whichever comes first, this many
+# pages or this many seconds since the last post.
+PROGRESS_BATCH_PAGES = int(os.getenv("ANALYSIS_PROGRESS_BATCH_PAGES", "8"))
+PROGRESS_FLUSH_SECONDS = float(os.getenv("ANALYSIS_PROGRESS_FLUSH_SECONDS", "2"))
+PROGRESS_ENABLED = os.getenv("ANALYSIS_PROGRESS", "true").lower() != "false"
+
+
+def page_progress(page: PageAnalysis) -> Dict[str, Any]:
+    """
+    Partial result for one finished page. Text is PII-masked before it
+    leaves the agent, like the final report.
+    """
+    return {
+        "index": page.index,
+        "method": page.method,
+        "lang": page.lang,
+        "confidence": page.confidence,
+        "document_type": page.document_type,
+        "features": page.features,
+        "masked_text": safety_agent.mask_pii(page.text),
+    }
+
+
+class ProgressReporter:
+    """
+    Streams per-page partial results of one analysis to the backend
+    (``POST /internal/analyses/{id}/progress``) while the document is still
+    being processed, so the UI can show readiness as it builds and a timed
+    out run keeps the pages already done. Best-effort: a failed post is
+    logged and retried with the next batch, never raised.
+    """
+
+    def __init__(
+        self,
+        analysis_id: str,
+        backend_url: str,
+        headers: Dict[str, str],
+        batch_pages: int = PROGRESS_BATCH_PAGES,
+        flush_seconds: float = PROGRESS_FLUSH_SECONDS,
+    ):
+        self.analysis_id = analysis_id
+        self.backend_url = backend_url
+        self.headers = headers
+        self.batch_pages = batch_pages
+        self.flush_seconds = flush_seconds
+        self.page_count: Optional[int] = None
+        self.posted = 0
+        self._pending: List[Dict[str, Any]] = []
+        self._last_flush = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def page_done(self, page: PageAnalysis, page_count: int):
+        self.page_count = page_count
+        self._pending.append(page_progress(page))
+        due = time.monotonic() - self._last_flush >= self.flush_seconds
+        if len(self._pending) >= self.batch_pages or due:
+            await self.flush()
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            self._last_flush = time.monotonic()
+            try:
+                resp = await http_clients.get(self.backend_url).post(
+                    f"{self.backend_url}/internal/analyses/{self.analysis_id}/progress",
+                    headers=self.headers,
+                    json={"page_count": self.page_count, "pages": batch},
+                    timeout=10,
+                )
+                resp.raise_for_status()
+                self.posted += len(batch)
+            except Exception as e:
+                print(f"[PROGRESS] Failed to post {len(batch)} page(s): {e}")
+                self._pending = batch + self._pending
+
+
+current_progress: ContextVar[Optional[ProgressReporter]] = ContextVar(
+    "current_progress", default=None
+)
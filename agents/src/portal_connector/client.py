@@ -1,8 +1,8 @@
-import httpx
 import os
 from datetime import datetime
 from typing import Dict, Any
 from audit_agent.activity import audit_logger
+from common.http import http_clients
 
 
 class PortalConnector:
@@ -32,25 +32,24 @@ class PortalConnector:
 
         try:
             # Note: Using a short timeout for the mock/stub check
-            async with httpx.AsyncClient() as client:
-                # In a real scenario, this endpoint exists.
-                # For this implementation, we try it but handle the inevitable 404/ConnectionError if not running.
-                response = await client.post(
-                    f"{self.base_url}/applications",
-                    json=payload,
-                    headers=headers,
-                    timeout=10.0,
-                )
+            # In a real scenario, this endpoint exists.
+            # For this implementation, we try it but handle the inevitable 404/ConnectionError if not running.
+            response = await http_clients.get(self.base_url).post(
+                f"{self.base_url}/applications",
+                json=payload,
+                headers=headers,
+                timeout=10.0,
+            )
 
-                if response.status_code in [200, 201, 202]:
-                    result = response.json()
-                    tracking_id = result.get("application_id", "ET-MESOB-AUTO-ID")
-                else:
-                    # Fallback for dev/demo if portal is not reachable
-                    print(
-                        f"[PORTAL WARNING] Portal returned {response.status_code}. Using fallback tracking ID."
-                    )
-                    tracking_id = f"MOCK-ACK-{os.urandom(4).hex()}"
+            if response.status_code in [200, 201, 202]:
+                result = response.json()
+                tracking_id = result.get("application_id", "ET-MESOB-AUTO-ID")
+            else:
+                # Fallback for dev/demo if portal is not reachable
+                print(
+                    f"[PORTAL WARNING] Portal returned {response.status_code}. Using fallback tracking ID."
+                )
+                tracking_id = f"MOCK-ACK-{os.urandom(4).hex()}"
         except Exception as e:
             print(
                 f"[PORTAL ERROR] Failed to connect to MESOB: {e}. Using fallback tracking ID for demo."
@@ -1,23 +1,70 @@
-from typing import List, Dict
+import os
+import asyncio
+import weakref
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
 import weaviate
+from weaviate.classes.init import AdditionalConfig, Timeout
+from common.config import settings
+
+WEAVIATE_GRPC_PORT = int(os.getenv("WEAVIATE_GRPC_PORT", "50051"))
+# Hybrid searches in flight per event loop; the rest wait here.
+WEAVIATE_MAX_CONCURRENCY = int(os.getenv("WEAVIATE_MAX_CONCURRENCY", "8"))
+# Budget for one search, including the wait for a concurrency slot.
+WEAVIATE_QUERY_TIMEOUT_SECONDS = float(
+    os.getenv("WEAVIATE_QUERY_TIMEOUT_SECONDS", "10")
+)
+WEAVIATE_CONNECT_TIMEOUT_SECONDS = float(
+    os.getenv("WEAVIATE_CONNECT_TIMEOUT_SECONDS", "5")
+)
+
+
+def connection_params(url: str = settings.WEAVIATE_URL) -> Dict[str, Any]:
+    """Host and ports for the local Weaviate at ``WEAVIATE_URL``."""
+    parts = urlsplit(url)
+    return {
+        "host": parts.hostname or "localhost",
+        "port": parts.port or 8080,
+        "grpc_port": WEAVIATE_GRPC_PORT,
+    }
 
 
 class HybridRetriever:
-    def __init__(self, collection_name: str = "RegulationSnippet"):
-        self.collection_name = collection_name
-        self.client = weaviate.connect_to_local()
+    """
+    Hybrid (vector + BM25) search over regulation snippets.
 
-    def retrieve(self, query: str, limit: int = 5) -> List[Dict]:
-        """Performs hybrid search (Vector + BM25)."""
-        collection = self.client.collections.get(self.collection_name)
+    ``retrieve`` uses the synchronous client and is meant for scripts. The
+    agents await ``aretrieve``, which runs on the Weaviate async client so a
+    search never blocks the worker's event loop. The async client is
+    connected once per event loop and reused; searches are limited to
+    ``max_concurrency`` at a time and bounded by ``timeout`` seconds.
+    """
 
-        # Hybrid search using Weaviate v4 API
-        response = collection.query.hybrid(
-            query=query,
-            limit=limit,
-            alpha=0.5,  # Balance between Vector (1.0) and BM25 (0.0)
-        )
+    def __init__(
+        self,
+        collection_name: str = "RegulationSnippet",
+        max_concurrency: int = WEAVIATE_MAX_CONCURRENCY,
+        timeout: float = WEAVIATE_QUERY_TIMEOUT_SECONDS,
+    ):
+        self.collection_name = collection_name
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.connection = connection_params()
+        self._client = None
+        # event loop -> async client / concurrency slots / connect lock
+        self._async_clients: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._slots: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+        self._connecting: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
 
+    @property
+    def client(self):
+        """Synchronous client, connected on first use."""
+        if self._client is None:
+            self._client = weaviate.connect_to_local(**self.connection)
+        return self._client
+
+    @staticmethod
+    def _results(response) -> List[Dict]:
         results = []
         for obj in response.objects:
             results.append(
@@ -30,14 +77,83 @@ class HybridRetriever:
             )
         return results
 
+    def retrieve(self, query: str, limit: int = 5) -> List[Dict]:
+        """Performs hybrid search (Vector + BM25)."""
+        collection = self.client.collections.get(self.collection_name)
+
+        # Hybrid search using Weaviate v4 API
+        response = collection.query.hybrid(
+            query=query,
+            limit=limit,
+            alpha=0.5,  # Balance between Vector (1.0) and BM25 (0.0)
+        )
+        return self._results(response)
+
+    async def _get_async_client(self):
+        loop = asyncio.get_running_loop()
+        client = self._async_clients.get(loop)
+        if client is not None and client.is_connected():
+            return client
+        async with self._connecting.setdefault(loop, asyncio.Lock()):
+            client = self._async_clients.get(loop)
+            if client is None or not client.is_connected():
+                if client is not None:
+                    # Release the dropped connection's resources first
+                    try:
+                        await client.close()
+                    except Exception as e:
+                        print(f"[WEAVIATE] Error closing stale client: {e}")
+                client = weaviate.use_async_with_local(
+                    **self.connection,
+                    additional_config=AdditionalConfig(
+                        timeout=Timeout(
+                            query=self.timeout, init=WEAVIATE_CONNECT_TIMEOUT_SECONDS
+                        )
+                    ),
+                )
+                await client.connect()
+                self._async_clients[loop] = client
+        return client
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        slots = self._slots.get(loop)
+        if slots is None:
+            slots = asyncio.Semaphore(max(self.max_concurrency, 1))
+            self._slots[loop] = slots
+        return slots
+
+    async def aretrieve(
+        self, query: str, limit: int = 5, timeout: Optional[float] = None
+    ) -> List[Dict]:
+        """Hybrid search without blocking the event loop."""
+
+        async def search():
+            async with self._get_slots():
+                client = await self._get_async_client()
+                collection = client.collections.get(self.collection_name)
+                return await collection.query.hybrid(
+                    query=query, limit=limit, alpha=0.5
+                )
+
+        response = await asyncio.wait_for(search(), timeout=timeout or self.timeout)
+        return self._results(response)
+
     def close(self):
-        self.client.close()
+        if self._client is not None:
+            self._client.close()
+            self._client = None
+
+    async def aclose(self):
+        """Closes the async client of the running event loop."""
+        client = self._async_clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.close()
 
     async def get_relevant_regulations(self, service: str, action: str) -> List[Dict]:
         """Convenience method for orchestrator to fetch relevant regulations."""
         query = f"Regulations for {service} {action}"
-        # For now, just call retrieve. In production, this might have more logic.
-        return self.retrieve(query)
+        return await self.aretrieve(query)
 
 
 # Use a function to get the expert instance to avoid connection at import time
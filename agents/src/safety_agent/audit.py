@@ -0,0 +1,150 @@
+import os
+import re
+import json
+import atexit
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+PII_AUDIT_LOG = os.getenv("PII_AUDIT_LOG", "pii_audit.log")
+# Buffered events are written when this many are pending or this many
+# seconds have passed, whichever comes first.
+PII_AUDIT_BATCH_EVENTS = int(os.getenv("PII_AUDIT_BATCH_EVENTS", "256"))
+PII_AUDIT_FLUSH_SECONDS = float(os.getenv("PII_AUDIT_FLUSH_SECONDS", "2"))
+# The log is rotated to .1 ... .N once it would grow past this size.
+PII_AUDIT_MAX_BYTES = int(os.getenv("PII_AUDIT_MAX_BYTES", str(10 * 1024 * 1024)))
+PII_AUDIT_BACKUPS = int(os.getenv("PII_AUDIT_BACKUPS", "5"))
+
+# Placeholders left in masked text: <TIN_REDACTED>, or a bare <REDACTED>
+PLACEHOLDER = re.compile(r"<(?:(\w+?)_)?REDACTED>")
+
+
+class PIIAuditSink:
+    """
+    Buffered audit trail of masking events.
+
+    ``record`` only counts and queues: a compact line per event (time, the
+    placeholders in the masked text and how often, its length and hash), not
+    the masked text itself. A background thread appends queued lines in one
+    write per batch and rotates the file by size. Counters per label are
+    kept in memory for metrics (:meth:`stats`). Pending lines are flushed at
+    interpreter exit.
+    """
+
+    def __init__(
+        self,
+        path: str = PII_AUDIT_LOG,
+        batch_events: int = PII_AUDIT_BATCH_EVENTS,
+        flush_seconds: float = PII_AUDIT_FLUSH_SECONDS,
+        max_bytes: int = PII_AUDIT_MAX_BYTES,
+        backups: int = PII_AUDIT_BACKUPS,
+    ):
+        self.path = path
+        self.batch_events = batch_events
+        self.flush_seconds = flush_seconds
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._closed = False
+        self.events = 0
+        self.labels: Dict[str, int] = {}
+        self.written = 0
+        self.failed = 0
+        self.rotations = 0
+
+    def record(self, masked_text: str):
+        redactions: Dict[str, int] = {}
+        for m in PLACEHOLDER.finditer(masked_text):
+            redactions[m.group()] = redactions.get(m.group(), 0) + 1
+        line = json.dumps(
+            {
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "redactions": redactions,
+                "chars": len(masked_text),
+                "sha256": hashlib.sha256(masked_text.encode()).hexdigest()[:16],
+            },
+            ensure_ascii=False,
+        )
+        with self._lock:
+            self.events += 1
+            for token, count in redactions.items():
+                label = PLACEHOLDER.fullmatch(token).group(1) or "REDACTED"
+                self.labels[label] = self.labels.get(label, 0) + count
+            self._pending.append(line)
+            pending = len(self._pending)
+            if self._flusher is None and not self._closed:
+                self._flusher = threading.Thread(
+                    target=self._run, name="pii-audit-flusher", daemon=True
+                )
+                self._flusher.start()
+        if pending >= self.batch_events:
+            self._wake.set()
+
+    def _run(self):
+        while not self._closed:
+            self._wake.wait(self.flush_seconds)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self):
+        """Writes every pending line now."""
+        with self._write_lock:
+            with self._lock:
+                batch, self._pending = self._pending, []
+            if not batch:
+                return
+            data = ("\n".join(batch) + "\n").encode()
+            try:
+                self._rotate_for(len(data))
+                with open(self.path, "ab") as f:
+                    f.write(data)
+                self.written += len(batch)
+            except OSError as e:
+                self.failed += len(batch)
+                print(f"[PII AUDIT] Failed to write {len(batch)} event(s): {e}")
+
+    def _rotate_for(self, incoming: int):
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            return
+        if size == 0 or size + incoming <= self.max_bytes:
+            return
+        if self.backups <= 0:
+            os.remove(self.path)
+        else:
+            for i in range(self.backups - 1, 0, -1):
+                if os.path.exists(f"{self.path}.{i}"):
+                    os.replace(f"{self.path}.{i}", f"{self.path}.{i + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        self.rotations += 1
+
+    def close(self, timeout: float = 5.0):
+        """Stops the flusher and writes what is pending."""
+        self._closed = True
+        self._wake.set()
+        flusher = self._flusher
+        if flusher is not None and flusher is not threading.current_thread():
+            flusher.join(timeout)
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        """Masking events and placeholders per label since start, for metrics."""
+        with self._lock:
+            return {
+                "events": self.events,
+                "labels": dict(self.labels),
+                "pending": len(self._pending),
+                "written": self.written,
+                "failed": self.failed,
+                "rotations": self.rotations,
+            }
+
+
+pii_audit_sink = PIIAuditSink()
+atexit.register(pii_audit_sink.close)
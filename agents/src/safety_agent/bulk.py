@@ -0,0 +1,151 @@
+import os
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional
+from safety_agent.detectors import DetectorRegistry
+from safety_agent.engine import MaskingEngine
+
+# Pool size for bulk masking; 0 masks in-process.
+BULK_WORKERS = int(os.getenv("PII_BULK_WORKERS", str(os.cpu_count() or 1)))
+# Jobs smaller than this (total characters) are not worth starting workers.
+BULK_MIN_CHARS = int(os.getenv("PII_BULK_MIN_CHARS", str(4 * 1024 * 1024)))
+# Texts are sent to the workers in batches of about this many characters.
+BULK_BATCH_CHARS = int(os.getenv("PII_BULK_BATCH_CHARS", str(1024 * 1024)))
+# Streaming keeps this many trailing characters until the next chunk arrives;
+# a match straddling a chunk boundary is found as long as it is shorter.
+STREAM_HOLD_CHARS = int(os.getenv("PII_STREAM_HOLD_CHARS", "1024"))
+
+# Engine of a pool worker, built from the parent's detectors
+_worker_engine: Optional[MaskingEngine] = None
+
+
+def _init_worker(detectors, placeholder: str):
+    global _worker_engine
+    _worker_engine = MaskingEngine(detectors, placeholder)
+
+
+def _mask_batch(texts: List[str]) -> List[str]:
+    return [_worker_engine.mask(text) for text in texts]
+
+
+def _batches(texts: List[str], batch_chars: int) -> Iterator[List[str]]:
+    batch: List[str] = []
+    size = 0
+    for text in texts:
+        batch.append(text)
+        size += len(text)
+        if size >= batch_chars:
+            yield batch
+            batch, size = [], 0
+    if batch:
+        yield batch
+
+
+class BulkMasker:
+    """
+    Masks whole corpora (policy research crawls, backfills of historical
+    analyses) with a registry's detectors.
+
+    ``mask_many`` fans large jobs out over a process pool; the workers get
+    the registry's detectors as they are when the pool starts, so they mask
+    exactly like the parent, and the pool is rebuilt when the detectors
+    change. ``max_workers=0`` masks in-process. ``mask_iter`` masks one long
+    text arriving in chunks without holding all of it.
+    """
+
+    def __init__(
+        self,
+        registry: DetectorRegistry,
+        max_workers: int = BULK_WORKERS,
+        min_chars: int = BULK_MIN_CHARS,
+        batch_chars: int = BULK_BATCH_CHARS,
+    ):
+        self.registry = registry
+        self.max_workers = max_workers
+        self.min_chars = min_chars
+        self.batch_chars = batch_chars
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_version: Optional[str] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        version = self.registry.version
+        if self._pool is not None and self._pool_version != version:
+            self.shutdown()
+        if self._pool is None:
+            # spawn: forking a process that already runs Temporal's core
+            # threads is not safe.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.registry.detectors, self.registry.placeholder),
+            )
+            self._pool_version = version
+        return self._pool
+
+    def mask_many(self, texts: Iterable[str]) -> List[str]:
+        """Masked texts, in input order."""
+        texts = list(texts)
+        engine = self.registry.engine
+        if self.max_workers == 0 or sum(map(len, texts)) < self.min_chars:
+            return [engine.mask(text) for text in texts]
+        masked: List[str] = []
+        for batch in self._get_pool().map(
+            _mask_batch, _batches(texts, self.batch_chars)
+        ):
+            masked.extend(batch)
+        return masked
+
+    def mask_iter(
+        self, chunks: Iterable[str], hold: int = STREAM_HOLD_CHARS
+    ) -> Iterator[str]:
+        """
+        Masks a text arriving in chunks; joined, the output equals masking
+        the whole text at once. The last ``hold`` characters of what has
+        arrived are kept back (back to a whitespace, and to the start of any
+        match crossing that point) and scanned again with the next chunk.
+        Text is never cut inside a word, so a long run without whitespace is
+        held until one arrives.
+        """
+        engine = self.registry.engine
+        replacements = {
+            label: engine.placeholder.format(label=label)
+            for label in {d.label for d in engine.detectors}
+        }
+        carry = ""
+        for chunk in chunks:
+            buffer = carry + chunk
+            if len(buffer) <= hold:
+                carry = buffer
+                continue
+            cut = len(buffer) - hold
+            # Cut at a space, so the next scan still sees what precedes a
+            # match; without one, keep holding until the next chunk brings it
+            cut = max(buffer.rfind(" ", 0, cut), buffer.rfind("\n", 0, cut))
+            if cut <= 0:
+                carry = buffer
+                continue
+            spans = engine.scan(buffer)
+            for span in spans:
+                if span.start < cut < span.end:
+                    cut = span.start
+                    break
+            parts: List[str] = []
+            last = 0
+            for span in spans:
+                if span.end > cut:
+                    break
+                parts.append(buffer[last : span.start])
+                parts.append(replacements[span.label])
+                last = span.end
+            parts.append(buffer[last:cut])
+            carry = buffer[cut:]
+            yield "".join(parts)
+        if carry:
+            yield engine.mask(carry)
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+            self._pool_version = None
@@ -0,0 +1,122 @@
+import os
+import hashlib
+import threading
+from typing import List, Optional, Tuple, Union
+from common.config import policy_registry_path
+from safety_agent.engine import DIGITS, MaskingEngine, PIIDetector, PIIMatcher
+from safety_agent.gazetteer import load_gazetteers
+
+GAZETTEERS_ENABLED = os.getenv("PII_GAZETTEERS", "true").lower() != "false"
+
+PLACEHOLDER = "<{label}_REDACTED>"
+
+
+def _key(detector: Union[PIIDetector, PIIMatcher]) -> str:
+    """Regex detectors are known by label, matchers by name (many per label)."""
+    return getattr(detector, "name", detector.label)
+
+
+class DetectorRegistry:
+    """
+    The PII detectors every masker uses, in priority order: where two
+    detectors match at the same position the one registered first wins.
+    The registry compiles them into one MaskingEngine, rebuilt only when a
+    detector is registered or removed.
+    """
+
+    def __init__(self, placeholder: str = PLACEHOLDER):
+        self.placeholder = placeholder
+        self._detectors: List[Union[PIIDetector, PIIMatcher]] = []
+        self._engine: Optional[MaskingEngine] = None
+        self._lock = threading.Lock()
+
+    def register(
+        self,
+        label: str,
+        pattern: str,
+        requires: Tuple[str, ...] = (),
+        before: Optional[str] = None,
+    ):
+        """
+        Adds (or replaces) the detector for ``label``. ``before`` places it
+        ahead of an existing label, e.g. a more specific ID format before TIN.
+        """
+        self.add(PIIDetector(label, pattern, tuple(requires)), before)
+
+    def add(
+        self, detector: Union[PIIDetector, PIIMatcher], before: Optional[str] = None
+    ):
+        """Adds a detector object, e.g. a gazetteer, replacing one of the same name."""
+        key = _key(detector)
+        with self._lock:
+            detectors = [d for d in self._detectors if _key(d) != key]
+            keys = [_key(d) for d in detectors]
+            position = keys.index(before) if before in keys else len(detectors)
+            detectors.insert(position, detector)
+            self._detectors = detectors
+            self._engine = None
+
+    def unregister(self, name: str):
+        """Removes the detector with this label (or matcher name)."""
+        with self._lock:
+            self._detectors = [d for d in self._detectors if _key(d) != name]
+            self._engine = None
+
+    @property
+    def detectors(self) -> List[Union[PIIDetector, PIIMatcher]]:
+        return list(self._detectors)
+
+    @property
+    def engine(self) -> MaskingEngine:
+        engine = self._engine
+        if engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._engine = MaskingEngine(self._detectors, self.placeholder)
+                engine = self._engine
+        return engine
+
+    def warm(self) -> MaskingEngine:
+        """Builds the engine now rather than on the first document."""
+        return self.engine
+
+    @property
+    def version(self) -> str:
+        """Fingerprint of the detector set; part of the analysis cache key."""
+        material = "|".join(
+            [self.placeholder]
+            + [
+                f"{d.label}={d.pattern if isinstance(d, PIIDetector) else d.digest}"
+                for d in self._detectors
+            ]
+        )
+        return hashlib.sha256(material.encode()).hexdigest()[:12]
+
+
+pii_detectors = DetectorRegistry()
+
+# Ethiopian mobile numbers; before TIN, which a local 09... number also fits
+pii_detectors.register("PHONE", r"(?<!\w)(?:\+251|0)9\d{8}(?!\d)", DIGITS)
+pii_detectors.register("TIN", r"\b\d{10}\b", DIGITS)
+pii_detectors.register(
+    "EMAIL", r"\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b", ("@",)
+)
+# Ethiopian passports (EP1234567) and the older one-letter formats
+pii_detectors.register("PASSPORT", r"\b[A-Z]{1,2}\d{7}[A-Z]?\b", DIGITS)
+# Honorific followed by a name in Ethiopic script (very simplified)
+pii_detectors.register(
+    "NAME", r"(?:አቶ|ወ/ሮ|ወ/ሪት)\s+[\u1200-\u137F]+", ("አቶ", "ወ/ሮ", "ወ/ሪት")
+)
+# Names and places without an honorific, from the Policy Registry gazetteers
+if GAZETTEERS_ENABLED:
+    _gazetteer_dir = os.path.join(policy_registry_path(), "gazetteers")
+    _gazetteers = load_gazetteers(_gazetteer_dir)
+    if not _gazetteers:
+        print(
+            f"[GAZETTEER] No gazetteers found in {_gazetteer_dir}; names and "
+            "places without an honorific will not be masked "
+            "(set POLICY_REGISTRY_PATH)"
+        )
+    for gazetteer in _gazetteers:
+        pii_detectors.add(gazetteer)
+pii_detectors.warm()
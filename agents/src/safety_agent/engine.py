@@ -0,0 +1,150 @@
+import re
+from typing import Dict, Iterable, List, NamedTuple, Pattern, Protocol, Tuple, Union
+
+DIGITS = tuple("0123456789")
+
+
+class PIIDetector(NamedTuple):
+    label: str
+    pattern: str
+    # Literals of which every match contains at least one (e.g. "@" for
+    # e-mail addresses). A text without any of them skips the detector.
+    requires: Tuple[str, ...] = ()
+
+
+class PIIMatcher(Protocol):
+    """A detector that is not a regex, e.g. a gazetteer automaton."""
+
+    label: str
+
+    def finditer(self, text: str) -> Iterable[Tuple[int, int]]: ...
+
+
+class PIISpan(NamedTuple):
+    label: str
+    start: int
+    end: int
+    text: str
+
+
+class MaskingEngine:
+    """
+    Compiles a list of PII detectors into one alternation, so a text is
+    scanned once no matter how many detectors there are, and masks every
+    match in the same pass.
+
+    Overlaps are resolved the way one left-to-right scan resolves them: the
+    leftmost match wins, and when two detectors match at the same position
+    the one listed first wins (e.g. PHONE before TIN, so ``0911223344`` is a
+    phone number, not a TIN). Masked spans are never rescanned.
+
+    Detectors whose ``requires`` literals are all absent from a text are
+    left out of its scan; CPython's regex engine pays for every branch at
+    every position, so the rarely present ones (e-mail, Amharic honorifics)
+    are not tried on the pages that cannot contain them.
+
+    Matchers (PIIMatcher, e.g. a name gazetteer) run their own scan; their
+    spans are merged with the alternation's by the same rules, with their
+    position in the list as their priority.
+    """
+
+    def __init__(
+        self, detectors: List[Union[PIIDetector, PIIMatcher]], placeholder: str
+    ):
+        self.detectors = list(detectors)
+        self.placeholder = placeholder
+        regexes = [
+            i for i, d in enumerate(self.detectors) if isinstance(d, PIIDetector)
+        ]
+        self._matchers = [
+            (i, d)
+            for i, d in enumerate(self.detectors)
+            if not isinstance(d, PIIDetector)
+        ]
+        # Detector order is alternation order; group names map back to labels
+        self._labels: Dict[str, str] = {
+            f"d{i}": d.label for i, d in enumerate(self.detectors)
+        }
+        self._replacements: Dict[str, str] = {
+            group: placeholder.format(label=label)
+            for group, label in self._labels.items()
+        }
+        self._regexes = tuple(regexes)
+        self._gated = [i for i in regexes if self.detectors[i].requires]
+        # Active detector indexes -> compiled alternation, built on first use
+        self._compiled: Dict[Tuple[int, ...], Pattern] = {}
+        self._regex = self._compile(self._regexes)
+
+    def _compile(self, active: Tuple[int, ...]) -> Pattern:
+        regex = self._compiled.get(active)
+        if regex is None:
+            regex = re.compile(
+                "|".join(f"(?P<d{i}>{self.detectors[i].pattern})" for i in active)
+                or "(?!)"
+            )
+            self._compiled[active] = regex
+        return regex
+
+    def _regex_for(self, text: str) -> Pattern:
+        if not self._gated:
+            return self._regex
+        skipped = {
+            i
+            for i in self._gated
+            if not any(lit in text for lit in self.detectors[i].requires)
+        }
+        if not skipped:
+            return self._regex
+        return self._compile(tuple(i for i in self._regexes if i not in skipped))
+
+    def _matches(self, text: str) -> List[Tuple[int, int, str]]:
+        """(start, end, group) of every span to mask, in text order."""
+        matches = [
+            (m.start(), m.end(), m.lastgroup)
+            for m in self._regex_for(text).finditer(text)
+        ]
+        if not self._matchers:
+            return matches
+        candidates = [
+            (start, end, int(group[1:]), group) for start, end, group in matches
+        ]
+        for i, matcher in self._matchers:
+            candidates += [
+                (start, end, i, f"d{i}") for start, end in matcher.finditer(text)
+            ]
+        # Leftmost wins, then the detector listed first
+        candidates.sort(key=lambda c: (c[0], c[2]))
+        merged = []
+        last = 0
+        for start, end, _, group in candidates:
+            if start >= last:
+                merged.append((start, end, group))
+                last = end
+        return merged
+
+    def scan(self, text: str) -> List[PIISpan]:
+        """Typed, non-overlapping PII spans in text order."""
+        labels = self._labels
+        return [
+            PIISpan(labels[group], start, end, text[start:end])
+            for start, end, group in self._matches(text)
+        ]
+
+    def mask(self, text: str) -> str:
+        replacements = self._replacements
+        if not self._matchers:
+            return self._regex_for(text).sub(lambda m: replacements[m.lastgroup], text)
+        return self.redact(text)[0]
+
+    def redact(self, text: str) -> Tuple[str, List[PIISpan]]:
+        """Masked text and the spans that were masked, from a single scan."""
+        spans: List[PIISpan] = []
+        parts: List[str] = []
+        last = 0
+        for start, end, group in self._matches(text):
+            spans.append(PIISpan(self._labels[group], start, end, text[start:end]))
+            parts.append(text[last:start])
+            parts.append(self._replacements[group])
+            last = end
+        parts.append(text[last:])
+        return "".join(parts), spans
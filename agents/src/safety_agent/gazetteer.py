@@ -0,0 +1,159 @@
+import os
+import re
+import hashlib
+import yaml
+from typing import Dict, Iterator, List, Tuple
+
+# Ethiopic syllables; punctuation and numerals (U+1360 on) separate words
+WORD = re.compile(r"[\u1200-\u135F]+")
+# Between the words of a multi-word entry: spaces or the Ethiopic wordspace
+WORD_GAP = re.compile(r"[ \t\u1361]+")
+
+# Homophone series written interchangeably, folded onto one of them: each
+# series is a row of eight syllables (one per vowel order).
+_SERIES = {
+    0x1210: 0x1200,  # ሐ -> ሀ
+    0x1280: 0x1200,  # ኀ -> ሀ
+    0x1220: 0x1230,  # ሠ -> ሰ
+    0x12D0: 0x12A0,  # ዐ -> አ
+    0x1340: 0x1338,  # ፀ -> ጸ
+}
+# First and fourth order of ሀ and አ are interchangeable in names (ሃና/ሀና)
+_ORDERS = {0x1203: 0x1200, 0x12A3: 0x12A0}
+
+
+def _fold_table() -> Dict[int, int]:
+    table = {
+        base + order: canonical + order
+        for base, canonical in _SERIES.items()
+        for order in range(8)
+    }
+    table = {src: _ORDERS.get(dst, dst) for src, dst in table.items()}
+    table.update(_ORDERS)
+    return table
+
+
+FOLD = _fold_table()
+
+
+def fold(text: str) -> str:
+    """Maps Ge'ez spelling variants to one form; keeps offsets unchanged."""
+    return text.translate(FOLD)
+
+
+class Gazetteer:
+    """
+    Aho-Corasick automaton over Ethiopic words, built once from a list of
+    names or places. Entries match as whole words (multi-word entries as
+    consecutive words), after folding homophone letters, so ``ኃይሌ`` and
+    ``ሃይሌ`` are the same name.
+
+    The automaton steps over words rather than characters: the text's
+    Ethiopic words are found with one regex scan and each is looked up in a
+    set of the entries' words, most to go no further, so a scan is linear
+    in the text however many entries there are.
+    Where entries overlap, the leftmost and then the longest match wins.
+    """
+
+    def __init__(self, label: str, entries: List[str], name: str = ""):
+        self.label = label
+        self.name = name or label.lower()
+        phrases = sorted({tuple(fold(e).split()) for e in entries if e.strip()})
+        self.phrases = phrases
+        self.size = len(phrases)
+        self.digest = hashlib.sha256(
+            "\n".join(" ".join(p) for p in phrases).encode()
+        ).hexdigest()[:12]
+        self._build(phrases)
+
+    def _build(self, phrases: List[Tuple[str, ...]]):
+        goto: List[Dict[str, int]] = [{}]
+        # Word counts of the entries ending at each state
+        out: List[Tuple[int, ...]] = [()]
+        for phrase in phrases:
+            state = 0
+            for word in phrase:
+                nxt = goto[state].get(word)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][word] = nxt
+                    goto.append({})
+                    out.append(())
+                state = nxt
+            out[state] = (len(phrase),)
+
+        # Breadth-first failure links; outputs inherit their fallback's
+        # (children of the root fall back to the root: already 0)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            for word, nxt in goto[state].items():
+                queue.append(nxt)
+                f = fail[state]
+                while f and word not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(word, 0)
+                out[nxt] = out[nxt] + out[fail[nxt]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+        self._longest = max((len(p) for p in phrases), default=0)
+        self._vocabulary = {word for phrase in phrases for word in phrase}
+
+    def finditer(self, text: str) -> Iterator[Tuple[int, int]]:
+        """Non-overlapping (start, end) spans of gazetteer entries in text order."""
+        goto, fail, out, longest = self._goto, self._fail, self._out, self._longest
+        matches: List[Tuple[int, int]] = []
+        state = 0
+        # Word spans since the last break (non-space between two words)
+        words: List[Tuple[int, int]] = []
+        last_end = -1
+        vocabulary = self._vocabulary
+        # Folding keeps offsets, so spans in the folded text are spans in text
+        for m in WORD.finditer(fold(text)):
+            word = m.group()
+            if word not in vocabulary:
+                # Part of no entry: any match in progress is broken
+                state = 0
+                words = []
+                continue
+            start, end = m.span()
+            if words and not WORD_GAP.fullmatch(text, last_end, start):
+                state = 0
+                words = []
+            words.append((start, end))
+            if len(words) > longest:
+                del words[0]
+            last_end = end
+            while state and word not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(word, 0)
+            for count in out[state]:
+                matches.append((words[-count][0], end))
+
+        # Leftmost, then longest; drop matches overlapping an accepted one
+        matches.sort(key=lambda span: (span[0], -span[1]))
+        accepted_end = -1
+        for start, end in matches:
+            if start >= accepted_end:
+                accepted_end = end
+                yield start, end
+
+
+def load_gazetteers(directory: str) -> List[Gazetteer]:
+    """Gazetteers from ``<registry>/gazetteers/*.yaml``, in file name order."""
+    gazetteers = []
+    if not os.path.isdir(directory):
+        return gazetteers
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith((".yaml", ".yml")):
+            continue
+        try:
+            with open(os.path.join(directory, name), "r") as f:
+                data = yaml.safe_load(f)
+            gazetteers.append(
+                Gazetteer(data["label"], data.get("entries") or [], data.get("id"))
+            )
+        except Exception as e:
+            print(f"[GAZETTEER] Error loading {name}: {e}")
+    return gazetteers
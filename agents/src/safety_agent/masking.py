@@ -1,39 +1,82 @@
-import re
-from typing import Dict, Any
+from typing import Dict, Any, Iterable, Iterator, List, Optional
+from safety_agent.audit import PIIAuditSink, pii_audit_sink
+from safety_agent.bulk import BulkMasker
+from safety_agent.detectors import DetectorRegistry, pii_detectors
+from safety_agent.engine import MaskingEngine
+from safety_agent.walker import MaskingWalker
 
 
 class SafetyAgent:
     """
     Identifies and masks PII (Personally Identifiable Information)
     to ensure cloud-compliance and privacy.
+
+    Detectors come from the shared registry (safety_agent.detectors), so the
+    orchestrator, the RAG summarizer and progress streaming all mask the
+    same things the same way.
     """
 
-    # Simple regex patterns for PII
-    PATTERNS = {
-        "email": r"[\w\.-]+@[\w\.-]+\.\w+",
-        "phone_et": r"(\+251|0)9\d{8}",
-        "passport": r"[A-Z]\d{7}[A-Z]",
-        # Mock Amharic name detection (very simplified)
-        "amharic_name_indicator": r"(አቶ|ወ/ሮ|ወ/ሪት)\s+[\u1200-\u137F]+",
-    }
-
-    def mask_pii(self, text: str) -> str:
-        """Replaces detected PII with [MASKED]."""
-        masked_text = text
-        for label, pattern in self.PATTERNS.items():
-            masked_text = re.sub(pattern, f"[MASKED_{label.upper()}]", masked_text)
-        return masked_text
+    def __init__(
+        self,
+        registry: DetectorRegistry = pii_detectors,
+        audit_sink: PIIAuditSink = pii_audit_sink,
+    ):
+        self.registry = registry
+        self.audit_sink = audit_sink
+        self._bulk: Optional[BulkMasker] = None
+
+    @property
+    def engine(self) -> MaskingEngine:
+        return self.registry.engine
+
+    def mask(self, text: str) -> str:
+        """Replaces detected PII with typed placeholders, e.g. <PHONE_REDACTED>."""
+        return self.engine.mask(text)
+
+    # Name used by the orchestrator
+    mask_pii = mask
+
+    @property
+    def bulk(self) -> BulkMasker:
+        if self._bulk is None:
+            self._bulk = BulkMasker(self.registry)
+        return self._bulk
+
+    def mask_many(self, texts: Iterable[str]) -> List[str]:
+        """Masks many texts, across a process pool for large jobs."""
+        return self.bulk.mask_many(texts)
+
+    def mask_iter(self, chunks: Iterable[str]) -> Iterator[str]:
+        """Masks one text streamed in chunks, yielding masked chunks."""
+        return self.bulk.mask_iter(chunks)
+
+    def mask_structure(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Masks every string in nested extraction data in place and returns
+        the span index (also stored under ``data["pii"]``).
+        """
+        return MaskingWalker(self.engine, self.registry.version).mask(data)
 
     def extract_and_mask(self, raw_data: Dict[str, Any]) -> Dict[str, Any]:
-        """Processes raw extraction data for safety."""
-        raw_text = raw_data.get("raw_text", "")
-        masked_text = self.mask_pii(raw_text)
+        """
+        Masks raw extraction data for safety, in place: raw text, fields,
+        per-page text and anything else later stages added.
+        """
+        index = self.mask_structure(raw_data)
 
         return {
-            "masked_text": masked_text,
-            "pii_detected": masked_text != raw_text,
+            "masked_text": raw_data.get("raw_text", ""),
+            "pii_detected": bool(index["counts"]),
+            "pii": index,
             "safety_status": "CLEAN",
         }
 
+    def audit_log(self, original_text: str, masked_text: str):
+        """
+        Records the masking event for auditing. Buffered: the line reaches
+        the log with the next batch, see PIIAuditSink.
+        """
+        self.audit_sink.record(masked_text)
+
 
 safety_agent = SafetyAgent()
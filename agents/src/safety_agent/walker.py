@@ -0,0 +1,89 @@
+import hashlib
+import json
+from typing import Any, Dict, List
+from safety_agent.engine import MaskingEngine
+
+# Key under which the span index is kept in the masked structure
+PII_INDEX_KEY = "pii"
+
+# path -> [[label, start, end], ...], offsets into the masked string
+SpanIndex = Dict[str, List[List[Any]]]
+
+
+def content_digest(value: Any) -> str:
+    """Stable hash of a JSON-like subtree."""
+    data = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(data.encode(), digest_size=12).hexdigest()
+
+
+class MaskingWalker:
+    """
+    Masks every string in a nested ``extracted_data`` structure (raw text,
+    template fields, per-page text, metadata) in place.
+
+    Alongside the masked data it keeps a compact span index under ``pii``:
+    per top-level key, the digest of its masked subtree and the PII spans
+    found in it, addressed by dotted path (``fields.tin``, ``pages.0.text``).
+    A later walk over the same structure, e.g. after an OCR stage added
+    keys, skips every subtree whose digest still matches and reuses its
+    spans, so only new or changed data is scanned. Downstream consumers read
+    the index instead of re-scanning.
+    """
+
+    def __init__(self, engine: MaskingEngine, version: str):
+        self.engine = engine
+        self.version = version
+
+    def mask(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Masks ``data`` in place and returns (and stores) its span index."""
+        previous = data.get(PII_INDEX_KEY) or {}
+        known = (
+            previous.get("subtrees", {})
+            if previous.get("version") == self.version
+            else {}
+        )
+        subtrees: Dict[str, Dict[str, Any]] = {}
+        for key, value in data.items():
+            if key == PII_INDEX_KEY:
+                continue
+            entry = known.get(key)
+            if entry is not None and entry["digest"] == content_digest(value):
+                subtrees[key] = entry
+                continue
+            spans: SpanIndex = {}
+            data[key] = self._walk(value, key, spans)
+            subtrees[key] = {"digest": content_digest(data[key]), "spans": spans}
+
+        counts: Dict[str, int] = {}
+        for entry in subtrees.values():
+            for found in entry["spans"].values():
+                for label, _, _ in found:
+                    counts[label] = counts.get(label, 0) + 1
+        index = {"version": self.version, "subtrees": subtrees, "counts": counts}
+        data[PII_INDEX_KEY] = index
+        return index
+
+    def _walk(self, value: Any, path: str, spans: SpanIndex) -> Any:
+        if isinstance(value, str):
+            return self._mask_text(value, path, spans)
+        if isinstance(value, dict):
+            for key, item in value.items():
+                value[key] = self._walk(item, f"{path}.{key}", spans)
+        elif isinstance(value, list):
+            for i, item in enumerate(value):
+                value[i] = self._walk(item, f"{path}.{i}", spans)
+        return value
+
+    def _mask_text(self, text: str, path: str, spans: SpanIndex) -> str:
+        masked, found = self.engine.redact(text)
+        if found:
+            placeholder = self.engine.placeholder
+            shift = 0
+            entries = []
+            for span in found:
+                length = len(placeholder.format(label=span.label))
+                start = span.start + shift
+                entries.append([span.label, start, start + length])
+                shift += length - (span.end - span.start)
+            spans[path] = entries
+        return masked
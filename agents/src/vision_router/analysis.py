@@ -0,0 +1,221 @@
+import numpy as np
+from PIL import Image
+from pydantic import BaseModel, Field
+from typing import Callable, Dict, Any, List, Optional
+from vision_router.confidence import field_confidence
+from vision_router.pages import merge_pages, page_image
+from vision_router.preprocess import PREPROCESS_ENABLED, prepare_image
+from vision_router.script import ocr_image
+
+# Feature detectors take the downscaled RGB page and return named flags
+# (e.g. has_stamp); they run in the same pool job as OCR.
+FeatureDetector = Callable[[np.ndarray], Dict[str, bool]]
+
+# Field extractors take the OCR-ready page and return an ``ocr_image``-style
+# result plus ``fields``; used instead of full-page OCR when the document's
+# template is known (see document_analyzer.templates.extract_fields).
+FieldExtractor = Callable[[Image.Image], Dict[str, Any]]
+
+# Classifiers take the OCR-ready page before any OCR and return the matching
+# template as {"template_id", "document_type", "distance"} or None. A match
+# may carry a ``field_extractor`` for that template's fast path.
+DocumentClassifier = Callable[[Image.Image], Optional[Dict[str, Any]]]
+
+# A layout match alone does not make a page that document: the matched
+# template's pattern must also have read this field from its region.
+CONFIRMING_FIELD = "document_number"
+
+
+class OCRWord(BaseModel):
+    text: str
+    conf: float
+    block: int = 0
+    par: int = 0
+    line: int = 0
+    # Box in the OCR image's pixel space
+    left: int = 0
+    top: int = 0
+    width: int = 0
+    height: int = 0
+
+
+class PageAnalysis(BaseModel):
+    index: int
+    text: str = ""
+    lang: Optional[str] = None
+    method: str = "local_tesseract"
+    confidence: float = 0.0
+    passes: int = 0
+    words: List[OCRWord] = Field(default_factory=list)
+    features: Dict[str, bool] = Field(default_factory=dict)
+    # Set when only template regions were OCRed: name -> {value, confidence}
+    fields: Dict[str, Dict[str, Any]] = Field(default_factory=dict)
+    # Template the page layout matched, if any
+    template_id: Optional[str] = None
+    document_type: Optional[str] = None
+
+
+class DocumentAnalysis(BaseModel):
+    """
+    Everything read from a document in one pass per page: text, word boxes,
+    confidences and detected features. The router, the analyzer, field
+    extraction and feature detection all consume this object instead of
+    opening and OCRing the page again.
+    """
+
+    pages: List[PageAnalysis] = Field(default_factory=list)
+
+    @property
+    def raw_text(self) -> str:
+        return self.merged()["raw_text"]
+
+    @property
+    def words(self) -> List[OCRWord]:
+        return [
+            w for page in sorted(self.pages, key=lambda p: p.index) for w in page.words
+        ]
+
+    @property
+    def confidence(self) -> float:
+        """Page confidences weighted by how much text each page contributed."""
+        total_chars = sum(len(p.text) for p in self.pages)
+        if not total_chars:
+            return 0.0
+        return sum(p.confidence * len(p.text) for p in self.pages) / total_chars
+
+    @property
+    def method(self) -> str:
+        if any(p.method == "local_tesseract" for p in self.pages):
+            return "local_tesseract"
+        return "pdf_text_layer"
+
+    @property
+    def features(self) -> Dict[str, bool]:
+        """A feature is present if any page that was checked shows it."""
+        merged: Dict[str, bool] = {}
+        for page in self.pages:
+            for name, present in page.features.items():
+                merged[name] = merged.get(name, False) or present
+        return merged
+
+    def merged(self) -> Dict[str, Any]:
+        return merge_pages([p.model_dump(exclude={"words"}) for p in self.pages])
+
+    def lang_counts(self) -> Dict[str, int]:
+        """Pages per OCR language setting, so the script-detection win is measurable."""
+        counts: Dict[str, int] = {}
+        for page in self.pages:
+            if page.lang:
+                counts[page.lang] = counts.get(page.lang, 0) + 1
+        return counts
+
+    @property
+    def fields(self) -> Dict[str, Dict[str, Any]]:
+        """Template-extracted fields; the first page that has a value wins."""
+        merged: Dict[str, Dict[str, Any]] = {}
+        for page in sorted(self.pages, key=lambda p: p.index):
+            for name, field in page.fields.items():
+                if merged.get(name, {}).get("value") is None:
+                    merged[name] = field
+        return merged
+
+    @property
+    def document_types(self) -> List[str]:
+        """
+        Distinct classified document types, in page order, of the pages whose
+        template also read a ``CONFIRMING_FIELD`` value. These count as
+        submitted documents in compliance, so a similar layout is not enough.
+        """
+        types: List[str] = []
+        for page in sorted(self.pages, key=lambda p: p.index):
+            confirmed = (page.fields.get(CONFIRMING_FIELD) or {}).get("value")
+            if page.document_type and confirmed and page.document_type not in types:
+                types.append(page.document_type)
+        return types
+
+    def field_confidence(self, value: str) -> Optional[float]:
+        return field_confidence([w.model_dump() for w in self.words], value)
+
+
+def analyze_image(
+    image: Image.Image,
+    index: int = 0,
+    lang: Optional[str] = None,
+    feature_detector: Optional[FeatureDetector] = None,
+    field_extractor: Optional[FieldExtractor] = None,
+    classifier: Optional[DocumentClassifier] = None,
+) -> PageAnalysis:
+    """
+    Decodes, preprocesses and OCRs one page image once, then runs feature
+    detection on the same downscaled array. A ``classifier`` matches the
+    page layout against known templates first; with a ``field_extractor``
+    (given, or from the matched template) only its regions are OCRed.
+    Executed inside the OCR pool.
+    """
+    if PREPROCESS_ENABLED:
+        prepared = prepare_image(image)
+        ocr_input, rgb = prepared["ocr_image"], prepared["rgb"]
+    else:
+        ocr_input, rgb = image, None
+
+    match = classifier(ocr_input) if classifier is not None else None
+    if match and field_extractor is None:
+        field_extractor = match.get("field_extractor")
+
+    if field_extractor is not None:
+        ocr = field_extractor(ocr_input)
+    else:
+        ocr = ocr_image(ocr_input, lang)
+    features: Dict[str, bool] = {}
+    if feature_detector is not None:
+        if rgb is None:
+            rgb = np.asarray(image.convert("RGB"))
+        features = feature_detector(rgb)
+
+    return PageAnalysis(
+        index=index,
+        text=ocr["text"],
+        lang=ocr["lang"],
+        confidence=ocr["confidence"],
+        passes=ocr["passes"],
+        words=[OCRWord(**w) for w in ocr["words"]],
+        features=features,
+        fields=ocr.get("fields", {}),
+        template_id=match["template_id"] if match else None,
+        document_type=match["document_type"] if match else None,
+    )
+
+
+def analyze_file(
+    file_path: str,
+    lang: Optional[str] = None,
+    feature_detector: Optional[FeatureDetector] = None,
+    classifier: Optional[DocumentClassifier] = None,
+) -> PageAnalysis:
+    """Single-image upload; executed inside the OCR pool."""
+    return analyze_image(
+        Image.open(file_path),
+        lang=lang,
+        feature_detector=feature_detector,
+        classifier=classifier,
+    )
+
+
+def analyze_pdf_page(
+    file_path: str,
+    index: int,
+    lang: Optional[str] = None,
+    feature_detector: Optional[FeatureDetector] = None,
+    classifier: Optional[DocumentClassifier] = None,
+) -> PageAnalysis:
+    """One scanned PDF page; executed inside the OCR pool, one job per page."""
+    image = page_image(file_path, index)
+    if image is None:
+        return PageAnalysis(index=index)
+    return analyze_image(
+        image,
+        index=index,
+        lang=lang,
+        feature_detector=feature_detector,
+        classifier=classifier,
+    )
@@ -0,0 +1,83 @@
+import os
+import re
+from typing import Dict, Any, List, Optional
+
+# A pass at or above this mean word confidence is accepted as-is.
+EARLY_EXIT_CONFIDENCE = float(os.getenv("OCR_EARLY_EXIT_CONFIDENCE", "0.9"))
+
+# Below this, a single-language pass is retried with both packs before the
+# page is handed to the (far more expensive) vision-LLM fallback.
+RETRY_CONFIDENCE = float(os.getenv("OCR_RETRY_CONFIDENCE", "0.6"))
+
+
+def words_from_data(data: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """
+    Flattens ``pytesseract.image_to_data(..., output_type=DICT)`` into the
+    recognised words, each with its confidence (0-1), layout position and
+    box. Layout-only rows (conf -1) and empty words are dropped.
+    """
+    words = []
+    for i, text in enumerate(data.get("text", [])):
+        text = (text or "").strip()
+        conf = float(data["conf"][i])
+        if not text or conf < 0:
+            continue
+        words.append(
+            {
+                "text": text,
+                "conf": conf / 100.0,
+                "block": data["block_num"][i],
+                "par": data["par_num"][i],
+                "line": data["line_num"][i],
+                **{
+                    key: int(data[key][i])
+                    for key in ("left", "top", "width", "height")
+                    if key in data
+                },
+            }
+        )
+    return words
+
+
+def text_from_words(words: List[Dict[str, Any]]) -> str:
+    """Rebuilds page text: words on a line joined by spaces, blank line between paragraphs."""
+    out: List[str] = []
+    prev = None
+    for word in words:
+        position = (word["block"], word["par"], word["line"])
+        if prev is not None:
+            if position[:2] != prev[:2]:
+                out.append("\n\n")
+            elif position != prev:
+                out.append("\n")
+            else:
+                out.append(" ")
+        out.append(word["text"])
+        prev = position
+    return "".join(out)
+
+
+def mean_confidence(words: List[Dict[str, Any]]) -> float:
+    """Character-weighted mean word confidence; 0.0 when nothing was read."""
+    chars = sum(len(w["text"]) for w in words)
+    if not chars:
+        return 0.0
+    return sum(w["conf"] * len(w["text"]) for w in words) / chars
+
+
+def field_confidence(words: List[Dict[str, Any]], value: str) -> Optional[float]:
+    """
+    Confidence of an extracted field value: the mean confidence of the run
+    of OCR words that spells it. Falls back to the words containing part of
+    the value (e.g. a label glued to it), or None if it was not read at all.
+    """
+    tokens = re.split(r"\s+", (value or "").strip())
+    if not tokens or not tokens[0]:
+        return None
+    texts = [w["text"] for w in words]
+    n = len(tokens)
+    for start in range(len(texts) - n + 1):
+        if texts[start : start + n] == tokens:
+            return mean_confidence(words[start : start + n])
+    partial = [w for w in words if any(t in w["text"] for t in tokens)]
+    return mean_confidence(partial) if partial else None
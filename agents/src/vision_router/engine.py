@@ -0,0 +1,175 @@
+import os
+import abc
+import queue
+import threading
+import pytesseract
+from PIL import Image
+from typing import Dict, Any, List, Optional
+
+try:
+    import tesserocr
+
+    TESSEROCR_AVAILABLE = True
+except ImportError:
+    tesserocr = None
+    TESSEROCR_AVAILABLE = False
+
+# Language settings loaded when an OCR worker process starts.
+WARM_LANGS = [
+    lang.strip()
+    for lang in os.getenv("OCR_WARM_LANGS", "eng,amh,eng+amh").split(",")
+    if lang.strip()
+]
+
+DATA_KEYS = (
+    "text",
+    "conf",
+    "block_num",
+    "par_num",
+    "line_num",
+    "left",
+    "top",
+    "width",
+    "height",
+)
+
+
+class OCREngine(abc.ABC):
+    """
+    Backend that turns a page image into Tesseract's word-level data, in the
+    shape of ``pytesseract.image_to_data(..., output_type=Output.DICT)``.
+    """
+
+    name = "base"
+
+    @abc.abstractmethod
+    def version(self) -> str:
+        """Engine and library version, part of the analysis cache key."""
+
+    @abc.abstractmethod
+    def image_to_data(self, image: Image.Image, lang: str) -> Dict[str, List[Any]]:
+        """Word-level data for one page."""
+
+    def warm(self, langs: List[str]):
+        """
+        Loads models ahead of the first page. Engines that load nothing up
+        front (pytesseract starts a process per call) keep this no-op.
+        """
+        return
+
+
+class PytesseractEngine(OCREngine):
+    """Fallback: one ``tesseract`` subprocess per call, models reloaded each time."""
+
+    name = "tesseract"
+
+    def version(self) -> str:
+        return str(pytesseract.get_tesseract_version())
+
+    def image_to_data(self, image: Image.Image, lang: str) -> Dict[str, List[Any]]:
+        return pytesseract.image_to_data(
+            image, lang=lang, output_type=pytesseract.Output.DICT
+        )
+
+
+class TesserocrEngine(OCREngine):
+    """
+    In-process libtesseract via ``tesserocr``. Each language setting keeps a
+    small pool of initialised ``PyTessBaseAPI`` instances, so traineddata is
+    loaded once per worker process instead of once per page. An API instance
+    is not thread-safe; each call checks one out for its duration.
+    """
+
+    name = "tesserocr"
+
+    def __init__(self):
+        self._apis: Dict[str, "queue.SimpleQueue"] = {}
+        self._lock = threading.Lock()
+
+    def version(self) -> str:
+        return tesserocr.tesseract_version().split()[1]
+
+    def _pool(self, lang: str) -> "queue.SimpleQueue":
+        with self._lock:
+            return self._apis.setdefault(lang, queue.SimpleQueue())
+
+    def _checkout(self, lang: str):
+        try:
+            return self._pool(lang).get_nowait()
+        except queue.Empty:
+            return tesserocr.PyTessBaseAPI(lang=lang)
+
+    def warm(self, langs: List[str]):
+        for lang in langs:
+            self._pool(lang).put(tesserocr.PyTessBaseAPI(lang=lang))
+
+    def image_to_data(self, image: Image.Image, lang: str) -> Dict[str, List[Any]]:
+        api = self._checkout(lang)
+        try:
+            api.SetImage(image)
+            api.Recognize()
+            return self._collect(api)
+        finally:
+            api.Clear()
+            self._pool(lang).put(api)
+
+    @staticmethod
+    def _collect(api) -> Dict[str, List[Any]]:
+        data: Dict[str, List[Any]] = {key: [] for key in DATA_KEYS}
+        iterator = api.GetIterator()
+        if iterator is None:
+            return data
+        ril = tesserocr.RIL
+        block = par = line = 0
+        for word in tesserocr.iterate_level(iterator, ril.WORD):
+            if word.IsAtBeginningOf(ril.BLOCK):
+                block, par, line = block + 1, 0, 0
+            if word.IsAtBeginningOf(ril.PARA):
+                par, line = par + 1, 0
+            if word.IsAtBeginningOf(ril.TEXTLINE):
+                line += 1
+            data["text"].append(word.GetUTF8Text(ril.WORD) or "")
+            data["conf"].append(word.Confidence(ril.WORD))
+            data["block_num"].append(block)
+            data["par_num"].append(par)
+            data["line_num"].append(line)
+            x1, y1, x2, y2 = word.BoundingBox(ril.WORD) or (0, 0, 0, 0)
+            data["left"].append(x1)
+            data["top"].append(y1)
+            data["width"].append(x2 - x1)
+            data["height"].append(y2 - y1)
+        return data
+
+
+_engine: Optional[OCREngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> OCREngine:
+    """
+    Returns this process's OCR engine, created on first use. ``OCR_BACKEND``
+    selects ``tesserocr`` or ``pytesseract``; ``auto`` (default) prefers
+    tesserocr when it is installed.
+    """
+    global _engine
+    with _engine_lock:
+        if _engine is None:
+            backend = os.getenv("OCR_BACKEND", "auto").lower()
+            if backend == "tesserocr" and not TESSEROCR_AVAILABLE:
+                print(
+                    "[OCR] OCR_BACKEND=tesserocr but it is not installed; using pytesseract"
+                )
+            if backend in ("auto", "tesserocr") and TESSEROCR_AVAILABLE:
+                _engine = TesserocrEngine()
+            else:
+                _engine = PytesseractEngine()
+        return _engine
+
+
+def warm_engine():
+    """OCR pool initializer: loads ``WARM_LANGS`` once per worker process."""
+    try:
+        get_engine().warm(WARM_LANGS)
+    except Exception as e:
+        # A missing language pack must not kill the worker; pages load lazily.
+        print(f"[OCR] Engine warm-up failed: {e}")
@@ -0,0 +1,158 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional
+from vision_router.engine import warm_engine
+
+
+class OCRTimeoutError(TimeoutError):
+    """Raised when a single OCR job exceeds its time budget."""
+
+
+class OCRExecutor:
+    """
+    Bounded process pool for CPU-bound OCR work.
+
+    Tesseract runs for seconds per page; doing that on the worker event loop
+    stalls every other activity, heartbeat and audit POST. Jobs are awaited
+    from the router while the pool does the work, at most ``max_workers`` at a
+    time; the rest wait in an in-memory queue whose depth is exposed via
+    :meth:`stats`. ``max_workers=0`` runs jobs on a single in-process thread,
+    which keeps test patches and local debugging simple.
+
+    ``initializer`` runs once in each pool worker as it starts, e.g. to load
+    OCR models before the first page arrives.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        initializer: Optional[Callable[[], None]] = None,
+    ):
+        self.max_workers = (
+            max_workers
+            if max_workers is not None
+            else int(os.getenv("OCR_POOL_SIZE") or os.cpu_count() or 1)
+        )
+        self.timeout = (
+            timeout
+            if timeout is not None
+            else float(os.getenv("OCR_JOB_TIMEOUT_SECONDS", "120"))
+        )
+        self.initializer = initializer
+        self._pool: Optional[Executor] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._reset_counters()
+
+    def _reset_counters(self):
+        self._queued = 0
+        self._running = 0
+        self._completed = 0
+        self._failed = 0
+        self._timed_out = 0
+
+    def configure(self, max_workers: int, timeout: Optional[float] = None):
+        """Resizes the pool; takes effect on the next submitted job."""
+        self.shutdown()
+        self.max_workers = max_workers
+        if timeout is not None:
+            self.timeout = timeout
+
+    def _get_pool(self) -> Executor:
+        if self._pool is None:
+            if self.max_workers == 0:
+                self._pool = ThreadPoolExecutor(
+                    max_workers=1, initializer=self.initializer
+                )
+            else:
+                # spawn: forking a process that already runs Temporal's core
+                # threads is not safe.
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=self.initializer,
+                )
+        return self._pool
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(max(self.max_workers, 1))
+        return self._slots
+
+    async def run(
+        self, fn: Callable[..., Any], *args: Any, timeout: Optional[float] = None
+    ) -> Any:
+        """
+        Runs ``fn(*args)`` in the pool and awaits the result.
+
+        ``fn`` and its arguments must be picklable (module-level functions).
+        Raises :class:`OCRTimeoutError` if the job runs longer than ``timeout``
+        seconds once it has been scheduled; queue wait does not count.
+        """
+        slots = self._get_slots()
+        self._queued += 1
+        try:
+            await slots.acquire()
+        finally:
+            self._queued -= 1
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = loop.run_in_executor(self._get_pool(), fn, *args)
+        except BaseException:
+            slots.release()
+            raise
+
+        # The slot is held until the pool really finishes the job, so a timed
+        # out job that keeps running still counts against the pool size.
+        self._running += 1
+
+        def _release(_):
+            self._running -= 1
+            slots.release()
+
+        future.add_done_callback(_release)
+
+        try:
+            result = await asyncio.wait_for(
+                asyncio.shield(future), timeout=timeout or self.timeout
+            )
+        except asyncio.TimeoutError as e:
+            self._timed_out += 1
+            raise OCRTimeoutError(
+                f"OCR job exceeded {timeout or self.timeout}s time budget"
+            ) from e
+        except BrokenProcessPool:
+            self._failed += 1
+            # A crashed worker poisons the whole pool; rebuild it on next use.
+            self._pool = None
+            raise
+        except Exception:
+            self._failed += 1
+            raise
+
+        self._completed += 1
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Returns pool size, queue depth and job counters for metrics."""
+        return {
+            "pool_size": self.max_workers,
+            "queued": self._queued,
+            "running": self._running,
+            "completed": self._completed,
+            "failed": self._failed,
+            "timed_out": self._timed_out,
+        }
+
+    def shutdown(self, wait: bool = True):
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+        self._slots = None
+
+
+ocr_executor = OCRExecutor(initializer=warm_engine)
@@ -0,0 +1,261 @@
+import io
+import os
+import json
+import time
+import base64
+import asyncio
+from PIL import Image
+from typing import Dict, Any, List, Optional
+
+from common.http import http_clients
+from cost_control_agent.enforcer import budget_enforcer
+from cost_control_agent.monitor import cost_monitor
+from vision_router.pages import is_pdf, page_image
+
+# OpenAI-compatible chat completions endpoint with image input, hosted
+# in-country or on-premises: page images carry PII, so there is no cloud
+# default and the fallback stays off until VISION_LLM_API_URL is set.
+VISION_LLM_API_URL = os.getenv("VISION_LLM_API_URL", "")
+VISION_LLM_MODEL = os.getenv("VISION_LLM_MODEL", "llama-3.2-90b-vision-preview")
+VISION_LLM_API_KEY = os.getenv("VISION_LLM_API_KEY", "")
+
+# Requests in flight across all documents in this worker process.
+VISION_LLM_MAX_CONCURRENCY = int(os.getenv("VISION_LLM_MAX_CONCURRENCY", "2"))
+# Low-confidence pages of one document sent together in one request.
+VISION_LLM_BATCH_PAGES = int(os.getenv("VISION_LLM_BATCH_PAGES", "4"))
+VISION_LLM_TIMEOUT_SECONDS = float(os.getenv("VISION_LLM_TIMEOUT_SECONDS", "60"))
+
+# Pages are re-encoded before upload: long edge ~1600 px keeps A4 text legible
+# at a fraction of a raw phone photo's size (and the provider's image tokens).
+VISION_IMAGE_MAX_EDGE = int(os.getenv("VISION_LLM_IMAGE_MAX_EDGE", "1600"))
+VISION_IMAGE_FORMAT = os.getenv("VISION_LLM_IMAGE_FORMAT", "JPEG").upper()
+VISION_IMAGE_QUALITY = int(os.getenv("VISION_LLM_IMAGE_QUALITY", "80"))
+
+# Used when the model returns plain text for a single page instead of JSON.
+VISION_DEFAULT_CONFIDENCE = 0.8
+
+PROMPT = (
+    "Transcribe every page image exactly, in its original language (English "
+    "or Amharic). The images are pages {indexes} of one document, in that "
+    'order. Reply with JSON: {{"pages": [{{"index": <page>, "text": '
+    '"<transcription>", "confidence": <0-1>}}]}}.'
+)
+
+
+def encode_page(
+    image: Image.Image,
+    max_edge: int = VISION_IMAGE_MAX_EDGE,
+    fmt: str = VISION_IMAGE_FORMAT,
+    quality: int = VISION_IMAGE_QUALITY,
+) -> bytes:
+    """Downscales to ``max_edge`` (never up) and re-encodes as JPEG or WebP."""
+    scale = max_edge / max(image.size)
+    if scale < 1.0:
+        size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        if image.format == "JPEG":
+            image.draft("RGB", size)
+        image = image.resize(size, Image.Resampling.LANCZOS, reducing_gap=3.0)
+    if image.mode not in ("RGB", "L"):
+        image = image.convert("RGB")
+    out = io.BytesIO()
+    image.save(out, format=fmt, quality=quality)
+    return out.getvalue()
+
+
+def load_pages(file_path: str, indexes: List[int]) -> Dict[int, bytes]:
+    """Encoded page images for ``indexes``; PDF pages without a scan are skipped."""
+    if not is_pdf(file_path):
+        return {0: encode_page(Image.open(file_path))} if 0 in indexes else {}
+    encoded = {}
+    for index in indexes:
+        image = page_image(file_path, index)
+        if image is not None:
+            encoded[index] = encode_page(image)
+    return encoded
+
+
+class VisionLLMFallback:
+    """
+    Reads pages local OCR could not, with a vision-capable LLM on a
+    sovereign endpoint (``VISION_LLM_API_URL``).
+
+    Every request in the process goes through one concurrency limit, so a
+    burst of poor scans queues here instead of flooding the provider. Pages
+    of the same document are batched into shared requests. Each request is
+    checked against the budget first; its latency and cost are recorded.
+    """
+
+    def __init__(
+        self,
+        api_url: str = VISION_LLM_API_URL,
+        model: str = VISION_LLM_MODEL,
+        api_key: str = VISION_LLM_API_KEY,
+        max_concurrency: int = VISION_LLM_MAX_CONCURRENCY,
+        batch_pages: int = VISION_LLM_BATCH_PAGES,
+        timeout: float = VISION_LLM_TIMEOUT_SECONDS,
+    ):
+        self.api_url = api_url
+        self.model = model
+        self.api_key = api_key
+        self.max_concurrency = max_concurrency
+        self.batch_pages = batch_pages
+        self.timeout = timeout
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._requests = 0
+        self._pages = 0
+        self._failed = 0
+        self._in_flight = 0
+        self._latency_ms = 0.0
+        self._cost_usd = 0.0
+
+    @property
+    def configured(self) -> bool:
+        """Only an explicitly configured endpoint is used."""
+        return bool(self.api_url)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(max(self.max_concurrency, 1))
+        return self._slots
+
+    async def read_pages(
+        self,
+        file_path: str,
+        indexes: List[int],
+        session_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Returns ``pages``: index -> {"text", "confidence"} for the pages the
+        model read, plus the requests made and their total latency and cost.
+        """
+        images = await asyncio.to_thread(load_pages, file_path, indexes)
+        order = sorted(images)
+        batches = [
+            order[start : start + self.batch_pages]
+            for start in range(0, len(order), self.batch_pages)
+        ]
+        results = await asyncio.gather(
+            *(
+                self._request({i: images[i] for i in batch}, session_id)
+                for batch in batches
+            )
+        )
+        pages: Dict[int, Dict[str, Any]] = {}
+        for result in results:
+            pages.update(result["pages"])
+        return {
+            "pages": pages,
+            "requests": len(results),
+            "latency_ms": sum(r["latency_ms"] for r in results),
+            "cost_usd": sum(r["cost_usd"] for r in results),
+        }
+
+    async def _request(
+        self, images: Dict[int, bytes], session_id: Optional[str]
+    ) -> Dict[str, Any]:
+        async with self._get_slots():
+            allowed, reason = budget_enforcer.is_allowed(session_id)
+            if not allowed:
+                raise PermissionError(
+                    f"Vision LLM call blocked by cost control: {reason}"
+                )
+
+            mime = f"image/{VISION_IMAGE_FORMAT.lower()}"
+            content: List[Dict[str, Any]] = [
+                {"type": "text", "text": PROMPT.format(indexes=list(images))}
+            ]
+            for data in images.values():
+                content.append(
+                    {
+                        "type": "image_url",
+                        "image_url": {
+                            "url": f"data:{mime};base64,{base64.b64encode(data).decode()}"
+                        },
+                    }
+                )
+            headers = (
+                {"authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            )
+
+            self._in_flight += 1
+            started = time.perf_counter()
+            try:
+                resp = await http_clients.get(self.api_url).post(
+                    self.api_url,
+                    headers=headers,
+                    json={
+                        "model": self.model,
+                        "temperature": 0,
+                        "response_format": {"type": "json_object"},
+                        "messages": [{"role": "user", "content": content}],
+                    },
+                    timeout=self.timeout,
+                )
+                resp.raise_for_status()
+                body = resp.json()
+            except Exception:
+                self._failed += 1
+                raise
+            finally:
+                self._in_flight -= 1
+            latency_ms = (time.perf_counter() - started) * 1000
+
+        usage = body.get("usage") or {}
+        cost = cost_monitor.track_usage(
+            model=body.get("model", self.model),
+            input_tokens=usage.get("prompt_tokens", 0),
+            output_tokens=usage.get("completion_tokens", 0),
+            session_id=session_id,
+        )
+        pages = self._parse(body["choices"][0]["message"]["content"], list(images))
+
+        self._requests += 1
+        self._pages += len(images)
+        self._latency_ms += latency_ms
+        self._cost_usd += cost
+        print(
+            f"[VISION] Fallback read {len(pages)}/{len(images)} page(s) "
+            f"in {latency_ms:.0f} ms for ${cost:.5f}"
+        )
+        return {"pages": pages, "latency_ms": latency_ms, "cost_usd": cost}
+
+    @staticmethod
+    def _parse(content: str, indexes: List[int]) -> Dict[int, Dict[str, Any]]:
+        try:
+            entries = json.loads(content).get("pages") or []
+        except (ValueError, AttributeError):
+            if len(indexes) == 1:
+                # Plain transcription of the only page in the batch
+                return {
+                    indexes[0]: {
+                        "text": content.strip(),
+                        "confidence": VISION_DEFAULT_CONFIDENCE,
+                    }
+                }
+            print(f"[VISION] Unparseable fallback reply for pages {indexes}")
+            return {}
+        pages = {}
+        for entry in entries:
+            if entry.get("index") in indexes and entry.get("text"):
+                pages[entry["index"]] = {
+                    "text": entry["text"],
+                    "confidence": float(
+                        entry.get("confidence", VISION_DEFAULT_CONFIDENCE)
+                    ),
+                }
+        return pages
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, page and failure counters with total latency and cost."""
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "requests": self._requests,
+            "pages": self._pages,
+            "failed": self._failed,
+            "latency_ms": self._latency_ms,
+            "cost_usd": self._cost_usd,
+        }
+
+
+vision_fallback = VisionLLMFallback()
@@ -0,0 +1,80 @@
+import io
+from PIL import Image
+from pypdf import PdfReader
+from typing import Dict, Any, List, Optional
+
+# Pages whose embedded text layer is shorter than this are treated as scans.
+TEXT_LAYER_MIN_CHARS = 20
+
+PAGE_SEPARATOR = "\n\n"
+
+
+def is_pdf(file_path: str) -> bool:
+    """Checks the suffix, then the magic bytes; uploads may land as ``.bin``."""
+    if file_path.lower().endswith(".pdf"):
+        return True
+    try:
+        with open(file_path, "rb") as f:
+            return f.read(5) == b"%PDF-"
+    except OSError:
+        return False
+
+
+def probe_pdf(file_path: str) -> List[Dict[str, Any]]:
+    """
+    Splits a PDF into pages and pulls any embedded text layer.
+
+    Digitally issued documents carry a text layer and never need OCR; scanned
+    pages are flagged with ``needs_ocr`` so only those are sent to Tesseract.
+    Executed inside the OCR pool.
+    """
+    reader = PdfReader(file_path)
+    pages = []
+    for index, page in enumerate(reader.pages):
+        text = page.extract_text() or ""
+        has_text_layer = len(text.strip()) >= TEXT_LAYER_MIN_CHARS
+        pages.append(
+            {
+                "index": index,
+                "text": text if has_text_layer else "",
+                "needs_ocr": not has_text_layer,
+            }
+        )
+    return pages
+
+
+def page_image(file_path: str, index: int) -> Optional[Image.Image]:
+    """The largest embedded image on one PDF page (the scan), if any."""
+    page = PdfReader(file_path).pages[index]
+    images = list(page.images)
+    if not images:
+        return None
+    largest = max(images, key=lambda im: len(im.data))
+    return Image.open(io.BytesIO(largest.data))
+
+
+def merge_pages(pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Concatenates per-page text in page order and records where each page
+    starts in the merged ``raw_text``.
+    """
+    parts: List[str] = []
+    index: List[Dict[str, Any]] = []
+    offset = 0
+    for page in sorted(pages, key=lambda p: p["index"]):
+        if parts:
+            offset += len(PAGE_SEPARATOR)
+        text = page["text"]
+        parts.append(text)
+        index.append(
+            {
+                "page": page["index"] + 1,
+                "offset": offset,
+                "length": len(text),
+                "method": page["method"],
+                "lang": page.get("lang"),
+                "confidence": page["confidence"],
+            }
+        )
+        offset += len(text)
+    return {"raw_text": PAGE_SEPARATOR.join(parts), "pages": index}
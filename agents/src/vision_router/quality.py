@@ -0,0 +1,238 @@
+import os
+import numpy as np
+from PIL import Image
+from typing import Dict, Any, List, Optional
+from vision_router.pages import is_pdf, page_image, probe_pdf
+from vision_router.preprocess import otsu_threshold, page_bbox
+
+# Checks run on a grayscale copy with this long edge, so thresholds do not
+# depend on the upload's resolution. JPEGs are decoded straight to this size.
+QUALITY_LONG_EDGE = 1000
+
+# Variance of the Laplacian over the text rows: below the reject bar text is
+# unreadable, below the warn bar OCR confidence usually suffers.
+BLUR_REJECT_VARIANCE = 60.0
+BLUR_WARN_VARIANCE = 200.0
+# Rows within this many pixels of an ink row count as text rows.
+TEXT_ROW_MARGIN = 2
+
+# Exposure: the gap between the ink level (the darkest INK_TAIL share of the
+# page) and the paper level (its median). A sparse page has little ink, so
+# the tail is kept small.
+MIN_CONTRAST = 60
+MIN_MEAN_BRIGHTNESS = 50
+INK_TAIL = 0.001
+
+# Paper (pixels brighter than the Otsu threshold) must fill this share of
+# the frame.
+MIN_PAGE_COVERAGE = 0.3
+
+# Share of ink in a strip along a frame edge the paper touches that marks the
+# page as cut off on that side.
+EDGE_STRIP = 0.01
+CROP_EDGE_INK = 0.02
+
+QUALITY_GATE_ENABLED = os.getenv("QUALITY_GATE_ENABLED", "true").lower() != "false"
+
+
+def _issue(code: str, message: str, severity: str, remediation: str) -> Dict[str, Any]:
+    return {
+        "code": code,
+        "message": message,
+        "severity": severity,
+        "remediation": remediation,
+    }
+
+
+def _gray(image: Image.Image) -> np.ndarray:
+    scale = min(1.0, QUALITY_LONG_EDGE / max(image.size))
+    size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+    if image.format == "JPEG":
+        # Let libjpeg decode at 1/2, 1/4 or 1/8 scale instead of full size
+        image.draft("L", size)
+    factor = max(image.size) // QUALITY_LONG_EDGE
+    if factor >= 2:
+        # Box-average whole pixel blocks first; much cheaper than resizing
+        # the full-resolution image
+        image = image.reduce(factor)
+    image = image.convert("L")
+    if image.size != size:
+        image = image.resize(size, Image.Resampling.BILINEAR)
+    return np.asarray(image)
+
+
+def laplacian_variance(gray: np.ndarray, rows: Optional[np.ndarray] = None) -> float:
+    """
+    Variance of the 4-neighbour Laplacian; low means few sharp edges. With
+    ``rows`` (a boolean per row of ``gray``) only those rows are measured.
+    """
+    g = gray.astype(np.float32)
+    lap = 4 * g[1:-1, 1:-1] - g[:-2, 1:-1] - g[2:, 1:-1] - g[1:-1, :-2] - g[1:-1, 2:]
+    if rows is not None:
+        lap = lap[rows[1:-1]]
+    return float(lap.var()) if lap.size else 0.0
+
+
+def _text_rows(page: np.ndarray, threshold: int) -> Optional[np.ndarray]:
+    """
+    Rows with ink on them, widened by ``TEXT_ROW_MARGIN``; None when the page
+    has no ink. The blank margins and gaps between lines of a sparse page
+    would otherwise pull the sharpness down.
+    """
+    inked = (page <= threshold).any(axis=1)
+    if not inked.any():
+        return None
+    rows = inked.copy()
+    for shift in range(1, TEXT_ROW_MARGIN + 1):
+        rows[shift:] |= inked[:-shift]
+        rows[:-shift] |= inked[shift:]
+    return rows
+
+
+def _ink_contrast(page: np.ndarray) -> float:
+    """
+    Gap between the paper level (median) and the ink level (the darkest
+    ``INK_TAIL`` of the page), from the 256-bin histogram. Unlike a wide
+    percentile spread this holds up on a page that is almost all paper.
+    """
+    if not page.size:
+        return 0.0
+    cdf = np.cumsum(np.bincount(page.ravel(), minlength=256)) / page.size
+    return float(np.searchsorted(cdf, 0.5) - np.searchsorted(cdf, INK_TAIL))
+
+
+def _cropped_sides(gray: np.ndarray, threshold: int, bbox) -> List[str]:
+    """Frame edges the paper reaches with text still running into them."""
+    left, top, right, bottom = bbox
+    height, width = gray.shape
+    strip_h = max(1, int(height * EDGE_STRIP))
+    strip_w = max(1, int(width * EDGE_STRIP))
+    ink = gray <= threshold
+    strips = {
+        "top": (top == 0, ink[:strip_h, left:right]),
+        "bottom": (bottom == height, ink[height - strip_h :, left:right]),
+        "left": (left == 0, ink[top:bottom, :strip_w]),
+        "right": (right == width, ink[top:bottom, width - strip_w :]),
+    }
+    return [
+        side
+        for side, (touches, strip) in strips.items()
+        if touches and strip.size and strip.mean() >= CROP_EDGE_INK
+    ]
+
+
+def assess_image(image: Image.Image) -> Dict[str, Any]:
+    """
+    Cheap pre-OCR quality check: sharpness, exposure and page coverage.
+    Unusable pages get ERROR issues and ``usable=False``; marginal ones get
+    WARNING issues and still go to OCR. Low contrast alone is a warning;
+    a page that is also too dark is rejected as such.
+    """
+    gray = _gray(image)
+    threshold = otsu_threshold(gray)
+    bbox = page_bbox(gray, threshold)
+    left, top, right, bottom = bbox
+    page = gray[top:bottom, left:right]
+
+    sharpness = laplacian_variance(page, _text_rows(page, threshold))
+    contrast = _ink_contrast(page)
+    brightness = float(page.mean()) if page.size else 0.0
+    coverage = float((gray > threshold).mean()) if gray.size else 0.0
+    cropped = (
+        _cropped_sides(gray, threshold, bbox) if coverage >= MIN_PAGE_COVERAGE else []
+    )
+
+    issues: List[Dict[str, Any]] = []
+    if sharpness < BLUR_REJECT_VARIANCE:
+        issues.append(
+            _issue(
+                "IMAGE_BLURRY",
+                "The document photo is too blurry to read.",
+                "ERROR",
+                "Hold the phone steady, tap to focus on the text and retake the photo.",
+            )
+        )
+    elif sharpness < BLUR_WARN_VARIANCE:
+        issues.append(
+            _issue(
+                "IMAGE_SOFT_FOCUS",
+                "The document photo is slightly out of focus; some text may be misread.",
+                "WARNING",
+                "Retake the photo in good light with the text in sharp focus.",
+            )
+        )
+    if brightness < MIN_MEAN_BRIGHTNESS:
+        issues.append(
+            _issue(
+                "IMAGE_TOO_DARK",
+                "The document photo is too dark to read.",
+                "ERROR",
+                "Retake the photo in daylight or a well-lit room, without shadows.",
+            )
+        )
+    elif contrast < MIN_CONTRAST:
+        issues.append(
+            _issue(
+                "IMAGE_LOW_CONTRAST",
+                "The text is washed out (glare or overexposure).",
+                "WARNING",
+                "Avoid direct flash or glare and retake the photo.",
+            )
+        )
+    if coverage < MIN_PAGE_COVERAGE:
+        issues.append(
+            _issue(
+                "PAGE_TOO_SMALL",
+                "The document fills only a small part of the photo.",
+                "ERROR",
+                "Move closer so the page fills the frame, keeping all four corners visible.",
+            )
+        )
+    if cropped:
+        issues.append(
+            _issue(
+                "PAGE_CROPPED",
+                f"Part of the document appears cut off ({', '.join(cropped)} edge).",
+                "WARNING",
+                "Retake the photo with the whole page and all four corners in the frame.",
+            )
+        )
+
+    return {
+        "usable": not any(i["severity"] == "ERROR" for i in issues),
+        "issues": issues,
+        "metrics": {
+            "sharpness": round(sharpness, 1),
+            "contrast": round(contrast, 1),
+            "brightness": round(brightness, 1),
+            "coverage": round(coverage, 3),
+        },
+    }
+
+
+def assess_file(file_path: str) -> Dict[str, Any]:
+    """
+    Assesses an upload. PDF pages with a text layer are digitally issued and
+    skipped; each scanned page is checked, and any unusable page makes the
+    document unusable.
+    """
+    if not is_pdf(file_path):
+        return assess_image(Image.open(file_path))
+
+    results = []
+    for page in probe_pdf(file_path):
+        if not page["needs_ocr"]:
+            continue
+        image = page_image(file_path, page["index"])
+        if image is not None:
+            results.append({**assess_image(image), "page": page["index"] + 1})
+    issues: List[Dict[str, Any]] = []
+    for result in results:
+        for issue in result["issues"]:
+            if issue not in issues:
+                issues.append(issue)
+    return {
+        "usable": all(r["usable"] for r in results),
+        "issues": issues,
+        "metrics": {"pages": [{"page": r["page"], **r["metrics"]} for r in results]},
+    }
@@ -1,6 +1,36 @@
-import pytesseract
-from PIL import Image
-from typing import Dict, Any
+import asyncio
+import functools
+from typing import Awaitable, Callable, Dict, Any, Optional
+from document_analyzer.classifier import classify_page
+from document_analyzer.features import detect_features
+from vision_router.analysis import (
+    DocumentAnalysis,
+    DocumentClassifier,
+    FeatureDetector,
+    PageAnalysis,
+    analyze_file,
+    analyze_pdf_page,
+)
+from vision_router.engine import get_engine
+from vision_router.executor import OCRExecutor, ocr_executor
+from vision_router.fallback import vision_fallback
+from vision_router.pages import is_pdf, probe_pdf
+from vision_router.script import (
+    COMBINED_LANG,
+    SCRIPT_DETECTION_ENABLED,
+    lang_for_text,
+)
+
+# Bump when the shape or meaning of OCR results changes, so cached analyses
+# from the previous pipeline are not reused.
+OCR_PIPELINE_VERSION = 4
+OCR_LANG = COMBINED_LANG
+# Language setting as it affects OCR output; part of the analysis cache key.
+OCR_LANG_KEY = "auto" if SCRIPT_DETECTION_ENABLED else OCR_LANG
+TEXT_LAYER_CONFIDENCE = 0.99
+
+# Called as each page finishes, with the document's page count
+PageCallback = Callable[[PageAnalysis, int], Awaitable[None]]
 
 
 class VisionRouter:
@@ -9,56 +39,166 @@ class VisionRouter:
     Decides between local Tesseract and advanced Vision models.
     """
 
-    async def process_document(self, file_path: str) -> Dict[str, Any]:
-        """Performs OCR and returns extracted text and metadata."""
+    def __init__(self, executor: Optional[OCRExecutor] = None):
+        self.executor = executor or ocr_executor
+
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def engine_id() -> str:
+        """Identifies the OCR engine build; part of the analysis cache key."""
+        engine = get_engine()
         try:
-            # 1. Local OCR Attempt
-            img = Image.open(file_path)
-            text = pytesseract.image_to_string(img, lang="eng+amh")
+            version = engine.version()
+        except Exception:
+            version = "unknown"
+        return f"{engine.name}-{version}/p{OCR_PIPELINE_VERSION}"
+
+    async def analyze(
+        self,
+        file_path: str,
+        feature_detector: Optional[FeatureDetector] = detect_features,
+        classifier: Optional[DocumentClassifier] = classify_page,
+        on_page: Optional[PageCallback] = None,
+    ) -> DocumentAnalysis:
+        """
+        Reads the document once: one pool job per page that classifies its
+        layout, OCRs it (only the template's field regions when the layout
+        is known) and runs feature detection on the same decoded pixels. PDF
+        pages with a text layer skip OCR; the remaining pages are processed
+        in parallel. ``on_page`` is awaited as each page finishes.
+        """
+        if not is_pdf(file_path):
+            page = await self.executor.run(
+                analyze_file, file_path, None, feature_detector, classifier
+            )
+            if on_page is not None:
+                await on_page(page, 1)
+            return DocumentAnalysis(pages=[page])
+
+        probed = await self.executor.run(probe_pdf, file_path)
 
-            # Simplified confidence heuristic
-            confidence = 0.85 if len(text) > 100 else 0.4
+        async def analyze_page(page: Dict[str, Any]) -> PageAnalysis:
+            if not page["needs_ocr"]:
+                result = PageAnalysis(
+                    index=page["index"],
+                    text=page["text"],
+                    lang=lang_for_text(page["text"]),
+                    method="pdf_text_layer",
+                    confidence=TEXT_LAYER_CONFIDENCE,
+                )
+            else:
+                result = await self.executor.run(
+                    analyze_pdf_page,
+                    file_path,
+                    page["index"],
+                    None,
+                    feature_detector,
+                    classifier,
+                )
+            if on_page is not None:
+                await on_page(result, len(probed))
+            return result
+
+        pages = await asyncio.gather(*(analyze_page(p) for p in probed))
+        return DocumentAnalysis(pages=list(pages))
+
+    async def process_document(
+        self, file_path: str, on_page: Optional[PageCallback] = None
+    ) -> Dict[str, Any]:
+        """Performs OCR and returns extracted text and metadata."""
+        try:
+            # 1. Local OCR Attempt (off the event loop, one job per page)
+            analysis = await self.analyze(file_path, on_page=on_page)
+            merged = analysis.merged()
+            text = merged["raw_text"]
+            confidence = analysis.confidence
 
             # 2. Fallback to Vision LLM if confidence is low
             if confidence < 0.6:
                 print(
                     f"[VISION] Low confidence ({confidence}), falling back to Vision LLM..."
                 )
-                vision_result = await self.process_with_vision_llm(file_path)
+                vision_result = await self.process_with_vision_llm(file_path, analysis)
                 return {
                     **vision_result,
                     "local_text": text,
-                    "needs_escalation": vision_result["confidence"] < 0.7,
+                    "needs_escalation": vision_result.get("needs_escalation")
+                    or vision_result["confidence"] < 0.7,
                 }
 
             return {
                 "raw_text": text,
                 "confidence": confidence,
-                "method": "local_tesseract",
+                "method": analysis.method,
+                "pages": merged["pages"],
+                "page_count": len(analysis.pages),
+                "features": analysis.features,
+                "document_types": analysis.document_types,
+                "fields": analysis.fields,
+                "ocr_langs": analysis.lang_counts(),
+                "ocr_passes": sum(p.passes for p in analysis.pages),
                 "needs_escalation": False,
             }
         except Exception as e:
             print(f"[VISION ERROR] {e}")
             return {"error": str(e), "confidence": 0, "needs_escalation": True}
 
-    async def process_with_vision_llm(self, file_path: str) -> Dict[str, Any]:
+    async def process_with_vision_llm(
+        self, file_path: str, analysis: DocumentAnalysis
+    ) -> Dict[str, Any]:
         """
-        Uses a Vision-capable LLM to extract text from a document image.
-        Note: Currently Groq has limited vision support. This is a placeholder
-        for an OpenAI/Anthropic or local Llama-Vision integration.
+        Re-reads the pages local OCR was unsure of with a vision-capable LLM
+        (batched, concurrency-limited; see vision_router.fallback) and merges
+        them with the pages that were read fine. Without a configured
+        provider, or when the fallback fails, the local result is returned
+        for human review.
         """
-        # In a real setup, we would encode the image to base64
-        # and send it to a model like gpt-4o or llama-3.2-90b-vision-preview (if available on Groq)
-
-        # Mocking the Vision LLM response for now
-        # If the user has a vision-enabled model on Groq, we'd call it here.
-        print(f"[VISION] Extracting from {file_path} using Vision LLM...")
+        low = [
+            p.index
+            for p in analysis.pages
+            if p.method == "local_tesseract" and p.confidence < 0.6
+        ]
+        fallback: Dict[str, Any] = {"requests": 0, "latency_ms": 0.0, "cost_usd": 0.0}
+        pages = analysis.pages
+        failed = False
+        if not vision_fallback.configured:
+            print("[VISION] No vision LLM configured; keeping local OCR result")
+        elif low:
+            try:
+                read = await vision_fallback.read_pages(file_path, low)
+            except Exception as e:
+                print(f"[VISION] Fallback failed ({e}); keeping local OCR result")
+                read = {"pages": {}}
+                failed = True
+                fallback["error"] = str(e)
+            else:
+                fallback = {k: read[k] for k in fallback}
+            pages = [
+                p.model_copy(
+                    update={
+                        **read["pages"][p.index],
+                        "method": "vision_llm",
+                        "words": [],
+                    }
+                )
+                if p.index in read["pages"]
+                else p
+                for p in pages
+            ]
 
+        updated = DocumentAnalysis(pages=pages)
+        merged = updated.merged()
         return {
-            "raw_text": "[EXTRACTED BY VISION LLM] Sample text from document including stamps and signatures.",
-            "confidence": 0.92,
-            "method": "vision_llm",
-            "metadata": {"has_stamp": True, "has_signature": True},
+            "raw_text": merged["raw_text"],
+            "confidence": updated.confidence,
+            "method": "vision_llm" if fallback["requests"] else updated.method,
+            "pages": merged["pages"],
+            "page_count": len(pages),
+            "features": analysis.features,
+            "document_types": analysis.document_types,
+            "fields": analysis.fields,
+            "vision_fallback": fallback,
+            "needs_escalation": failed,
         }
 
 
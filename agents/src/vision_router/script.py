@@ -0,0 +1,147 @@
+import os
+from PIL import Image
+from typing import Dict, Any, Optional
+from vision_router.engine import get_engine
+from vision_router.confidence import (
+    EARLY_EXIT_CONFIDENCE,
+    RETRY_CONFIDENCE,
+    mean_confidence,
+    text_from_words,
+    words_from_data,
+)
+
+# Tesseract language packs for the two scripts on Ethiopian documents.
+LATIN_LANG = "eng"
+ETHIOPIC_LANG = "amh"
+COMBINED_LANG = f"{LATIN_LANG}+{ETHIOPIC_LANG}"
+
+# The probe OCRs a low-res copy of the page (~135 DPI for A4); enough to tell
+# the scripts apart at a fraction of the full-resolution cost.
+SCRIPT_PROBE_LONG_EDGE = 1600
+
+# Below this many letters the probe is not trusted and both packs are used.
+SCRIPT_MIN_LETTERS = 20
+
+# Share of Ge'ez letters below which a page is treated as Latin-only, and
+# above which it is treated as Ethiopic-only; anything between is mixed.
+# The margins absorb the odd misread character.
+ETHIOPIC_LOW_RATIO = 0.03
+ETHIOPIC_HIGH_RATIO = 0.97
+
+SCRIPT_DETECTION_ENABLED = os.getenv("OCR_SCRIPT_DETECTION", "true").lower() != "false"
+
+
+def is_ethiopic(char: str) -> bool:
+    """Ethiopic, Ethiopic Supplement and Ethiopic Extended(-A) blocks."""
+    code = ord(char)
+    return (
+        0x1200 <= code <= 0x139F or 0x2D80 <= code <= 0x2DDF or 0xAB00 <= code <= 0xAB2F
+    )
+
+
+def ethiopic_ratio(text: str) -> Optional[float]:
+    """Share of letters in ``text`` that are Ge'ez; None if too few letters."""
+    letters = [c for c in text if c.isalpha()]
+    if len(letters) < SCRIPT_MIN_LETTERS:
+        return None
+    return sum(1 for c in letters if is_ethiopic(c)) / len(letters)
+
+
+def lang_for_text(text: str) -> str:
+    """Picks the Tesseract language pack(s) matching the script mix of ``text``."""
+    ratio = ethiopic_ratio(text)
+    if ratio is None:
+        return COMBINED_LANG
+    if ratio <= ETHIOPIC_LOW_RATIO:
+        return LATIN_LANG
+    if ratio >= ETHIOPIC_HIGH_RATIO:
+        return ETHIOPIC_LANG
+    return COMBINED_LANG
+
+
+def _probe_image(image: Image.Image) -> Image.Image:
+    long_edge = max(image.size)
+    if long_edge <= SCRIPT_PROBE_LONG_EDGE:
+        return image
+    scale = SCRIPT_PROBE_LONG_EDGE / long_edge
+    return image.resize(
+        (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+        Image.Resampling.BILINEAR,
+    )
+
+
+def _ocr_pass(image: Image.Image, lang: str) -> Dict[str, Any]:
+    """One Tesseract pass with word-level confidences."""
+    data = get_engine().image_to_data(image, lang)
+    words = words_from_data(data)
+    return {
+        "text": text_from_words(words),
+        "lang": lang,
+        "confidence": mean_confidence(words),
+        "words": words,
+    }
+
+
+def _rescale_words(words, image: Image.Image, probe_image: Image.Image):
+    """Maps word boxes read on the probe back onto the full-resolution page."""
+    sx = image.width / probe_image.width
+    sy = image.height / probe_image.height
+    scaled = []
+    for word in words:
+        word = dict(word)
+        for key, factor in (("left", sx), ("width", sx), ("top", sy), ("height", sy)):
+            if key in word:
+                word[key] = round(word[key] * factor)
+        scaled.append(word)
+    return scaled
+
+
+def detect_lang(image: Image.Image) -> str:
+    """
+    Fast script-detection pass: OCRs a low-res copy of the page with both
+    packs and counts Ge'ez codepoints in the result.
+    """
+    return lang_for_text(_ocr_pass(_probe_image(image), COMBINED_LANG)["text"])
+
+
+def ocr_image(image: Image.Image, lang: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Runs Tesseract with ``lang``, or with the pack(s) chosen by script
+    detection when no language is forced.
+
+    Passes stop as soon as one is confident enough: a confident probe is
+    returned directly (its word boxes mapped back to full resolution), and a
+    weak single-language pass is retried with both packs before anyone
+    escalates the page. A page small enough to be probed as it is has
+    already had its both-packs pass, so that pass is reused rather than
+    run again. Returns the text, the language used, the word-level
+    confidence, the words and the number of passes run.
+    """
+    if lang is not None:
+        return {**_ocr_pass(image, lang), "passes": 1}
+    if not SCRIPT_DETECTION_ENABLED:
+        return {**_ocr_pass(image, COMBINED_LANG), "passes": 1}
+
+    probe_image = _probe_image(image)
+    probe = _ocr_pass(probe_image, COMBINED_LANG)
+    full_res = probe_image is image
+    if not full_res:
+        probe["words"] = _rescale_words(probe["words"], image, probe_image)
+    lang = lang_for_text(probe["text"])
+    if probe["confidence"] >= EARLY_EXIT_CONFIDENCE or (
+        full_res and lang == COMBINED_LANG
+    ):
+        return {**probe, "passes": 1}
+
+    best = _ocr_pass(image, lang)
+    passes = 2
+    if full_res:
+        # The probe was the full-resolution both-packs pass
+        if probe["confidence"] > best["confidence"]:
+            best = probe
+    elif best["confidence"] < RETRY_CONFIDENCE and lang != COMBINED_LANG:
+        retry = _ocr_pass(image, COMBINED_LANG)
+        passes += 1
+        if retry["confidence"] > best["confidence"]:
+            best = retry
+    return {**best, "passes": passes}
@@ -0,0 +1,39 @@
+import pytest
+from safety_agent.audit import pii_audit_sink
+from vision_router import engine
+
+
+@pytest.fixture(autouse=True, scope="session")
+def pii_audit_log(tmp_path_factory):
+    """Masking in tests audits to a temporary log, not the working directory."""
+    pii_audit_sink.path = str(tmp_path_factory.mktemp("audit") / "pii_audit.log")
+    yield pii_audit_sink.path
+    pii_audit_sink.flush()
+
+
+@pytest.fixture(autouse=True)
+def pytesseract_engine(monkeypatch):
+    """OCR tests patch pytesseract, so pin the engine even if tesserocr is installed."""
+    monkeypatch.setattr(engine, "_engine", engine.PytesseractEngine())
+
+
+@pytest.fixture
+def tesseract_data():
+    """
+    Builds a fake ``pytesseract.image_to_data`` DICT result: one line per
+    ``\\n``-separated line of ``text``, every word at confidence ``conf``.
+    """
+
+    def build(text: str, conf: float = 92.0):
+        data = {k: [] for k in ("text", "conf", "block_num", "par_num", "line_num")}
+        for line_num, line in enumerate(text.split("\n"), start=1):
+            # Tesseract emits a layout row (conf -1) ahead of each line's words
+            for word in [""] + line.split():
+                data["text"].append(word)
+                data["conf"].append(conf if word else -1)
+                data["block_num"].append(1)
+                data["par_num"].append(1)
+                data["line_num"].append(line_num)
+        return data
+
+    return build
@@ -0,0 +1,45 @@
+"""
+Micro-benchmark: masking a corpus of documents in-process vs. across the
+bulk masking process pool.
+
+Run from agents/:  PYTHONPATH=src python tests/performance/bench_bulk_masking.py
+"""
+
+import os
+import time
+
+from safety_agent.bulk import BulkMasker
+from safety_agent.detectors import pii_detectors
+
+from bench_masking import ocr_text
+
+DOCUMENTS = 400
+DOCUMENT_CHARS = 50_000
+
+
+def main():
+    corpus = [
+        ocr_text(DOCUMENT_CHARS, emails=i % 4 == 0, seed=i) for i in range(DOCUMENTS)
+    ]
+    size_mb = sum(len(t.encode()) for t in corpus) / 1e6
+    print(f"Corpus: {DOCUMENTS} documents, {size_mb:.1f} MB")
+
+    baseline = None
+    for workers in (0, 2, 4, os.cpu_count() or 1):
+        masker = BulkMasker(pii_detectors, max_workers=workers, min_chars=0)
+        if workers:
+            masker.mask_many(corpus[:workers])  # start the pool
+        start = time.perf_counter()
+        masked = masker.mask_many(corpus)
+        elapsed = time.perf_counter() - start
+        masker.shutdown()
+        baseline = baseline or elapsed
+        print(
+            f"  workers={workers:<3} {elapsed:6.2f} s  {size_mb / elapsed:6.1f} MB/s"
+            f"   ({baseline / elapsed:.1f}x)"
+        )
+        assert masked[0] == pii_detectors.engine.mask(corpus[0])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Micro-benchmark: cost of gazetteer name detection per MB of OCR text.
+
+Run from agents/:  PYTHONPATH=src python tests/performance/bench_gazetteer.py
+
+Masks mixed English/Amharic OCR text with the regex detectors alone, then
+with the Policy Registry gazetteers added, and compares the gazetteer
+automaton against the same names written as one regex alternation, for
+gazetteers of growing size. The alternation tries every name at every
+position; the automaton looks each word up once.
+"""
+
+import os
+import re
+import time
+import random
+
+from safety_agent.detectors import DetectorRegistry, pii_detectors
+from safety_agent.engine import PIIDetector
+from safety_agent.gazetteer import Gazetteer, load_gazetteers
+
+RUNS = 3
+SIZE = 2_000_000
+GAZETTEER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "..", "policy-registry", "gazetteers"
+)
+WORDS = (
+    "Trade License renewal Bole sub-city Addis Ababa capital registration "
+    "የንግድ ፈቃድ እድሳት ቦሌ ክፍለ ከተማ አዲስ አበባ ምዝገባ በአዋጁ መሰረት ባለቤት ስም አድራሻ"
+).split()
+SYLLABLES = [chr(c) for c in range(0x1200, 0x1350) if c % 8 < 7]
+
+
+def ocr_text(names, size: int = SIZE, seed: int = 7) -> str:
+    """Synthetic OCR output with a phone number or a name every ~40 words."""
+    rng = random.Random(seed)
+    parts, length = [], 0
+    while length < size:
+        if rng.random() < 0.025:
+            word = rng.choice(names) if rng.random() < 0.5 else "0911223344"
+        else:
+            word = rng.choice(WORDS)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+
+def synthetic_names(count: int, seed: int = 11):
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5)))
+        for _ in range(count)
+    ]
+
+
+def seconds_per_mb(fn, text: str) -> float:
+    fn(text)
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn(text)
+    elapsed = (time.perf_counter() - start) / RUNS
+    return elapsed / (len(text.encode()) / 1e6)
+
+
+def registry_with(extra):
+    registry = DetectorRegistry()
+    for detector in pii_detectors.detectors:
+        if isinstance(detector, PIIDetector):
+            registry.add(detector)
+    for detector in extra:
+        registry.add(detector)
+    return registry
+
+
+def main():
+    gazetteers = load_gazetteers(GAZETTEER_PATH)
+    names = [e for g in gazetteers for e in g.phrases]
+    text = ocr_text([" ".join(p) for p in names])
+    print(f"Text: {len(text):,} chars ({len(text.encode()) / 1e6:.1f} MB), ms/MB")
+
+    regex_only = registry_with([]).engine
+    with_gazetteers = registry_with(gazetteers).engine
+    base = seconds_per_mb(regex_only.mask, text) * 1000
+    full = seconds_per_mb(with_gazetteers.mask, text) * 1000
+    print(f"  regex detectors only      {base:8.1f}")
+    print(
+        f"  + Policy Registry ({sum(g.size for g in gazetteers)} entries) "
+        f"{full:8.1f}   (gazetteer cost {full - base:.1f} ms/MB)"
+    )
+
+    print("\nGazetteer size vs. name alternation (names only), ms/MB")
+    for count in (100, 1_000, 10_000):
+        entries = synthetic_names(count)
+        text = ocr_text(entries, size=SIZE // 4)
+        gazetteer = Gazetteer("NAME", entries)
+        alternation = re.compile(
+            r"(?<![\u1200-\u135F])(?:"
+            + "|".join(sorted(map(re.escape, entries), key=len, reverse=True))
+            + r")(?![\u1200-\u135F])"
+        )
+        automaton = seconds_per_mb(lambda t, g=gazetteer: list(g.finditer(t)), text)
+        regex = seconds_per_mb(lambda t, r=alternation: r.findall(t), text)
+        print(
+            f"  {count:>6} names   automaton {automaton * 1000:8.1f}   "
+            f"alternation {regex * 1000:9.1f}   ({regex / automaton:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
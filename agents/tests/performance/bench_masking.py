@@ -0,0 +1,107 @@
+"""
+Micro-benchmark: PII masking throughput on large OCR texts.
+
+Run from agents/:  PYTHONPATH=src python tests/performance/bench_masking.py
+
+Compares the previous approach (one ``re.sub`` per pattern, each rescanning
+the whole text) with the single-pass MaskingEngine of the shared detector registry,
+for masking alone and for masking plus typed spans (which the old approach
+could only get with a second scan per pattern). Scanned forms rarely carry
+e-mail addresses, so texts are generated with and without them.
+"""
+
+import random
+import re
+import time
+
+from safety_agent.detectors import pii_detectors
+from safety_agent.engine import PIIDetector
+
+RUNS = 5
+WORDS = (
+    "Trade License renewal Bole sub-city Addis Ababa capital registration "
+    "የንግድ ፈቃድ እድሳት ቦሌ ክፍለ ከተማ አዲስ አበባ ምዝገባ"
+).split()
+
+
+def ocr_text(size: int, emails: bool = True, seed: int = 7) -> str:
+    """Synthetic OCR output of ~``size`` characters with PII every ~40 words."""
+    rng = random.Random(seed)
+    pii = [
+        lambda: f"0{rng.randint(910000000, 999999999)}",
+        lambda: str(rng.randint(10**9, 10**10 - 1)),
+        lambda: f"EP{rng.randint(10**6, 10**7 - 1)}X",
+        lambda: "አቶ ከበደ",
+    ]
+    if emails:
+        pii.append(lambda: f"user{rng.randint(1, 999)}@example.com")
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(pii)() if rng.random() < 0.025 else rng.choice(WORDS)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)
+
+
+def sequential(patterns, placeholder, text: str) -> str:
+    for label, pattern in patterns.items():
+        text = re.sub(pattern, placeholder.format(label=label), text)
+    return text
+
+
+def sequential_with_spans(patterns, placeholder, text: str):
+    spans = [
+        (label, m.start(), m.end())
+        for label, pattern in patterns.items()
+        for m in re.finditer(pattern, text)
+    ]
+    return sequential(patterns, placeholder, text), spans
+
+
+def mb_per_second(fn, text: str) -> float:
+    fn(text)
+    start = time.perf_counter()
+    for _ in range(RUNS):
+        fn(text)
+    elapsed = (time.perf_counter() - start) / RUNS
+    return len(text.encode()) / elapsed / 1e6
+
+
+def main():
+    patterns = {
+        d.label: d.pattern
+        for d in pii_detectors.detectors
+        if isinstance(d, PIIDetector)
+    }
+    cases = [
+        ("detectors", patterns, pii_detectors.placeholder, pii_detectors.engine),
+    ]
+    for emails in (False, True):
+        for size in (100_000, 1_000_000, 5_000_000):
+            text = ocr_text(size, emails=emails)
+            kind = "with e-mails" if emails else "no e-mails"
+            print(f"\nText: {len(text):,} chars, {kind} ({RUNS} runs), MB/s")
+            for name, patterns, placeholder, engine in cases:
+                before = lambda t, p=patterns, ph=placeholder: sequential(p, ph, t)  # noqa: E731
+                assert before(text) == engine.mask(text), f"{name}: outputs differ"
+                rows = [
+                    ("mask", before, engine.mask),
+                    (
+                        "mask+spans",
+                        lambda t, p=patterns, ph=placeholder: sequential_with_spans(
+                            p, ph, t
+                        ),
+                        engine.redact,
+                    ),
+                ]
+                for label, old_fn, new_fn in rows:
+                    old = mb_per_second(old_fn, text)
+                    new = mb_per_second(new_fn, text)
+                    print(
+                        f"  {name:<14} {label:<11} per-pattern {old:6.1f}   "
+                        f"single pass {new:6.1f}   ({new / old:.2f}x)"
+                    )
+
+
+if __name__ == "__main__":
+    main()
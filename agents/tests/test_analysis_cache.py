@@ -0,0 +1,134 @@
+import hashlib
+import os
+import pytest
+from unittest.mock import patch, AsyncMock
+from orchestrator.cache import AnalysisCache, file_sha256
+from orchestrator import graph
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return AnalysisCache(cache_dir=str(tmp_path / "cache"), max_bytes=10_000)
+
+
+def test_cache_roundtrip_and_counters(cache):
+    assert cache.get("k1", "vision_router") is None
+    cache.put("k1", "vision_router", {"raw_text": "TIN certificate"})
+    assert cache.get("k1", "vision_router") == {"raw_text": "TIN certificate"}
+
+    stats = cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+
+
+def test_cache_key_covers_pipeline_inputs():
+    base = AnalysisCache.make_key("abc", "tesseract-5.3.0", "eng+amh", "1.0.0")
+    assert base == AnalysisCache.make_key("abc", "tesseract-5.3.0", "eng+amh", "1.0.0")
+    assert base != AnalysisCache.make_key("abc", "tesseract-5.4.0", "eng+amh", "1.0.0")
+    assert base != AnalysisCache.make_key("abc", "tesseract-5.3.0", "eng", "1.0.0")
+    assert base != AnalysisCache.make_key("abc", "tesseract-5.3.0", "eng+amh", "1.1.0")
+
+
+def test_cache_evicts_least_recently_used(cache):
+    payload = {"raw_text": "x" * 4000}
+    cache.put("old", "vision_router", payload)
+    cache.put("recent", "vision_router", payload)
+    # Make "old" the least recently used regardless of filesystem timestamps
+    os.utime(cache._path("old", "vision_router"), (1, 1))
+
+    cache.put("new", "vision_router", payload)
+
+    assert cache.get("old", "vision_router") is None
+    assert cache.get("recent", "vision_router") == payload
+    assert cache.get("new", "vision_router") == payload
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["size_bytes"] <= cache.max_bytes
+
+
+def test_failed_write_is_logged(cache, caplog):
+    os.makedirs(cache.cache_dir)
+    with patch("os.replace", side_effect=OSError("disk full")):
+        cache.put("k1", "vision_router", {"raw_text": "x"})
+    assert "disk full" in caplog.text
+    assert cache.get("k1", "vision_router") is None
+
+
+def test_file_sha256(tmp_path):
+    path = tmp_path / "doc.bin"
+    path.write_bytes(b"lease agreement")
+    assert file_sha256(str(path)) == hashlib.sha256(b"lease agreement").hexdigest()
+
+
+@pytest.mark.asyncio
+async def test_vision_router_node_short_circuits_on_hit(cache):
+    state = {
+        "file_path": "/tmp/doc.jpg",
+        "document_sha256": "deadbeef",
+        "extracted_data": {"documents": ["TIN Certificate"]},
+    }
+    ocr_result = {"raw_text": "TIN 0011223344", "confidence": 0.9}
+
+    with (
+        patch.object(graph, "analysis_cache", cache),
+        patch.object(
+            graph.vision_router,
+            "process_document",
+            AsyncMock(return_value=ocr_result),
+        ) as mock_ocr,
+        patch.object(graph.audit_logger, "log_event", AsyncMock()),
+    ):
+        first = await graph.vision_router_node(state)
+        second = await graph.vision_router_node(state)
+
+    mock_ocr.assert_called_once()
+    assert first["extracted_data"]["raw_text"] == "TIN 0011223344"
+    # A hit serves the masked copy, span index included
+    assert second["extracted_data"]["raw_text"] == "TIN <TIN_REDACTED>"
+    assert second["extracted_data"]["pii"]["counts"] == {"TIN": 1}
+    assert second["extracted_data"]["documents"] == ["TIN Certificate"]
+    assert second["confidence"] == first["confidence"]
+    assert cache.stats()["hits"] == 1
+
+    path = next(p for p in os.listdir(cache.cache_dir) if "vision_router" in p)
+    with open(os.path.join(cache.cache_dir, path)) as f:
+        assert "0011223344" not in f.read()
+    assert os.stat(cache.cache_dir).st_mode & 0o777 == 0o700
+    assert os.stat(os.path.join(cache.cache_dir, path)).st_mode & 0o777 == 0o600
+
+
+def test_safety_node_reuses_masked_ocr_fields_only(cache):
+    def state(documents, quality):
+        return {
+            "file_path": "/tmp/doc.jpg",
+            "document_sha256": "deadbeef",
+            "extracted_data": {
+                "raw_text": "TIN 1234567890",
+                "pages": [{"index": 0, "text": "TIN 1234567890"}],
+                "documents": documents,
+                "quality": {"usable": quality},
+            },
+        }
+
+    first_state = state(["TIN Certificate"], True)
+    engine = graph.safety_agent.engine
+    with patch.object(graph, "analysis_cache", cache):
+        first = graph.safety_agent_node(first_state)
+        with patch.object(engine, "redact", wraps=engine.redact) as redact:
+            second = graph.safety_agent_node(state(["Lease Agreement"], False))
+
+    # Masked on a copy; the caller's nested data is untouched
+    assert first_state["extracted_data"]["pages"][0]["text"] == "TIN 1234567890"
+    assert first["extracted_data"]["raw_text"] == "TIN <TIN_REDACTED>"
+
+    # OCR text comes masked from the cache; the rest from this request
+    scanned = [c.args[0] for c in redact.call_args_list]
+    assert "TIN 1234567890" not in scanned
+    data = second["extracted_data"]
+    assert data["pages"][0]["text"] == "TIN <TIN_REDACTED>"
+    assert data["documents"] == ["Lease Agreement"]
+    assert data["quality"] == {"usable": False}
+    assert data["pii"]["counts"] == {"TIN": 2}
+    assert set(cache.get(graph._cache_key(first_state), "safety_agent")) == {
+        "raw_text",
+        "pages",
+    }
@@ -1,23 +1,75 @@
 import pytest
 import os
+import json
+import time
 from common.safety import SafetyAgent
 from regulation_expert.summarization import RAGSummarizer
 from common.citation import CitationAuditor
 from unittest.mock import AsyncMock, patch
 from langchain_core.outputs import ChatResult, ChatGeneration
 from langchain_core.messages import AIMessage
+from safety_agent.audit import PIIAuditSink
 
 
-def test_safety_audit_logging():
-    agent = SafetyAgent()
-    if os.path.exists("pii_audit.log"):
-        os.remove("pii_audit.log")
+def test_safety_audit_logging(tmp_path):
+    path = tmp_path / "pii_audit.log"
+    agent = SafetyAgent(audit_sink=PIIAuditSink(str(path)))
 
     agent.audit_log("Secret TIN 123", "Secret TIN <REDACTED>")
-    assert os.path.exists("pii_audit.log")
-    with open("pii_audit.log", "r") as f:
-        content = f.read()
-        assert "<REDACTED>" in content
+    agent.audit_sink.flush()
+    assert path.exists()
+    with open(path, "r") as f:
+        event = json.loads(f.read())
+        assert event["redactions"] == {"<REDACTED>": 1}
+        assert event["timestamp"].endswith("+00:00")
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_audit_sink_batches_compact_events(tmp_path):
+    path = tmp_path / "pii_audit.log"
+    sink = PIIAuditSink(str(path), batch_events=3, flush_seconds=60)
+    masked = "Owner <NAME_REDACTED>, TIN <TIN_REDACTED> / <TIN_REDACTED>"
+    sink.record(masked)
+    sink.record("clean")
+    assert not path.exists()
+
+    sink.record(masked)
+    # The third event fills the batch and wakes the flusher
+    assert wait_for(lambda: sink.stats()["written"] == 3)
+    lines = [json.loads(line) for line in path.read_text().splitlines()]
+    assert lines[0]["redactions"] == {"<NAME_REDACTED>": 1, "<TIN_REDACTED>": 2}
+    assert lines[0]["chars"] == len(masked)
+    assert "Owner" not in path.read_text()
+    assert sink.stats()["labels"] == {"NAME": 2, "TIN": 4}
+    assert sink.stats()["events"] == 3
+    sink.close()
+
+
+def test_audit_sink_flushes_on_time_and_rotates(tmp_path):
+    path = tmp_path / "pii_audit.log"
+    sink = PIIAuditSink(
+        str(path), batch_events=1000, flush_seconds=0.05, max_bytes=400, backups=2
+    )
+    for _ in range(3):
+        sink.record("TIN <TIN_REDACTED>")
+    assert wait_for(lambda: sink.stats()["written"] == 3)
+
+    for _ in range(10):
+        for _ in range(3):
+            sink.record("TIN <TIN_REDACTED>")
+        sink.flush()
+    assert sink.stats()["rotations"] > 0
+    assert path.exists() and (tmp_path / "pii_audit.log.1").exists()
+    assert (tmp_path / "pii_audit.log.2").exists()
+    assert not (tmp_path / "pii_audit.log.3").exists()
+    assert os.path.getsize(path) <= 400
+    sink.close()
 
 
 @pytest.mark.asyncio
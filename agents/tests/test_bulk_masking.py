@@ -0,0 +1,87 @@
+import random
+from safety_agent.bulk import BulkMasker
+from safety_agent.detectors import DetectorRegistry, pii_detectors
+from safety_agent.gazetteer import Gazetteer
+from safety_agent.masking import SafetyAgent, safety_agent
+
+SAMPLE = (
+    "Owner አቶ ከበደ, TIN 1234567890, phone 0911223344 or +251922334455, "
+    "mail abebe.k@example.com, passport A1234567 / EP1234567X.\n"
+)
+
+
+def chunked(text, sizes):
+    chunks, start = [], 0
+    for size in sizes:
+        chunks.append(text[start : start + size])
+        start += size
+    chunks.append(text[start:])
+    return chunks
+
+
+def test_mask_many_in_process_keeps_order():
+    texts = [SAMPLE, "clean", "Call 0911223344"]
+    assert safety_agent.mask_many(iter(texts)) == [safety_agent.mask(t) for t in texts]
+
+
+def test_mask_many_fans_out_with_the_parents_detectors():
+    registry = DetectorRegistry()
+    registry.register("CASE", r"\bAA/\d{4}/\d{2}\b", ("AA/",))
+    for detector in pii_detectors.detectors:
+        registry.add(detector)
+    masker = BulkMasker(registry, max_workers=2, min_chars=0, batch_chars=200)
+    texts = [f"Case AA/{1000 + i}/16 {SAMPLE}" for i in range(40)]
+    try:
+        masked = masker.mask_many(texts)
+        assert masker._pool is not None
+    finally:
+        masker.shutdown()
+
+    agent = SafetyAgent(registry)
+    assert masked == [agent.mask(t) for t in texts]
+    assert masked[7].startswith("Case <CASE_REDACTED> Owner <NAME_REDACTED>")
+
+
+def test_mask_iter_matches_whole_text_across_chunk_boundaries():
+    text = SAMPLE * 30
+    expected = safety_agent.mask(text)
+    masker = BulkMasker(pii_detectors)
+    # Every boundary position inside the sample, and random chunkings
+    for offset in range(len(SAMPLE)):
+        chunks = chunked(text, [offset] + [len(SAMPLE)] * 29)
+        assert "".join(masker.mask_iter(chunks, hold=64)) == expected
+    rng = random.Random(3)
+    for _ in range(20):
+        sizes = [rng.randint(1, 300) for _ in range(40)]
+        assert "".join(masker.mask_iter(chunked(text, sizes), hold=64)) == expected
+
+
+def test_mask_iter_streams_without_holding_the_text():
+    chunks = (SAMPLE for _ in range(1000))
+    stream = safety_agent.mask_iter(chunks)
+    first = next(stream)
+    assert "<PHONE_REDACTED>" in first
+    assert len(first) < 2 * len(SAMPLE)
+
+
+def test_mask_iter_keeps_multi_word_names_together():
+    registry = DetectorRegistry()
+    registry.add(Gazetteer("ADDRESS", ["ጉርድ ሾላ"]))
+    text = "ከ ጉርድ ሾላ ወደ ጉርድ ሾላ " * 20
+    expected = registry.engine.mask(text)
+    masker = BulkMasker(registry)
+    for size in range(1, 12):
+        chunks = chunked(text, [size] * (len(text) // size))
+        assert "".join(masker.mask_iter(chunks, hold=8)) == expected
+
+
+def test_mask_iter_never_cuts_inside_a_word():
+    # No whitespace before the boundary: a cut there would split the phone
+    # number's run of digits and hide it from both scans
+    text = "ref:" + "x" * 40 + "/0911223344/" + "y" * 40 + " TIN 1234567890"
+    expected = safety_agent.mask(text)
+    assert "<PHONE_REDACTED>" in expected
+    masker = BulkMasker(pii_detectors)
+    for size in range(1, 40):
+        chunks = chunked(text, [size] * (len(text) // size))
+        assert "".join(masker.mask_iter(chunks, hold=8)) == expected
@@ -0,0 +1,154 @@
+import dataclasses
+import pytest
+from unittest.mock import patch
+from temporalio.testing import ActivityEnvironment
+from orchestrator import graph
+from orchestrator.cache import AnalysisCache
+from orchestrator.checkpoint import NodeCheckpoint, checkpointed, current_checkpoint
+
+
+@pytest.fixture
+def store(tmp_path):
+    return AnalysisCache(cache_dir=str(tmp_path / "cache"))
+
+
+@pytest.mark.asyncio
+async def test_checkpointed_node_records_and_heartbeats(store):
+    beats = []
+    checkpoint = NodeCheckpoint(heartbeat=beats.append, ref="run-1", store=store)
+
+    async def node(state):
+        return {
+            "status": "PROCESSING",
+            "extracted_data": {"raw_text": "TIN 1234567890"},
+        }
+
+    token = current_checkpoint.set(checkpoint)
+    try:
+        result = await checkpointed("vision_router", node)({})
+    finally:
+        current_checkpoint.reset(token)
+
+    assert result["extracted_data"]["raw_text"] == "TIN 1234567890"
+    assert checkpoint.get("vision_router") == result
+    # Heartbeats name the finished nodes; their outputs stay in the cache, masked
+    assert beats[-1] == {
+        "completed": ["vision_router"],
+        "ref": "run-1",
+        "last_node": "vision_router",
+    }
+    stored = store.get("run-1", "checkpoint-vision_router")
+    assert stored["extracted_data"]["raw_text"] == "TIN <TIN_REDACTED>"
+    assert stored["status"] == "PROCESSING"
+
+
+def test_checkpoint_reloads_outputs_up_to_the_first_missing(store):
+    store.put("run-1", "checkpoint-quality_gate", {})
+    store.put("run-1", "checkpoint-safety_agent", {"pii_masked": True})
+
+    checkpoint = NodeCheckpoint.load(
+        "run-1", ["quality_gate", "vision_router", "safety_agent"], store=store
+    )
+
+    assert checkpoint.resumed == ["quality_gate"]
+    assert checkpoint.get("safety_agent") is None
+    assert checkpoint.lost == ["vision_router", "safety_agent"]
+
+
+def test_resume_on_another_pod_is_reported(tmp_path, capsys):
+    # The previous attempt's outputs stayed on the other pod's disk
+    other_pod = AnalysisCache(cache_dir=str(tmp_path / "other"))
+    before = NodeCheckpoint.lost_nodes
+
+    checkpoint = NodeCheckpoint.load(
+        "run-1", ["quality_gate", "vision_router"], store=other_pod
+    )
+
+    assert checkpoint.resumed == []
+    assert NodeCheckpoint.lost_nodes == before + 2
+    assert "CHECKPOINT_DIR" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+async def test_checkpointed_node_runs_sync_nodes_without_checkpoint():
+    def node(state):
+        return {"pii_masked": True}
+
+    assert await checkpointed("safety_agent", node)({}) == {"pii_masked": True}
+
+
+@pytest.mark.asyncio
+async def test_orchestrator_resumes_after_completed_nodes():
+    calls = []
+
+    async def vision(state):
+        calls.append("vision_router")
+        return {"status": "PROCESSING"}
+
+    def safety(state):
+        calls.append("safety_agent")
+        return {"pii_masked": True}
+
+    async def compliance(state):
+        calls.append("compliance_evaluator")
+        return {"status": "PASS", "compliance_report": {"status": "PASS"}}
+
+    async def quality(state):
+        calls.append("quality_gate")
+        return {}
+
+    with (
+        patch.object(graph, "quality_gate_node", quality),
+        patch.object(graph, "vision_router_node", vision),
+        patch.object(graph, "safety_agent_node", safety),
+        patch.object(graph, "compliance_evaluator_node", compliance),
+    ):
+        orchestrator = graph.create_orchestrator()
+
+    # A previous attempt finished OCR and masking before failing
+    checkpoint = NodeCheckpoint(
+        completed={
+            "quality_gate": {},
+            "vision_router": {
+                "status": "PROCESSING",
+                "extracted_data": {"raw_text": "cached"},
+            },
+            "safety_agent": {"pii_masked": True},
+        }
+    )
+    token = current_checkpoint.set(checkpoint)
+    try:
+        final_state = await orchestrator.ainvoke(
+            {"status": "PROCESSING", "extracted_data": {}, "confidence": {}}
+        )
+    finally:
+        current_checkpoint.reset(token)
+
+    assert calls == ["compliance_evaluator"]
+    assert final_state["extracted_data"] == {"raw_text": "cached"}
+    assert final_state["compliance_report"] == {"status": "PASS"}
+    assert set(checkpoint.completed) == {
+        "quality_gate",
+        "vision_router",
+        "safety_agent",
+        "compliance_evaluator",
+    }
+
+
+@pytest.mark.asyncio
+async def test_retried_activity_resumes_from_heartbeat_names(store):
+    store.put("run-1", "checkpoint-quality_gate", {})
+    env = ActivityEnvironment()
+    env.info = dataclasses.replace(
+        env.info,
+        heartbeat_details=[{"completed": ["quality_gate"], "ref": "run-1"}],
+    )
+
+    async def restore():
+        return NodeCheckpoint.from_activity()
+
+    with patch("orchestrator.checkpoint.checkpoint_store", store):
+        checkpoint = await env.run(restore)
+
+    assert checkpoint.ref == "run-1"
+    assert checkpoint.resumed == ["quality_gate"]
@@ -0,0 +1,150 @@
+import yaml
+import pytest
+from unittest.mock import patch
+from PIL import Image, ImageDraw, ImageFont
+from document_analyzer.classifier import (
+    MAX_FINGERPRINT_DISTANCE,
+    classify_page,
+    fingerprint_bits,
+    fingerprint_hex,
+    layout_fingerprint,
+)
+from document_analyzer.templates import TemplateRegistry
+from vision_router.analysis import DocumentAnalysis, PageAnalysis, analyze_image
+
+
+def _license(owner="Abebe Kebede", number="AA/BL/14/0012345"):
+    """Trade-license-like layout: banner, two-column form, footer table."""
+    page = Image.new("L", (1240, 1754), 255)
+    draw = ImageDraw.Draw(page)
+    draw.rectangle((80, 60, 1160, 220), fill=30)
+    font = ImageFont.load_default(24)
+    draw.text((700, 260), f"License No: {number}", font=font, fill=0)
+    for i, y in enumerate(range(420, 1100, 60)):
+        draw.text((100, y), f"Owner Name: {owner} {i}", font=font, fill=0)
+    draw.rectangle((100, 1350, 1140, 1650), outline=0, width=6)
+    for y in range(1400, 1650, 50):
+        draw.line((100, y, 1140, y), fill=0, width=4)
+    return page
+
+
+def _tin_certificate():
+    """Different layout: centred title, photo box on the left, text at the bottom."""
+    page = Image.new("L", (1240, 1754), 255)
+    draw = ImageDraw.Draw(page)
+    draw.text((350, 100), "TIN CERTIFICATE", font=ImageFont.load_default(60), fill=0)
+    draw.rectangle((100, 400, 500, 900), fill=40)
+    font = ImageFont.load_default(24)
+    for y in range(1100, 1600, 45):
+        draw.text((600, y), "Taxpayer Identification 0012345678", font=font, fill=0)
+    return page
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "templates").mkdir()
+    template = {
+        "id": "trade-license",
+        "document_type": "Original Trade License",
+        "fingerprints": [fingerprint_hex(layout_fingerprint(_license()))],
+        "fields": {
+            "document_number": {
+                "region": [0.5, 0.12, 1.0, 0.2],
+                "lang": "eng",
+                "pattern": r"(?P<value>[A-Z]{2}/[A-Z]{2}/\d{1,2}/\d{4,8})",
+            }
+        },
+    }
+    (tmp_path / "templates" / "trade-license.yaml").write_text(yaml.dump(template))
+    return TemplateRegistry(str(tmp_path))
+
+
+def test_fingerprint_roundtrips_through_hex():
+    bits = layout_fingerprint(_license())
+    assert bits.shape == (16, 16)
+    assert (fingerprint_bits(fingerprint_hex(bits)) == bits.ravel()).all()
+
+
+def test_same_form_with_other_contents_matches(registry):
+    match = classify_page(_license("Tigist Alemu", "AA/YK/03/0998877"), registry)
+    assert match["template_id"] == "trade-license"
+    assert match["document_type"] == "Original Trade License"
+    assert match["distance"] <= MAX_FINGERPRINT_DISTANCE
+    assert callable(match["field_extractor"])
+
+
+def test_other_layouts_and_blank_pages_do_not_match(registry):
+    assert classify_page(_tin_certificate(), registry) is None
+    assert classify_page(Image.new("L", (1240, 1754), 255), registry) is None
+
+
+def test_empty_registry_classifies_nothing(tmp_path):
+    assert classify_page(_license(), TemplateRegistry(str(tmp_path))) is None
+
+
+def test_matched_page_takes_template_fast_path(registry, tesseract_data):
+    page = _license()
+    crops = []
+
+    def ocr(image, **kwargs):
+        crops.append(image.size)
+        return tesseract_data("License No: AA/BL/14/0012345")
+
+    with (
+        patch("vision_router.analysis.PREPROCESS_ENABLED", False),
+        patch("vision_router.engine.pytesseract.image_to_data", side_effect=ocr),
+    ):
+        result = analyze_image(
+            page, classifier=lambda image: classify_page(image, registry)
+        )
+
+    assert result.document_type == "Original Trade License"
+    assert result.template_id == "trade-license"
+    assert result.fields["document_number"]["value"] == "AA/BL/14/0012345"
+    # Only the document-number region was OCRed
+    assert set(crops) == {(620, 140)}
+
+
+def test_layout_match_alone_is_not_a_submitted_document():
+    def page(index, number):
+        fields = {"document_number": {"value": number, "confidence": 0.9}}
+        return PageAnalysis(
+            index=index,
+            template_id="trade-license",
+            document_type="Original Trade License",
+            fields=fields,
+        )
+
+    # Looks like a trade license, but no license number in its place
+    assert DocumentAnalysis(pages=[page(0, None)]).document_types == []
+    assert DocumentAnalysis(pages=[page(0, "AA/BL/14/0012345")]).document_types == [
+        "Original Trade License"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_classified_types_join_declared_documents():
+    from orchestrator import graph
+
+    state = {
+        "file_path": "/tmp/doc.pdf",
+        "document_sha256": "cafe",
+        "extracted_data": {"documents": ["TIN Certificate"]},
+    }
+    ocr_result = {
+        "raw_text": "...",
+        "confidence": 0.9,
+        "document_types": ["Original Trade License", "TIN Certificate"],
+    }
+    with (
+        patch.object(graph.analysis_cache, "get", return_value=None),
+        patch.object(graph.analysis_cache, "put"),
+        patch.object(graph.vision_router, "process_document", return_value=ocr_result),
+        patch.object(graph.audit_logger, "log_event"),
+    ):
+        result = await graph.vision_router_node(state)
+
+    assert result["extracted_data"]["documents"] == [
+        "TIN Certificate",
+        "Original Trade License",
+    ]
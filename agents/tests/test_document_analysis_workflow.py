@@ -0,0 +1,236 @@
+import base64
+import hashlib
+import os
+import time
+import pytest
+import httpx
+from unittest.mock import patch, AsyncMock
+from PIL import Image, ImageFilter
+from temporalio.testing import ActivityEnvironment
+from orchestrator.cache import AnalysisCache
+from orchestrator.document_analysis_workflow import (
+    download_document,
+    evaluate_document,
+    ocr_document,
+    spool_dir,
+    stage_max_concurrency,
+    stage_task_queue,
+    sweep_spool,
+    SPOOL_PREFIX,
+)
+
+
+DOCUMENT_BYTES = b"%PDF-1.7 fake scan " * 4096
+
+
+def _client(handler):
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_download_document_streams_octet_stream():
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert "application/octet-stream" in request.headers["accept"]
+        assert request.headers["x-internal-token"] == "token"
+        return httpx.Response(
+            200,
+            headers={
+                "content-type": "application/octet-stream",
+                "x-document-mime-type": "application/pdf",
+            },
+            content=DOCUMENT_BYTES,
+        )
+
+    async with _client(handler) as client:
+        result = await download_document(
+            client, "http://backend", "doc-1", {"x-internal-token": "token"}
+        )
+
+    try:
+        assert result["path"].endswith(".pdf")
+        assert result["mime_type"] == "application/pdf"
+        assert result["size"] == len(DOCUMENT_BYTES)
+        assert result["sha256"] == hashlib.sha256(DOCUMENT_BYTES).hexdigest()
+        with open(result["path"], "rb") as f:
+            assert f.read() == DOCUMENT_BYTES
+    finally:
+        os.unlink(result["path"])
+
+
+@pytest.mark.asyncio
+async def test_download_document_falls_back_to_json():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(
+            200,
+            json={
+                "document_id": "doc-1",
+                "mime_type": "image/png",
+                "bytes_base64": base64.b64encode(DOCUMENT_BYTES).decode(),
+            },
+        )
+
+    async with _client(handler) as client:
+        result = await download_document(client, "http://backend", "doc-1", {})
+
+    try:
+        assert result["path"].endswith(".png")
+        assert result["sha256"] == hashlib.sha256(DOCUMENT_BYTES).hexdigest()
+        with open(result["path"], "rb") as f:
+            assert f.read() == DOCUMENT_BYTES
+    finally:
+        os.unlink(result["path"])
+
+
+@pytest.mark.asyncio
+async def test_download_document_rejects_empty_json():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"mime_type": "image/png"})
+
+    async with _client(handler) as client:
+        with pytest.raises(RuntimeError):
+            await download_document(client, "http://backend", "doc-1", {})
+
+
+def test_stage_task_queue_defaults_and_overrides(monkeypatch):
+    monkeypatch.setenv("TEMPORAL_TASK_QUEUE", "govassist-tasks")
+    monkeypatch.setenv("TEMPORAL_OCR_TASK_QUEUE", "govassist-ocr")
+    monkeypatch.setenv("TEMPORAL_OCR_MAX_CONCURRENT_ACTIVITIES", "4")
+    monkeypatch.delenv("TEMPORAL_FETCH_TASK_QUEUE", raising=False)
+    monkeypatch.delenv("TEMPORAL_FETCH_MAX_CONCURRENT_ACTIVITIES", raising=False)
+
+    assert stage_task_queue("ocr") == "govassist-ocr"
+    assert stage_task_queue("fetch") == "govassist-tasks"
+    assert stage_max_concurrency("ocr") == 4
+    assert stage_max_concurrency("fetch") is None
+
+
+def test_spool_must_be_shared_across_queues(monkeypatch):
+    monkeypatch.delenv("DOCUMENT_SPOOL_DIR", raising=False)
+    monkeypatch.delenv("TEMPORAL_FETCH_TASK_QUEUE", raising=False)
+    monkeypatch.delenv("TEMPORAL_OCR_TASK_QUEUE", raising=False)
+    assert spool_dir() is None
+
+    monkeypatch.setenv("TEMPORAL_OCR_TASK_QUEUE", "govassist-ocr")
+    with pytest.raises(RuntimeError):
+        spool_dir()
+    monkeypatch.setenv("DOCUMENT_SPOOL_DIR", "/mnt/spool")
+    assert spool_dir() == "/mnt/spool"
+
+
+def test_sweep_spool_removes_only_stale_documents(tmp_path):
+    stale = tmp_path / f"{SPOOL_PREFIX}old.pdf"
+    fresh = tmp_path / f"{SPOOL_PREFIX}new.pdf"
+    other = tmp_path / "other.pdf"
+    for path in (stale, fresh, other):
+        path.write_bytes(b"x")
+    hour_ago = time.time() - 7200
+    os.utime(stale, (hour_ago, hour_ago))
+    os.utime(other, (hour_ago, hour_ago))
+
+    assert sweep_spool(str(tmp_path), max_age=3600) == 1
+    assert not stale.exists()
+    assert fresh.exists() and other.exists()
+
+
+@pytest.mark.asyncio
+async def test_ocr_document_activity_runs_vision_and_cleans_up(tmp_path):
+    path = tmp_path / "scan.png"
+    path.write_bytes(b"png")
+    update = {"extracted_data": {"raw_text": "TIN 1234567890"}, "status": "PROCESSING"}
+    payload = {
+        "document_id": "doc-1",
+        "analysis_id": "an-1",
+        "document": {"path": str(path), "sha256": "abc"},
+    }
+
+    with (
+        patch(
+            "orchestrator.document_analysis_workflow.quality_gate_node",
+            AsyncMock(return_value={}),
+        ),
+        patch(
+            "orchestrator.document_analysis_workflow.vision_router_node",
+            AsyncMock(return_value=update),
+        ) as mock_node,
+        patch(
+            "orchestrator.graph.analysis_cache",
+            AnalysisCache(cache_dir=str(tmp_path / "cache")),
+        ),
+    ):
+        result = await ActivityEnvironment().run(ocr_document, payload)
+
+    # Only masked text reaches the workflow history
+    assert result["extracted_data"]["raw_text"] == "TIN <TIN_REDACTED>"
+    assert result["pii_masked"] is True
+    assert result["status"] == "PROCESSING"
+    assert mock_node.call_args[0][0]["file_path"] == str(path)
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_ocr_document_skips_ocr_for_rejected_image(tmp_path):
+    path = tmp_path / "blurry.jpg"
+    Image.new("RGB", (640, 480), "white").filter(ImageFilter.GaussianBlur(8)).save(path)
+    payload = {
+        "document_id": "doc-1",
+        "analysis_id": "an-1",
+        "document": {"path": str(path), "sha256": "abc"},
+    }
+
+    with (
+        patch("orchestrator.graph.audit_logger.log_event", AsyncMock()),
+        patch(
+            "orchestrator.document_analysis_workflow.vision_router_node", AsyncMock()
+        ) as mock_node,
+    ):
+        result = await ActivityEnvironment().run(ocr_document, payload)
+
+    mock_node.assert_not_called()
+    assert result["compliance_report"]["status"] == "FAIL"
+    assert result["compliance_report"]["issues"][0]["code"] == "IMAGE_BLURRY"
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_ocr_document_sends_unreadable_upload_to_ocr(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(b"\x00\x01 not an image")
+    payload = {
+        "document_id": "doc-1",
+        "document": {"path": str(path), "sha256": "abc"},
+    }
+    update = {"extracted_data": {}, "status": "MANUAL_REVIEW"}
+
+    with (
+        patch(
+            "orchestrator.document_analysis_workflow.vision_router_node",
+            AsyncMock(return_value=update),
+        ) as mock_node,
+        patch(
+            "orchestrator.graph.analysis_cache",
+            AnalysisCache(cache_dir=str(tmp_path / "cache")),
+        ),
+    ):
+        result = await ActivityEnvironment().run(ocr_document, payload)
+
+    mock_node.assert_called_once()
+    assert result["status"] == "MANUAL_REVIEW"
+    assert not path.exists()
+
+
+@pytest.mark.asyncio
+async def test_evaluate_document_escalates_low_confidence_ocr():
+    payload = {
+        "document_id": "doc-1",
+        "analysis_id": "an-1",
+        "document": {"path": "/tmp/gone.png", "sha256": "abc"},
+        "ocr": {"status": "MANUAL_REVIEW", "confidence": {"ocr": 0.2}},
+    }
+
+    with patch(
+        "orchestrator.graph.human_review_agent.submit_to_queue", AsyncMock()
+    ) as mock_submit:
+        report = await ActivityEnvironment().run(evaluate_document, payload)
+
+    mock_submit.assert_called_once()
+    assert report["status"] == "MANUAL_REVIEW"
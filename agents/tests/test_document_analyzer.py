@@ -1,31 +1,77 @@
+import os
 import pytest
 from unittest.mock import patch
+from PIL import Image
 from document_analyzer.ocr import DocumentAnalyzer
+from document_analyzer.templates import TemplateRegistry
+from vision_router.analysis import DocumentAnalysis, OCRWord, PageAnalysis
+
+REGISTRY_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "policy-registry")
+
+LICENSE_TEXT = (
+    "Trade License No: AA/BL/14/0012345\n"
+    "Owner Name: Abebe Kebede\n"
+    "Valid until 30/10/2026"
+)
 
 
 @pytest.fixture
-def analyzer():
+def analyzer(monkeypatch):
+    monkeypatch.setattr(
+        "document_analyzer.ocr.template_registry", TemplateRegistry(REGISTRY_PATH)
+    )
     return DocumentAnalyzer()
 
 
-def test_analyze_success(analyzer):
+def test_analyze_success(analyzer, tesseract_data):
     dummy_bytes = b"fake image content"
 
     with (
-        patch("document_analyzer.ocr.Image.open"),
-        patch("document_analyzer.ocr.pytesseract.image_to_string") as mock_ocr,
+        patch(
+            "document_analyzer.ocr.Image.open", return_value=Image.new("RGB", (64, 64))
+        ),
+        patch("vision_router.engine.pytesseract.image_to_data") as mock_ocr,
     ):
-        mock_ocr.return_value = "Document Number: 12345 Expiry: 2030 Name: Abebe"
+        mock_ocr.return_value = tesseract_data(LICENSE_TEXT)
 
         result = analyzer.analyze(dummy_bytes)
 
         assert "raw_text" in result
-        assert result["features"]["has_stamp"] is True
-        assert result["features"]["has_signature"] is True
-        assert result["readiness_score"] == 0.85
-        assert (
-            result["fields"]["document_number"] == "EXTRACTED_VALUE"
-        )  # Based on current mock implementation
+        assert result["confidence"]["text"] == pytest.approx(0.92)
+        # Blank test image: no stamp or signature, so readiness drops
+        assert result["features"]["has_stamp"] is False
+        assert result["features"]["has_signature"] is False
+        assert result["readiness_score"] == 0.5
+        # No template given: fields matched against the full page text
+        assert result["fields"] == {
+            "document_number": "AA/BL/14/0012345",
+            "expiry_date": "30/10/2026",
+            "full_name": "Abebe Kebede",
+        }
+        assert result["confidence"]["fields"]["document_number"] == pytest.approx(0.92)
+
+
+def test_analyze_with_template_ocrs_only_field_regions(analyzer, tesseract_data):
+    page = Image.new("RGB", (1240, 1754), "white")
+    crops = []
+
+    def ocr(image, **kwargs):
+        crops.append(image.size)
+        return tesseract_data(LICENSE_TEXT)
+
+    with (
+        patch("document_analyzer.ocr.Image.open", return_value=page),
+        patch("vision_router.engine.pytesseract.image_to_data", side_effect=ocr),
+    ):
+        result = analyzer.analyze(b"scan", template_id="trade-license")
+
+    assert result["fields"]["document_number"] == "AA/BL/14/0012345"
+    assert result["fields"]["expiry_date"] == "30/10/2026"
+    assert result["fields"]["full_name"] == "Abebe Kebede"
+    # Three regions, none of them the whole page
+    assert len(set(crops)) == 3
+    page_area = page.width * page.height
+    assert all(w * h < page_area / 4 for w, h in crops)
 
 
 def test_analyze_error(analyzer):
@@ -35,3 +81,49 @@ def test_analyze_error(analyzer):
         result = analyzer.analyze(b"bad data")
         assert "error" in result
         assert result["readiness_score"] == 0
+
+
+def test_analyze_document_reuses_shared_analysis_without_ocr(analyzer):
+    analysis = DocumentAnalysis(
+        pages=[
+            PageAnalysis(
+                index=0,
+                text="Trade License No: AA/BL/14/0012345",
+                confidence=0.9,
+                words=[
+                    OCRWord(text="Trade", conf=0.9),
+                    OCRWord(text="License", conf=0.9),
+                    OCRWord(text="No:", conf=0.9),
+                    OCRWord(text="AA/BL/14/0012345", conf=0.9),
+                ],
+                features={"has_stamp": True, "has_signature": False},
+            )
+        ]
+    )
+
+    with patch("vision_router.engine.pytesseract.image_to_data") as mock_ocr:
+        result = analyzer.analyze_document(analysis)
+
+    mock_ocr.assert_not_called()
+    assert result["features"] == {"has_stamp": True, "has_signature": False}
+    assert result["readiness_score"] == 0.5
+    assert result["confidence"]["fields"]["document_number"] == pytest.approx(0.9)
+
+
+def test_classified_document_uses_only_its_templates_patterns(analyzer):
+    # A trade license whose number was not read; its TIN must not stand in
+    page = PageAnalysis(
+        index=0,
+        text="Trade License\nTIN: 0012345678\nOwner Name: Abebe Kebede",
+        confidence=0.9,
+        template_id="trade-license",
+        document_type="Original Trade License",
+    )
+    result = analyzer.analyze_document(DocumentAnalysis(pages=[page]))
+
+    assert result["fields"]["document_number"] is None
+    assert result["fields"]["full_name"] == "Abebe Kebede"
+
+    unclassified = page.model_copy(update={"template_id": None})
+    fields = analyzer.analyze_document(DocumentAnalysis(pages=[unclassified]))
+    assert fields["fields"]["document_number"] == "0012345678"
@@ -0,0 +1,96 @@
+import math
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw, ImageFont
+from document_analyzer.features import (
+    connected_components,
+    detect_features,
+    detect_signature,
+    detect_stamp,
+)
+
+STAMP_BLUE = (40, 60, 170)
+
+
+def _page(stamp=False, signature=False, logo=False, pen=(20, 20, 20)):
+    """A 150 DPI A4 page: heading, body text and a ruled table."""
+    page = Image.new("RGB", (1240, 1754), "white")
+    draw = ImageDraw.Draw(page)
+    draw.text((150, 75), "FEDERAL DEMOCRATIC REPUBLIC", font=ImageFont.load_default(45))
+    font = ImageFont.load_default(21)
+    for y in range(200, 1100, 35):
+        draw.text(
+            (100, y),
+            "Trade License renewal Bole sub-city 0123456789",
+            font=font,
+            fill="black",
+        )
+    draw.rectangle((100, 1350, 1140, 1650), outline="black", width=2)
+    for y in range(1400, 1650, 50):
+        draw.line((100, y, 1140, y), fill="black", width=2)
+    if logo:
+        draw.rectangle((1000, 50, 1150, 150), fill=STAMP_BLUE)
+    if stamp:
+        x, y, r = 850, 1200, 110
+        draw.ellipse((x - r, y - r, x + r, y + r), outline=STAMP_BLUE, width=7)
+        draw.ellipse(
+            (x - r + 25, y - r + 25, x + r - 25, y + r - 25),
+            outline=STAMP_BLUE,
+            width=4,
+        )
+        draw.text((x - 65, y - 10), "BOLE OFFICE", font=font, fill=STAMP_BLUE)
+    if signature:
+        points = [
+            (
+                300 + t * 1.5,
+                1200 + 40 * math.sin(t / 9) * math.cos(t / 31) + 20 * math.sin(t / 4),
+            )
+            for t in range(180)
+        ]
+        draw.line(points, fill=pen, width=3)
+    return np.asarray(page)
+
+
+def test_connected_components_8_connectivity():
+    mask = np.array(
+        [
+            [1, 1, 0, 0, 1],
+            [0, 0, 1, 0, 1],
+            [0, 0, 0, 0, 0],
+            [1, 0, 0, 1, 1],
+        ],
+        dtype=bool,
+    )
+    components = connected_components(mask)
+    boxes = sorted(
+        zip(
+            *(
+                components[k].tolist()
+                for k in ("area", "top", "left", "bottom", "right")
+            )
+        )
+    )
+    # The diagonal step joins the first run to the row below
+    assert boxes == [(1, 3, 0, 4, 1), (2, 0, 4, 2, 5), (2, 3, 3, 4, 5), (3, 0, 0, 2, 3)]
+
+
+def test_plain_printed_page_has_no_stamp_or_signature():
+    assert detect_features(_page()) == {"has_stamp": False, "has_signature": False}
+
+
+def test_detects_ink_stamp():
+    assert detect_stamp(_page(stamp=True)) is True
+
+
+def test_solid_colour_logo_is_not_a_stamp():
+    assert detect_stamp(_page(logo=True)) is False
+
+
+@pytest.mark.parametrize("pen", [(20, 20, 20), (20, 40, 150)])
+def test_detects_handwritten_signature(pen):
+    assert detect_signature(_page(signature=True, pen=pen)) is True
+
+
+def test_ruled_table_is_not_a_signature():
+    # The table is taller than a text line and sparse, but ruled straight
+    assert detect_signature(_page()) is False
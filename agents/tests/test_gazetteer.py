@@ -0,0 +1,76 @@
+import os
+from safety_agent.detectors import DetectorRegistry
+from safety_agent.gazetteer import Gazetteer, fold, load_gazetteers
+from safety_agent.masking import SafetyAgent
+
+GAZETTEER_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "..", "policy-registry", "gazetteers"
+)
+
+
+def spans(gazetteer, text):
+    return [text[start:end] for start, end in gazetteer.finditer(text)]
+
+
+def test_fold_merges_homophone_spellings():
+    assert fold("ኃይሌ") == fold("ሃይሌ") == fold("ሀይሌ")
+    assert fold("ጸሐይ") == fold("ፀሀይ")
+    assert fold("ዓለማየሁ") == fold("አለማየሁ")
+    assert len(fold("ኃይሌ")) == len("ኃይሌ")
+
+
+def test_whole_words_only():
+    gazetteer = Gazetteer("NAME", ["አበበ", "ሃና"])
+    assert spans(gazetteer, "አበበ እና ሐና መጡ") == ["አበበ", "ሐና"]
+    # Prefixed forms and longer words are not the name
+    assert spans(gazetteer, "ለአበበ ሃናን") == []
+
+
+def test_multi_word_entries_prefer_longest_match():
+    gazetteer = Gazetteer("NAME", ["ገብረ", "ገብረ ሚካኤል", "ሚካኤል ታደሰ"])
+    assert spans(gazetteer, "አቶ ገብረ ሚካኤል ታደሰ") == ["ገብረ ሚካኤል"]
+    # Words separated by punctuation are not one entry
+    assert spans(gazetteer, "ገብረ። ሚካኤል") == ["ገብረ"]
+    # The Ethiopic wordspace separates words like a space
+    assert spans(gazetteer, "ገብረ፡ሚካኤል") == ["ገብረ፡ሚካኤል"]
+
+
+def test_failure_links_find_overlapping_entries():
+    gazetteer = Gazetteer("ADDRESS", ["ጉርድ ሾላ", "ሾላ ገበያ"])
+    assert spans(gazetteer, "ጉርድ ሾላ ገበያ") == ["ጉርድ ሾላ"]
+    assert spans(gazetteer, "ጉርድ ሰፈር ሾላ ገበያ") == ["ሾላ ገበያ"]
+
+
+def test_registry_gazetteers_plug_into_masking():
+    gazetteers = load_gazetteers(GAZETTEER_PATH)
+    assert {g.label for g in gazetteers} == {"NAME", "ADDRESS"}
+
+    registry = DetectorRegistry()
+    registry.register("PHONE", r"\b09\d{8}\b", ("0",))
+    registry.register("NAME", r"(?:አቶ|ወ/ሮ)\s+[ሀ-፿]+", ("አቶ", "ወ/ሮ"))
+    version = registry.version
+    for gazetteer in gazetteers:
+        registry.add(gazetteer)
+    assert registry.version != version
+
+    text = "ወ/ሮ አስቴር, ኃይሌ from ጉርድ ሾላ, አዲስ አበባ 0911223344"
+    masked, found = SafetyAgent(registry).engine.redact(text)
+    assert masked == (
+        "<NAME_REDACTED>, <NAME_REDACTED> from <ADDRESS_REDACTED>, "
+        "አዲስ አበባ <PHONE_REDACTED>"
+    )
+    assert [s.text for s in found] == ["ወ/ሮ አስቴር", "ኃይሌ", "ጉርድ ሾላ", "0911223344"]
+
+
+def test_registry_path_falls_back_to_the_checkout(monkeypatch, tmp_path):
+    from common.config import policy_registry_path
+
+    monkeypatch.delenv("POLICY_REGISTRY_PATH", raising=False)
+    # Started outside the repository root, where no ./policy-registry exists
+    monkeypatch.chdir(tmp_path)
+    path = policy_registry_path()
+    assert os.path.samefile(path, os.path.join(GAZETTEER_PATH, ".."))
+    assert load_gazetteers(os.path.join(path, "gazetteers"))
+
+    monkeypatch.setenv("POLICY_REGISTRY_PATH", "/policy-registry")
+    assert policy_registry_path() == "/policy-registry"
@@ -0,0 +1,36 @@
+import pytest
+from common.http import HTTPClientManager
+
+
+@pytest.mark.asyncio
+async def test_clients_are_shared_per_host():
+    manager = HTTPClientManager(max_connections_per_host=4)
+    try:
+        backend = manager.get("http://backend:3000/internal/audit/events")
+        assert (
+            manager.get("http://backend:3000/internal/analyses/1/complete") is backend
+        )
+        assert manager.get("https://api.mesob.gov.et/v1") is not backend
+    finally:
+        await manager.aclose()
+
+    assert backend.is_closed
+
+
+@pytest.mark.asyncio
+async def test_closed_client_is_replaced():
+    manager = HTTPClientManager()
+    first = manager.get("http://backend:3000")
+    await manager.aclose()
+
+    second = manager.get("http://backend:3000")
+    try:
+        assert second is not first
+        assert not second.is_closed
+    finally:
+        await manager.aclose()
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    monkeypatch.setattr("common.http.HTTP2_AVAILABLE", False)
+    assert HTTPClientManager(http2=True).http2 is False
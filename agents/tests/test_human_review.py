@@ -23,3 +23,29 @@ async def test_submit_to_queue():
         assert result["status"] == "PENDING_REVIEW"
         assert result["reason"] == "Low Confidence"
         mock_post.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_submit_masks_unmasked_extraction():
+    state = {
+        "document_id": "doc_123",
+        "extracted_data": {"raw_text": "Call 0911223344", "pages": [{"text": "x"}]},
+        "pii_masked": False,
+    }
+    with patch("httpx.AsyncClient.post", return_value=MagicMock()):
+        result = await HumanReviewAgent().submit_to_queue(state, "Low OCR confidence")
+
+    extracted = result["extracted_data"]
+    assert extracted["raw_text"] == "Call <PHONE_REDACTED>"
+    assert extracted["pii"]["counts"] == {"PHONE": 1}
+
+
+@pytest.mark.asyncio
+async def test_submit_does_not_mask_the_callers_state():
+    pages = [{"text": "Call 0911223344"}]
+    state = {"extracted_data": {"pages": pages}, "pii_masked": False}
+    with patch("httpx.AsyncClient.post", return_value=MagicMock()):
+        result = await HumanReviewAgent().submit_to_queue(state, "Low OCR confidence")
+
+    assert result["extracted_data"]["pages"][0]["text"] == "Call <PHONE_REDACTED>"
+    assert pages[0]["text"] == "Call 0911223344"
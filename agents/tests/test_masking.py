@@ -0,0 +1,140 @@
+import re
+from unittest.mock import patch
+from common.safety import SafetyAgent
+from safety_agent.detectors import DetectorRegistry, pii_detectors
+from safety_agent.engine import MaskingEngine, PIIDetector, PIISpan
+from safety_agent.masking import safety_agent
+from safety_agent.walker import PII_INDEX_KEY
+
+SAMPLE = (
+    "Owner አቶ ከበደ, TIN 1234567890, phone 0911223344 or +251922334455, "
+    "mail abebe.k@example.com, passport A1234567 / EP1234567X."
+)
+
+
+def test_spans_are_typed_and_in_text_order():
+    spans = SafetyAgent().engine.scan(SAMPLE)
+    assert [s.label for s in spans] == [
+        "NAME",
+        "TIN",
+        "PHONE",
+        "PHONE",
+        "EMAIL",
+        "PASSPORT",
+        "PASSPORT",
+    ]
+    tin = spans[1]
+    assert tin == PIISpan("TIN", tin.start, tin.end, "1234567890")
+    assert SAMPLE[tin.start : tin.end] == "1234567890"
+
+
+def test_earlier_detector_wins_at_same_position():
+    # A phone number is also ten digits; PHONE is listed first
+    assert SafetyAgent().mask("Call 0911223344") == "Call <PHONE_REDACTED>"
+    engine = MaskingEngine(
+        [PIIDetector("TIN", r"\b\d{10}\b"), PIIDetector("PHONE", r"\b09\d{8}\b")],
+        placeholder="<{label}>",
+    )
+    assert engine.mask("Call 0911223344") == "Call <TIN>"
+
+
+def test_leftmost_match_wins_over_detector_order():
+    engine = MaskingEngine(
+        [PIIDetector("DIGITS", r"\d{4}"), PIIDetector("REF", r"[A-Z]-\d+")],
+        placeholder="<{label}>",
+    )
+    masked, spans = engine.redact("Ref A-123456 and 7777")
+    assert masked == "Ref <REF> and <DIGITS>"
+    assert [(s.label, s.text) for s in spans] == [
+        ("REF", "A-123456"),
+        ("DIGITS", "7777"),
+    ]
+
+
+def test_detectors_missing_required_literals_are_skipped():
+    engine = MaskingEngine(
+        [
+            PIIDetector("EMAIL", r"\S+@\S+", ("@",)),
+            PIIDetector("TIN", r"\d{10}"),
+        ],
+        placeholder="<{label}>",
+    )
+    assert engine.mask("TIN 1234567890") == "TIN <TIN>"
+    assert engine.mask("a@b.et 1234567890") == "<EMAIL> <TIN>"
+
+
+def test_single_pass_matches_sequential_substitution():
+    sequential = SAMPLE
+    # The gazetteers are word lists, not patterns; SAMPLE has none of their names
+    for detector in pii_detectors.detectors:
+        if not isinstance(detector, PIIDetector):
+            continue
+        sequential = re.sub(
+            detector.pattern, f"<{detector.label}_REDACTED>", sequential
+        )
+    assert SafetyAgent().mask(SAMPLE) == sequential
+
+
+def test_both_import_paths_share_the_registry():
+    assert SafetyAgent is type(safety_agent)
+    assert SafetyAgent().engine is safety_agent.engine is pii_detectors.engine
+    assert safety_agent.mask_pii(SAMPLE) == SafetyAgent().mask(SAMPLE)
+
+
+def test_registry_recompiles_on_register():
+    registry = DetectorRegistry()
+    registry.register("TIN", r"\b\d{10}\b")
+    engine, version = registry.engine, registry.version
+    assert registry.engine is engine
+
+    registry.register("PHONE", r"\b09\d{8}\b", before="TIN")
+    assert [d.label for d in registry.detectors] == ["PHONE", "TIN"]
+    assert registry.engine is not engine
+    assert registry.version != version
+    agent = SafetyAgent(registry)
+    assert agent.mask("0911223344 1234567890") == ("<PHONE_REDACTED> <TIN_REDACTED>")
+
+    registry.unregister("PHONE")
+    assert agent.mask("0911223344") == "<TIN_REDACTED>"
+
+
+def test_extract_and_mask_reports_detection():
+    result = safety_agent.extract_and_mask({"raw_text": SAMPLE})
+    assert "0911223344" not in result["masked_text"]
+    assert "<NAME_REDACTED>" in result["masked_text"]
+    assert result["pii_detected"] is True
+    assert safety_agent.extract_and_mask({"raw_text": "clean"})["pii_detected"] is False
+
+
+def test_structure_is_masked_in_place_with_span_index():
+    pages = [{"index": 0, "text": "Call 0911223344"}, {"index": 1, "text": "none"}]
+    data = {
+        "raw_text": "TIN 1234567890",
+        "fields": {"owner": "አቶ ከበደ", "tin": "1234567890"},
+        "pages": pages,
+        "confidence": 0.9,
+    }
+    index = safety_agent.mask_structure(data)
+
+    assert data["pages"] is pages
+    assert pages[0]["text"] == "Call <PHONE_REDACTED>"
+    assert data["fields"] == {"owner": "<NAME_REDACTED>", "tin": "<TIN_REDACTED>"}
+    assert data[PII_INDEX_KEY] is index
+    assert index["counts"] == {"TIN": 2, "NAME": 1, "PHONE": 1}
+    label, start, end = index["subtrees"]["pages"]["spans"]["pages.0.text"][0]
+    assert (label, pages[0]["text"][start:end]) == ("PHONE", "<PHONE_REDACTED>")
+
+
+def test_unchanged_subtrees_are_not_rescanned():
+    data = {"raw_text": "TIN 1234567890", "fields": {"tin": "1234567890"}}
+    safety_agent.mask_structure(data)
+    # A later stage adds metadata to already masked data
+    data["metadata"] = {"contact": "a@b.et"}
+    engine = safety_agent.engine
+    with patch.object(engine, "redact", wraps=engine.redact) as redact:
+        result = safety_agent.extract_and_mask(data)
+
+    redact.assert_called_once_with("a@b.et")
+    assert data["metadata"]["contact"] == "<EMAIL_REDACTED>"
+    assert result["masked_text"] == "TIN <TIN_REDACTED>"
+    assert result["pii"]["counts"] == {"TIN": 2, "EMAIL": 1}
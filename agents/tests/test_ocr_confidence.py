@@ -0,0 +1,36 @@
+import pytest
+from vision_router.confidence import (
+    field_confidence,
+    mean_confidence,
+    text_from_words,
+    words_from_data,
+)
+
+
+def test_words_from_data_drops_layout_rows(tesseract_data):
+    words = words_from_data(tesseract_data("Trade License\nAA-12345", conf=90))
+    assert [w["text"] for w in words] == ["Trade", "License", "AA-12345"]
+    assert all(w["conf"] == pytest.approx(0.9) for w in words)
+    assert text_from_words(words) == "Trade License\nAA-12345"
+
+
+def test_mean_confidence_is_character_weighted():
+    words = [
+        {"text": "AA-12345", "conf": 0.9},
+        {"text": "x", "conf": 0.0},
+    ]
+    assert mean_confidence(words) == pytest.approx(0.8)
+    assert mean_confidence([]) == 0.0
+
+
+def test_field_confidence_covers_only_the_field_words():
+    words = [
+        {"text": "License", "conf": 0.95},
+        {"text": "No.", "conf": 0.9},
+        {"text": "AA-12345", "conf": 0.5},
+    ]
+    assert field_confidence(words, "AA-12345") == pytest.approx(0.5)
+    assert field_confidence(words, "License No.") == pytest.approx(
+        (0.95 * 7 + 0.9 * 3) / 10
+    )
+    assert field_confidence(words, "BB-999") is None
@@ -0,0 +1,141 @@
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from vision_router import engine
+from vision_router.engine import (
+    PytesseractEngine,
+    TesserocrEngine,
+    get_engine,
+    warm_engine,
+)
+
+
+def test_get_engine_falls_back_to_pytesseract(monkeypatch):
+    monkeypatch.setattr(engine, "_engine", None)
+    monkeypatch.setattr(engine, "TESSEROCR_AVAILABLE", False)
+    monkeypatch.setenv("OCR_BACKEND", "tesserocr")
+
+    assert isinstance(get_engine(), PytesseractEngine)
+    # One engine per process
+    assert get_engine() is get_engine()
+
+
+def test_pytesseract_engine_returns_word_data(tesseract_data):
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data",
+        return_value=tesseract_data("TIN 0012345678"),
+    ) as mock_ocr:
+        data = PytesseractEngine().image_to_data(Image.new("L", (64, 64)), "eng")
+
+    assert mock_ocr.call_args.kwargs["lang"] == "eng"
+    assert "0012345678" in data["text"]
+
+
+def test_warm_engine_survives_missing_language_pack(monkeypatch):
+    class Broken(PytesseractEngine):
+        def warm(self, langs):
+            raise RuntimeError("Failed loading language 'amh'")
+
+    monkeypatch.setattr(engine, "_engine", Broken())
+    warm_engine()
+
+
+def test_engine_must_implement_version_and_image_to_data():
+    class Partial(engine.OCREngine):
+        def version(self):
+            return "1"
+
+    with pytest.raises(TypeError):
+        Partial()
+
+
+class FakeTesserocr:
+    """Stands in for the ``tesserocr`` module: two lines, three words."""
+
+    class RIL:
+        BLOCK, PARA, TEXTLINE, WORD = range(4)
+
+    # (text, confidence, starts block/para/line, box)
+    WORDS = [
+        ("TIN", 95.0, {0, 1, 2}, (10, 10, 50, 30)),
+        ("0012345678", 90.0, set(), (60, 10, 200, 30)),
+        ("Bole", 80.0, {2}, (10, 40, 60, 60)),
+    ]
+
+    class Word:
+        def __init__(self, text, conf, starts, box):
+            self.text, self.conf, self.starts, self.box = text, conf, starts, box
+
+        def IsAtBeginningOf(self, level):
+            return level in self.starts
+
+        def GetUTF8Text(self, level):
+            return self.text
+
+        def Confidence(self, level):
+            return self.conf
+
+        def BoundingBox(self, level):
+            return self.box
+
+    class PyTessBaseAPI:
+        created = []
+
+        def __init__(self, lang):
+            self.lang = lang
+            FakeTesserocr.PyTessBaseAPI.created.append(self)
+
+        def SetImage(self, image):
+            pass
+
+        def Recognize(self):
+            pass
+
+        def GetIterator(self):
+            return iter(FakeTesserocr.WORDS)
+
+        def Clear(self):
+            pass
+
+    @staticmethod
+    def iterate_level(iterator, level):
+        return (FakeTesserocr.Word(*word) for word in iterator)
+
+    @staticmethod
+    def tesseract_version():
+        return "tesseract 5.3.0\n leptonica-1.82.0"
+
+
+@pytest.fixture
+def fake_tesserocr(monkeypatch):
+    FakeTesserocr.PyTessBaseAPI.created = []
+    monkeypatch.setattr(engine, "tesserocr", FakeTesserocr)
+    monkeypatch.setattr(engine, "TESSEROCR_AVAILABLE", True)
+    return FakeTesserocr
+
+
+def test_auto_backend_prefers_tesserocr(monkeypatch, fake_tesserocr):
+    monkeypatch.setattr(engine, "_engine", None)
+    monkeypatch.setenv("OCR_BACKEND", "auto")
+    assert isinstance(get_engine(), TesserocrEngine)
+    assert get_engine().version() == "5.3.0"
+
+
+def test_tesserocr_engine_collects_word_data(fake_tesserocr):
+    data = TesserocrEngine().image_to_data(Image.new("L", (64, 64)), "eng")
+
+    assert data["text"] == ["TIN", "0012345678", "Bole"]
+    assert data["conf"] == [95.0, 90.0, 80.0]
+    assert data["block_num"] == [1, 1, 1]
+    assert data["line_num"] == [1, 1, 2]
+    assert (data["left"][1], data["width"][1], data["height"][1]) == (60, 140, 20)
+
+
+def test_tesserocr_apis_are_loaded_once_and_reused(fake_tesserocr):
+    ocr = TesserocrEngine()
+    ocr.warm(["eng"])
+    for _ in range(3):
+        ocr.image_to_data(Image.new("L", (64, 64)), "eng")
+    ocr.image_to_data(Image.new("L", (64, 64)), "amh")
+
+    assert [api.lang for api in fake_tesserocr.PyTessBaseAPI.created] == ["eng", "amh"]
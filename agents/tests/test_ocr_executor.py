@@ -0,0 +1,63 @@
+import os
+import time
+import pytest
+from vision_router.executor import OCRExecutor, OCRTimeoutError
+
+
+def _slow_job(seconds: float) -> str:
+    time.sleep(seconds)
+    return "done"
+
+
+def _failing_job():
+    raise ValueError("corrupt image")
+
+
+@pytest.mark.asyncio
+async def test_inline_executor_runs_job_and_counts():
+    executor = OCRExecutor(max_workers=0)
+    try:
+        assert await executor.run(_slow_job, 0) == "done"
+        stats = executor.stats()
+        assert stats["completed"] == 1
+        assert stats["queued"] == 0
+        assert stats["running"] == 0
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_enforces_per_job_timeout():
+    executor = OCRExecutor(max_workers=0)
+    try:
+        with pytest.raises(OCRTimeoutError):
+            await executor.run(_slow_job, 0.5, timeout=0.05)
+        assert executor.stats()["timed_out"] == 1
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_executor_counts_failures():
+    executor = OCRExecutor(max_workers=0)
+    try:
+        with pytest.raises(ValueError):
+            await executor.run(_failing_job)
+        assert executor.stats()["failed"] == 1
+    finally:
+        executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_process_pool_runs_picklable_job():
+    executor = OCRExecutor(max_workers=1, timeout=30)
+    try:
+        assert await executor.run(pow, 2, 10) == 1024
+        assert executor.stats()["pool_size"] == 1
+    finally:
+        executor.shutdown()
+
+
+def test_empty_pool_size_falls_back_to_cpu_count(monkeypatch):
+    monkeypatch.setenv("OCR_POOL_SIZE", "")
+    assert OCRExecutor().max_workers == (os.cpu_count() or 1)
@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+from vision_router.preprocess import (
+    downscale,
+    estimate_skew,
+    otsu_threshold,
+    prepare_image,
+)
+
+
+@pytest.fixture
+def text_page():
+    page = Image.new("L", (1240, 1754), 255)
+    draw = ImageDraw.Draw(page)
+    for y in range(80, 1680, 32):
+        draw.text((60, y), "Trade License renewal - Bole sub-city 0123456789 " * 2)
+    return page
+
+
+def test_downscale_caps_phone_photo_at_target_dpi():
+    photo = Image.new("RGB", (3024, 4032))
+    small, scale = downscale(photo, target_dpi=300)
+    assert max(small.size) == round(11.69 * 300)
+    assert scale < 1
+
+
+def test_downscale_never_upscales():
+    image = Image.new("RGB", (600, 800))
+    small, scale = downscale(image)
+    assert small.size == (600, 800)
+    assert scale == 1.0
+
+
+def test_otsu_threshold_splits_bimodal_histogram():
+    gray = np.concatenate([np.full(1000, 30), np.full(1000, 220)]).astype(np.uint8)
+    assert 30 <= otsu_threshold(gray) < 220
+
+
+def test_estimate_skew_detects_rotation(text_page):
+    rotated = np.asarray(text_page.rotate(2, expand=True, fillcolor=255))
+    assert estimate_skew(rotated < 128) == pytest.approx(-2, abs=0.25)
+
+
+def test_prepare_image_crops_background_and_deskews(text_page):
+    photo = Image.new("RGB", (1600, 2100), (50, 40, 30))
+    photo.paste(
+        text_page.rotate(2, expand=True, fillcolor=255).convert("RGB"), (150, 120)
+    )
+
+    prepared = prepare_image(photo)
+
+    assert prepared["skew_angle"] == pytest.approx(-2, abs=0.25)
+    left, top, right, bottom = prepared["crop"]
+    assert left > 100 and top > 80
+    assert prepared["ocr_image"].mode == "L"
+    assert set(np.unique(np.asarray(prepared["ocr_image"]))) <= {0, 255}
+    # The downscaled colour array is kept for feature detectors
+    assert prepared["rgb"].shape[2] == 3
@@ -0,0 +1,57 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from orchestrator.progress import ProgressReporter, page_progress
+from vision_router.analysis import PageAnalysis
+
+
+def _page(index, text="Contact 0911223344"):
+    return PageAnalysis(index=index, text=text, confidence=0.9, lang="eng")
+
+
+@pytest.fixture
+def backend():
+    client = MagicMock()
+    client.post = AsyncMock(return_value=MagicMock())
+    with patch("orchestrator.progress.http_clients.get", return_value=client):
+        yield client
+
+
+def test_page_progress_masks_text():
+    progress = page_progress(_page(3))
+    assert progress["index"] == 3
+    assert "0911223344" not in progress["masked_text"]
+    assert "text" not in progress
+
+
+@pytest.mark.asyncio
+async def test_pages_are_posted_in_batches(backend):
+    reporter = ProgressReporter(
+        "an-1", "http://backend", {}, batch_pages=2, flush_seconds=60
+    )
+    for index in range(5):
+        await reporter.page_done(_page(index), 5)
+
+    # Two full batches so far; the fifth page waits for the next flush
+    assert backend.post.call_count == 2
+    url = backend.post.call_args.args[0]
+    assert url == "http://backend/internal/analyses/an-1/progress"
+    body = backend.post.call_args.kwargs["json"]
+    assert body["page_count"] == 5
+    assert [p["index"] for p in body["pages"]] == [2, 3]
+
+    await reporter.flush()
+    assert [p["index"] for p in backend.post.call_args.kwargs["json"]["pages"]] == [4]
+    assert reporter.posted == 5
+
+
+@pytest.mark.asyncio
+async def test_failed_post_keeps_pages_for_next_batch(backend):
+    backend.post.side_effect = [RuntimeError("backend down"), MagicMock()]
+    reporter = ProgressReporter("an-1", "http://backend", {}, batch_pages=1)
+
+    await reporter.page_done(_page(0), 2)
+    await reporter.page_done(_page(1), 2)
+
+    pages = backend.post.call_args.kwargs["json"]["pages"]
+    assert [p["index"] for p in pages] == [0, 1]
+    assert reporter.posted == 2
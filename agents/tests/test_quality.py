@@ -0,0 +1,111 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from PIL import Image, ImageDraw, ImageEnhance, ImageFilter, ImageFont
+from vision_router.quality import assess_image, laplacian_variance
+import numpy as np
+
+
+@pytest.fixture
+def text_page():
+    page = Image.new("RGB", (1240, 1754), "white")
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(21)
+    for y in range(150, 1650, 35):
+        draw.text(
+            (100, y),
+            "Trade License renewal Bole sub-city 0123456789",
+            font=font,
+            fill="black",
+        )
+    return page
+
+
+def _photo(page, size=(1512, 2016), at=(130, 130)):
+    """The page lying on a dark desk."""
+    photo = Image.new("RGB", size, (58, 48, 40))
+    photo.paste(page, at)
+    return photo
+
+
+def _codes(result):
+    return [issue["code"] for issue in result["issues"]]
+
+
+def test_sharp_photo_passes(text_page):
+    result = assess_image(_photo(text_page))
+    assert result["usable"] is True
+    assert result["issues"] == []
+
+
+def test_blurry_photo_is_rejected_with_remediation(text_page):
+    result = assess_image(_photo(text_page).filter(ImageFilter.GaussianBlur(6)))
+    assert result["usable"] is False
+    assert "IMAGE_BLURRY" in _codes(result)
+    assert result["issues"][0]["remediation"]
+
+
+def test_dark_photo_is_rejected(text_page):
+    result = assess_image(ImageEnhance.Brightness(_photo(text_page)).enhance(0.15))
+    assert result["usable"] is False
+    assert "IMAGE_TOO_DARK" in _codes(result)
+
+
+def test_distant_page_is_rejected(text_page):
+    result = assess_image(_photo(text_page.resize((400, 565)), at=(550, 700)))
+    assert "PAGE_TOO_SMALL" in _codes(result)
+
+
+def test_cut_off_page_is_flagged_not_rejected(text_page):
+    result = assess_image(text_page.crop((200, 0, 1240, 1754)))
+    assert result["usable"] is True
+    assert _codes(result) == ["PAGE_CROPPED"]
+
+
+@pytest.fixture
+def sparse_page():
+    """A clean 300-DPI A4 scan with a few lines of text and mostly paper."""
+    page = Image.new("RGB", (2480, 3508), "white")
+    draw = ImageDraw.Draw(page)
+    font = ImageFont.load_default(42)
+    for i in range(4):
+        draw.text(
+            (300, 400 + i * 90),
+            "Trade License No. AA/1234/16 Bole",
+            font=font,
+            fill="black",
+        )
+    return page
+
+
+def test_sparse_clean_page_passes(sparse_page):
+    result = assess_image(sparse_page)
+    assert result["usable"] is True
+    assert result["issues"] == []
+
+
+def test_washed_out_page_is_a_warning(sparse_page):
+    result = assess_image(ImageEnhance.Contrast(sparse_page).enhance(0.15))
+    assert result["usable"] is True
+    assert "IMAGE_LOW_CONTRAST" in _codes(result)
+
+
+def test_laplacian_variance_is_zero_on_flat_image():
+    assert laplacian_variance(np.full((50, 50), 200, dtype=np.uint8)) == 0.0
+
+
+@pytest.mark.asyncio
+async def test_unreadable_upload_passes_the_gate_unassessed(tmp_path):
+    from orchestrator import graph
+
+    path = tmp_path / "upload.bin"
+    path.write_bytes(b"\x00\x01 not an image")
+    state = {"file_path": str(path), "extracted_data": {"documents": ["TIN"]}}
+
+    with patch.object(graph.audit_logger, "log_event", AsyncMock()) as log:
+        update = await graph.quality_gate_node(state)
+
+    log.assert_not_called()
+    assert "status" not in update
+    assert update["extracted_data"]["documents"] == ["TIN"]
+    assert update["extracted_data"]["quality"]["usable"] is None
+    assert graph.image_rejected({**state, **update}) is False
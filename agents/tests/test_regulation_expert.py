@@ -1,12 +1,50 @@
+import asyncio
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 from regulation_expert.retrieval import HybridRetriever
 
 
 @pytest.fixture
 def retriever():
     with patch("regulation_expert.retrieval.weaviate.connect_to_local"):
-        return HybridRetriever()
+        yield HybridRetriever()
+
+
+def weaviate_object(uuid, content):
+    obj = MagicMock()
+    obj.uuid = uuid
+    obj.properties = {"content": content, "document_id": "doc-1"}
+    return obj
+
+
+@pytest.fixture
+def async_weaviate():
+    """Async client whose hybrid search takes 50 ms."""
+    state = {"in_flight": 0, "max_in_flight": 0, "delay": 0.05}
+
+    async def hybrid(query, limit, alpha):
+        state["in_flight"] += 1
+        state["max_in_flight"] = max(state["max_in_flight"], state["in_flight"])
+        try:
+            await asyncio.sleep(state["delay"])
+        finally:
+            state["in_flight"] -= 1
+        response = MagicMock()
+        response.objects = [weaviate_object("uuid-1", f"About {query}")]
+        return response
+
+    client = MagicMock()
+    client.connect = AsyncMock()
+    client.close = AsyncMock()
+    client.is_connected.return_value = True
+    client.collections.get.return_value.query.hybrid = hybrid
+    with patch(
+        "regulation_expert.retrieval.weaviate.use_async_with_local",
+        return_value=client,
+    ) as factory:
+        state["client"] = client
+        state["factory"] = factory
+        yield state
 
 
 @pytest.mark.asyncio
@@ -34,8 +72,53 @@ async def test_retrieval_logic(retriever):
 @pytest.mark.asyncio
 async def test_get_relevant_regulations(retriever):
     with patch.object(
-        retriever, "retrieve", return_value=[{"id": "1", "content": "Test"}]
+        retriever,
+        "aretrieve",
+        AsyncMock(return_value=[{"id": "1", "content": "Test"}]),
     ) as mock_retrieve:
         results = await retriever.get_relevant_regulations("Passport", "renewal")
         assert len(results) == 1
-        mock_retrieve.assert_called_once_with("Regulations for Passport renewal")
+        mock_retrieve.assert_awaited_once_with("Regulations for Passport renewal")
+
+
+@pytest.mark.asyncio
+async def test_async_searches_share_one_client_and_are_limited(async_weaviate):
+    retriever = HybridRetriever(max_concurrency=2)
+    results = await asyncio.gather(
+        *(retriever.aretrieve(f"query {i}") for i in range(6))
+    )
+
+    assert [r[0]["content"] for r in results] == [f"About query {i}" for i in range(6)]
+    assert async_weaviate["factory"].call_count == 1
+    async_weaviate["client"].connect.assert_awaited_once()
+    assert async_weaviate["max_in_flight"] == 2
+    # The synchronous client is never connected on the async path
+    assert retriever._client is None
+
+    await retriever.aclose()
+    async_weaviate["client"].close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_async_search_times_out(async_weaviate):
+    async_weaviate["delay"] = 1.0
+    retriever = HybridRetriever(timeout=0.05)
+    with pytest.raises(asyncio.TimeoutError):
+        await retriever.aretrieve("slow")
+
+
+@pytest.mark.asyncio
+async def test_stale_async_client_is_closed_before_reconnecting(async_weaviate):
+    stale = MagicMock()
+    stale.is_connected.return_value = False
+    stale.close = AsyncMock(side_effect=RuntimeError("already gone"))
+    retriever = HybridRetriever()
+    retriever._async_clients[asyncio.get_running_loop()] = stale
+
+    await retriever.aretrieve("renewal")
+
+    stale.close.assert_awaited_once()
+    async_weaviate["client"].connect.assert_awaited_once()
+    assert (
+        retriever._async_clients[asyncio.get_running_loop()] is async_weaviate["client"]
+    )
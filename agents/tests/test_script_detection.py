@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import patch
+from PIL import Image
+from vision_router.script import detect_lang, lang_for_text, ocr_image
+
+AMHARIC = "የንግድ ፈቃድ ማደሻ ማመልከቻ ቅጽ በቦሌ ክፍለ ከተማ "
+ENGLISH = "Trade License renewal application, Bole sub-city "
+
+
+def test_lang_for_text_picks_single_pack_per_script():
+    assert lang_for_text(ENGLISH * 3) == "eng"
+    assert lang_for_text(AMHARIC * 3) == "amh"
+    assert lang_for_text(AMHARIC * 2 + ENGLISH * 2) == "eng+amh"
+
+
+def test_lang_for_text_keeps_both_packs_when_probe_is_empty():
+    assert lang_for_text("12 / 05") == "eng+amh"
+
+
+def test_detect_lang_probes_low_res_copy(tesseract_data):
+    photo = Image.new("L", (2480, 3508), 255)
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data",
+        return_value=tesseract_data(AMHARIC * 3),
+    ) as mock_ocr:
+        assert detect_lang(photo) == "amh"
+
+    probe = mock_ocr.call_args.args[0]
+    assert max(probe.size) == 1600
+    assert mock_ocr.call_args.kwargs["lang"] == "eng+amh"
+
+
+def test_ocr_image_uses_forced_lang_without_probe(tesseract_data):
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data",
+        return_value=tesseract_data("text"),
+    ) as mock_ocr:
+        result = ocr_image(Image.new("L", (64, 64)), lang="amh")
+
+    mock_ocr.assert_called_once()
+    assert result["text"] == "text"
+    assert result["lang"] == "amh"
+    assert result["passes"] == 1
+
+
+def test_ocr_image_exits_early_on_confident_probe(tesseract_data):
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data",
+        return_value=tesseract_data(ENGLISH * 3, conf=96),
+    ) as mock_ocr:
+        result = ocr_image(Image.new("L", (2480, 3508), 255))
+
+    mock_ocr.assert_called_once()
+    assert result["passes"] == 1
+
+
+def test_ocr_image_retries_weak_single_lang_pass_with_both_packs(tesseract_data):
+    passes = [
+        tesseract_data(ENGLISH * 3, conf=70),  # probe: Latin, not confident
+        tesseract_data(ENGLISH * 3, conf=40),  # eng pass: weak
+        tesseract_data(ENGLISH * 3, conf=75),  # eng+amh retry
+    ]
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data", side_effect=passes
+    ) as mock_ocr:
+        result = ocr_image(Image.new("L", (2480, 3508), 255))
+
+    assert [c.kwargs["lang"] for c in mock_ocr.call_args_list] == [
+        "eng+amh",
+        "eng",
+        "eng+amh",
+    ]
+    assert result["passes"] == 3
+    assert result["lang"] == "eng+amh"
+    assert result["confidence"] == pytest.approx(0.75)
+
+
+def test_ocr_image_reuses_full_resolution_probe_as_both_packs_pass(tesseract_data):
+    passes = [
+        tesseract_data(ENGLISH * 3, conf=75),  # probe at full resolution
+        tesseract_data(ENGLISH * 3, conf=40),  # eng pass: weak
+    ]
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data", side_effect=passes
+    ) as mock_ocr:
+        result = ocr_image(Image.new("L", (1131, 1600), 255))
+
+    assert [c.kwargs["lang"] for c in mock_ocr.call_args_list] == ["eng+amh", "eng"]
+    assert result["passes"] == 2
+    assert result["lang"] == "eng+amh"
+    assert result["confidence"] == pytest.approx(0.75)
+
+
+def test_confident_probe_words_are_in_page_coordinates(tesseract_data):
+    data = tesseract_data("TIN 0012345678", conf=96)
+    # Boxes as read on the 1600 px probe of a 3200 px page
+    for key, value in (("left", 100), ("top", 50), ("width", 40), ("height", 20)):
+        data[key] = [value] * len(data["text"])
+    with patch("vision_router.engine.pytesseract.image_to_data", return_value=data):
+        result = ocr_image(Image.new("L", (2262, 3200), 255))
+
+    assert result["passes"] == 1
+    word = result["words"][0]
+    assert (word["left"], word["top"], word["width"], word["height"]) == (
+        200,
+        100,
+        80,
+        40,
+    )
@@ -0,0 +1,67 @@
+import pytest
+from PIL import Image
+from unittest.mock import patch
+from document_analyzer.templates import (
+    DocumentTemplate,
+    TemplateRegistry,
+    extract_fields,
+)
+
+TEMPLATE = """
+id: tin-certificate
+document_type: TIN Certificate
+fields:
+  document_number:
+    region: [0.5, 0.0, 1.0, 0.25]
+    lang: eng
+    pattern: 'TIN\\D{0,20}(?P<value>\\d{10})'
+"""
+
+
+@pytest.fixture
+def registry(tmp_path):
+    (tmp_path / "templates").mkdir()
+    (tmp_path / "templates" / "tin-certificate.yaml").write_text(TEMPLATE)
+    (tmp_path / "templates" / "broken.yaml").write_text("id: [unclosed")
+    return TemplateRegistry(str(tmp_path))
+
+
+def test_registry_loads_templates_and_skips_broken_files(registry):
+    template = registry.get("tin-certificate")
+    assert template.document_type == "TIN Certificate"
+    assert [t.id for t in registry.all()] == ["tin-certificate"]
+    assert len(registry.field_specs("document_number")) == 1
+
+
+def test_field_pattern_is_precompiled_and_returns_value_group(registry):
+    spec = registry.get("tin-certificate").fields["document_number"]
+    assert spec.match("Taxpayer TIN: 0012345678 issued") == "0012345678"
+    assert spec.match("no number here") is None
+
+
+def test_extract_fields_ocrs_region_crop_only(registry, tesseract_data):
+    page = Image.new("L", (800, 1000), 255)
+    with patch(
+        "vision_router.engine.pytesseract.image_to_data",
+        return_value=tesseract_data("TIN: 0012345678", conf=88),
+    ) as mock_ocr:
+        result = extract_fields(registry.get("tin-certificate"), page)
+
+    mock_ocr.assert_called_once()
+    assert mock_ocr.call_args.args[0].size == (400, 250)
+    assert result["fields"]["document_number"] == {
+        "value": "0012345678",
+        "confidence": pytest.approx(0.88),
+    }
+    assert result["passes"] == 1
+    # Word boxes are moved into page coordinates
+    assert all(w["left"] >= 400 for w in result["words"])
+
+
+def test_repo_templates_are_valid():
+    import os
+
+    path = os.path.join(os.path.dirname(__file__), "..", "..", "policy-registry")
+    templates = TemplateRegistry(path).all()
+    assert {t.id for t in templates} >= {"trade-license", "tin-certificate"}
+    assert all(isinstance(t, DocumentTemplate) for t in templates)
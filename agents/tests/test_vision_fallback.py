@@ -0,0 +1,199 @@
+import io
+import json
+import time
+import base64
+import threading
+import pytest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import AsyncMock, patch
+from PIL import Image
+from cost_control_agent.monitor import CostMonitor
+from vision_router.analysis import DocumentAnalysis, PageAnalysis
+from vision_router.fallback import VisionLLMFallback, encode_page
+from vision_router.router import VisionRouter
+from vision_router.executor import OCRExecutor
+
+
+class StandIn:
+    """Local stand-in for an OpenAI-compatible vision endpoint."""
+
+    def __init__(self):
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def handle(self, body):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.05)
+        content = body["messages"][0]["content"]
+        images = [c["image_url"]["url"] for c in content if c["type"] == "image_url"]
+        indexes = json.loads(content[0]["text"].split("pages ")[1].split(" of")[0])
+        self.requests.append({"indexes": indexes, "images": images})
+        with self._lock:
+            self.in_flight -= 1
+        pages = [
+            {"index": i, "text": f"Vision page {i}", "confidence": 0.9} for i in indexes
+        ]
+        return {
+            "model": body["model"],
+            "choices": [{"message": {"content": json.dumps({"pages": pages})}}],
+            "usage": {"prompt_tokens": 1000 * len(images), "completion_tokens": 200},
+        }
+
+
+@pytest.fixture
+def stand_in():
+    state = StandIn()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["content-length"])))
+            reply = json.dumps(state.handle(body)).encode()
+            self.send_response(200)
+            self.send_header("content-type", "application/json")
+            self.send_header("content-length", str(len(reply)))
+            self.end_headers()
+            self.wfile.write(reply)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state.url = f"http://127.0.0.1:{server.server_port}/v1/chat/completions"
+    yield state
+    server.shutdown()
+
+
+@pytest.fixture
+def monitor(tmp_path):
+    monitor = CostMonitor(storage_path=str(tmp_path / "usage.json"))
+    with (
+        patch("vision_router.fallback.cost_monitor", monitor),
+        patch("cost_control_agent.enforcer.cost_monitor", monitor),
+    ):
+        yield monitor
+
+
+@pytest.fixture
+def scanned_pdf(tmp_path):
+    path = tmp_path / "scan.pdf"
+    pages = [Image.new("RGB", (2480, 3508), "white") for _ in range(6)]
+    pages[0].save(path, "PDF", save_all=True, append_images=pages[1:])
+    return str(path)
+
+
+def test_encode_page_bounds_resolution_and_size():
+    photo = Image.new("RGB", (4000, 3000), "white")
+    data = encode_page(photo, max_edge=1600, fmt="WEBP", quality=70)
+    encoded = Image.open(io.BytesIO(data))
+    assert encoded.format == "WEBP"
+    assert max(encoded.size) == 1600
+    # Small pages are never upscaled
+    assert Image.open(io.BytesIO(encode_page(Image.new("L", (800, 600))))).size == (
+        800,
+        600,
+    )
+
+
+@pytest.mark.asyncio
+async def test_pages_are_batched_and_concurrency_limited(
+    stand_in, monitor, scanned_pdf
+):
+    fallback = VisionLLMFallback(
+        api_url=stand_in.url, api_key="test", max_concurrency=1, batch_pages=2
+    )
+    result = await fallback.read_pages(scanned_pdf, [0, 2, 3, 4, 5])
+
+    assert sorted(r["indexes"] for r in stand_in.requests) == [[0, 2], [3, 4], [5]]
+    assert stand_in.max_in_flight == 1
+    assert result["pages"][4] == {"text": "Vision page 4", "confidence": 0.9}
+    assert result["requests"] == 3
+    assert result["latency_ms"] > 0
+    assert result["cost_usd"] > 0
+    assert monitor.get_daily_usage()["total_tokens"] == 5000 + 3 * 200
+
+    # Uploaded as JPEG at the bounded resolution
+    url = stand_in.requests[0]["images"][0]
+    assert url.startswith("data:image/jpeg;base64,")
+    image = Image.open(io.BytesIO(base64.b64decode(url.split(",", 1)[1])))
+    assert max(image.size) == 1600
+    assert fallback.stats()["pages"] == 5
+
+
+@pytest.mark.asyncio
+async def test_budget_exhausted_blocks_request(stand_in, monitor, scanned_pdf):
+    monitor.track_usage("default", 20_000_000, 0)
+    fallback = VisionLLMFallback(api_url=stand_in.url, api_key="test")
+    with pytest.raises(PermissionError):
+        await fallback.read_pages(scanned_pdf, [0])
+    assert stand_in.requests == []
+
+
+@pytest.mark.asyncio
+async def test_router_sends_only_low_confidence_pages(stand_in, monitor, scanned_pdf):
+    router = VisionRouter(executor=OCRExecutor(max_workers=0))
+    analysis = DocumentAnalysis(
+        pages=[
+            PageAnalysis(index=0, text="Clear page", confidence=0.95),
+            PageAnalysis(index=1, text="blurry", confidence=0.3),
+        ]
+    )
+    fallback = VisionLLMFallback(api_url=stand_in.url, api_key="test")
+    with patch("vision_router.router.vision_fallback", fallback):
+        result = await router.process_with_vision_llm(scanned_pdf, analysis)
+
+    assert [r["indexes"] for r in stand_in.requests] == [[1]]
+    assert result["method"] == "vision_llm"
+    assert result["raw_text"] == "Clear page\n\nVision page 1"
+    assert [p["method"] for p in result["pages"]] == ["local_tesseract", "vision_llm"]
+    assert result["vision_fallback"]["requests"] == 1
+
+
+@pytest.mark.asyncio
+async def test_unconfigured_fallback_keeps_local_result(scanned_pdf):
+    router = VisionRouter(executor=OCRExecutor(max_workers=0))
+    analysis = DocumentAnalysis(
+        pages=[PageAnalysis(index=0, text="blurry", confidence=0.3)]
+    )
+    with patch("vision_router.router.vision_fallback", VisionLLMFallback(api_url="")):
+        result = await router.process_with_vision_llm(scanned_pdf, analysis)
+
+    assert result["raw_text"] == "blurry"
+    assert result["method"] == "local_tesseract"
+    assert result["confidence"] == pytest.approx(0.3)
+
+
+@pytest.mark.asyncio
+async def test_failed_fallback_keeps_local_result_escalated(scanned_pdf):
+    router = VisionRouter(executor=OCRExecutor(max_workers=0))
+    analysis = DocumentAnalysis(
+        pages=[
+            PageAnalysis(index=0, text="Clear page", confidence=0.7),
+            PageAnalysis(index=1, text="blurry", confidence=0.3),
+        ]
+    )
+    fallback = VisionLLMFallback(api_url="http://127.0.0.1:9/v1/chat/completions")
+    with (
+        patch("vision_router.router.vision_fallback", fallback),
+        patch.object(
+            fallback, "read_pages", AsyncMock(side_effect=ConnectionError("refused"))
+        ),
+        patch.object(router, "analyze", AsyncMock(return_value=analysis)),
+    ):
+        result = await router.process_document(scanned_pdf)
+
+    assert "error" not in result
+    assert result["raw_text"] == "Clear page\n\nblurry"
+    assert result["method"] == "local_tesseract"
+    assert result["needs_escalation"] is True
+    assert result["vision_fallback"]["error"] == "refused"
+
+
+def test_fallback_is_off_without_an_endpoint():
+    assert VisionLLMFallback(api_url="", api_key="key").configured is False
+    assert VisionLLMFallback(api_url="http://ocr.local/v1", api_key="").configured
@@ -1,39 +1,51 @@
 import pytest
 from unittest.mock import patch, AsyncMock
+from PIL import Image
+from pypdf import PdfWriter
 from vision_router.router import VisionRouter
+from vision_router.executor import OCRExecutor
+from vision_router.pages import merge_pages
 
 
 @pytest.fixture
 def vision_router():
-    return VisionRouter()
+    # In-process executor so the pytesseract patches below apply
+    return VisionRouter(executor=OCRExecutor(max_workers=0))
 
 
 @pytest.mark.asyncio
-async def test_process_document_high_confidence(vision_router):
+async def test_process_document_high_confidence(vision_router, tesseract_data):
     """Test standard local OCR path."""
     with (
-        patch("vision_router.router.Image.open"),
-        patch("vision_router.router.pytesseract.image_to_string") as mock_ocr,
+        patch(
+            "vision_router.analysis.Image.open", return_value=Image.new("RGB", (64, 64))
+        ),
+        patch("vision_router.engine.pytesseract.image_to_data") as mock_ocr,
     ):
-        # Mock high confidence text (len > 100)
-        mock_ocr.return_value = "A" * 150
+        # Short but confidently read: no fallback, and the probe pass is enough
+        mock_ocr.return_value = tesseract_data("TIN 0012345678", conf=95)
 
         result = await vision_router.process_document("dummy.jpg")
 
         assert result["method"] == "local_tesseract"
-        assert result["confidence"] >= 0.85
+        assert result["confidence"] == pytest.approx(0.95)
+        assert result["ocr_passes"] == 1
+        # Blank test image: the detectors find neither
+        assert result["features"] == {"has_stamp": False, "has_signature": False}
         assert result["needs_escalation"] is False
 
 
 @pytest.mark.asyncio
-async def test_process_document_low_confidence_fallback(vision_router):
+async def test_process_document_low_confidence_fallback(vision_router, tesseract_data):
     """Test fallback to Vision LLM when local OCR fails."""
     with (
-        patch("vision_router.router.Image.open"),
-        patch("vision_router.router.pytesseract.image_to_string") as mock_ocr,
+        patch(
+            "vision_router.analysis.Image.open", return_value=Image.new("RGB", (64, 64))
+        ),
+        patch("vision_router.engine.pytesseract.image_to_data") as mock_ocr,
     ):
         # Mock low confidence text
-        mock_ocr.return_value = "Blurry text"
+        mock_ocr.return_value = tesseract_data("Blurry text", conf=30)
 
         # Use simple object patching for the async method
         vision_router.process_with_vision_llm = AsyncMock(
@@ -50,3 +62,95 @@ async def test_process_document_low_confidence_fallback(vision_router):
         assert result["local_text"] == "Blurry text"
         # Check fallback was called
         vision_router.process_with_vision_llm.assert_called_once()
+
+
+def _text_pdf(text: str) -> bytes:
+    """Builds a one-page PDF with a real text layer."""
+    stream = f"BT /F1 12 Tf 72 720 Td ({text}) Tj ET".encode()
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+        b"/Resources << /Font << /F1 4 0 R >> >> /Contents 5 0 R >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream",
+    ]
+    out = b"%PDF-1.4\n"
+    offsets = []
+    for i, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % i + obj + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % o for o in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1,
+        xref,
+    )
+    return out
+
+
+@pytest.fixture
+def mixed_pdf(tmp_path):
+    """Page 1 is digitally issued (text layer), page 2 is a scanned image."""
+    text_path = tmp_path / "text.pdf"
+    text_path.write_bytes(
+        _text_pdf("Trade License No. AA-12345 issued by Bole sub-city")
+    )
+    scan_path = tmp_path / "scan.pdf"
+    Image.new("RGB", (200, 100), "white").save(scan_path, "PDF")
+
+    writer = PdfWriter()
+    writer.append(str(text_path))
+    writer.append(str(scan_path))
+    path = tmp_path / "upload.bin"
+    with open(path, "wb") as f:
+        writer.write(f)
+    return str(path)
+
+
+@pytest.mark.asyncio
+async def test_process_pdf_skips_ocr_on_text_layer_pages(
+    vision_router, mixed_pdf, tesseract_data
+):
+    with patch("vision_router.engine.pytesseract.image_to_data") as mock_ocr:
+        # Below the early-exit bar, so the probe is followed by a full pass
+        mock_ocr.return_value = tesseract_data(
+            "Scanned lease agreement page " * 5, conf=80
+        )
+
+        finished = []
+
+        async def on_page(page, page_count):
+            finished.append((page.index, page_count))
+
+        result = await vision_router.process_document(mixed_pdf, on_page=on_page)
+
+        # Each page is reported as it finishes
+        assert sorted(finished) == [(0, 2), (1, 2)]
+        # Only the scanned page went through Tesseract: a script probe, then
+        # the full pass with the detected language pack alone
+        assert mock_ocr.call_count == 2
+        assert mock_ocr.call_args.kwargs["lang"] == "eng"
+        assert result["page_count"] == 2
+        assert result["method"] == "local_tesseract"
+        assert result["needs_escalation"] is False
+
+        first, second = result["pages"]
+        assert first["method"] == "pdf_text_layer"
+        assert second["method"] == "local_tesseract"
+        assert result["ocr_langs"] == {"eng": 2}
+        text = result["raw_text"]
+        assert text[first["offset"] :].startswith("Trade License No. AA-12345")
+        assert text[second["offset"] :].startswith("Scanned lease agreement")
+
+
+def test_merge_pages_orders_and_offsets():
+    merged = merge_pages(
+        [
+            {"index": 1, "text": "second", "method": "m", "confidence": 0.5},
+            {"index": 0, "text": "first", "method": "m", "confidence": 0.5},
+        ]
+    )
+    assert merged["raw_text"] == "first\n\nsecond"
+    assert [p["offset"] for p in merged["pages"]] == [0, 7]
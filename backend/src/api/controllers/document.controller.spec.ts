@@ -35,6 +35,7 @@ describe("DocumentController", () => {
       id: "analysis-uuid-123",
       status: "COMPLETED",
       results: { status: "PASS" },
+      progress: { page_count: 1, pages_done: 1, pages: [{ index: 0 }] },
     }),
   } as Partial<DocumentService>;
 
@@ -156,6 +157,7 @@ describe("DocumentController", () => {
     expect(result).toEqual({
       status: "COMPLETED",
       results: { status: "PASS" },
+      progress: { page_count: 1, pages_done: 1, pages: [{ index: 0 }] },
     });
   });
 });
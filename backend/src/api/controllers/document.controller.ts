@@ -112,6 +112,8 @@ export class DocumentController {
     return {
       status: analysis.status,
       results: analysis.results,
+      // Pages finished so far; kept after a failure or timeout
+      progress: analysis.progress,
     };
   }
 }
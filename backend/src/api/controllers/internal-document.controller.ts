@@ -1,4 +1,15 @@
-import { Controller, Get, Param, Post, Body, UseGuards } from "@nestjs/common";
+import {
+  Controller,
+  Get,
+  Param,
+  Post,
+  Body,
+  UseGuards,
+  Headers,
+  Res,
+  StreamableFile,
+} from "@nestjs/common";
+import { Response } from "express";
 import { ApiTags, ApiOperation, ApiParam } from "@nestjs/swagger";
 import { InternalTokenGuard } from "../../modules/auth/internal-token.guard";
 import { DocumentService } from "../../modules/document/document.service";
@@ -32,8 +43,19 @@ export class InternalDocumentController {
   @Get("documents/:documentId/download")
   @ApiOperation({ summary: "Internal: download document bytes" })
   @ApiParam({ name: "documentId", type: "string", format: "uuid" })
-  async downloadDocument(@Param("documentId") documentId: string) {
+  async downloadDocument(
+    @Param("documentId") documentId: string,
+    @Headers("accept") accept: string | undefined,
+    @Res({ passthrough: true }) res: Response,
+  ) {
     const doc = await this.documentService.getDocumentOrThrow(documentId);
+    // Agents negotiate a raw stream so large scans never sit in memory as base64.
+    if (accept?.includes("application/octet-stream")) {
+      const stream = await this.storageService.getFileStream(doc.storage_path);
+      res.setHeader("X-Document-Mime-Type", doc.mime_type ?? "");
+      return new StreamableFile(stream, { type: "application/octet-stream" });
+    }
+
     const bytes = await this.storageService.downloadFile(doc.storage_path);
     // Nest will serialize Buffer as base64 in JSON if returned directly.
     // We return a JSON payload for simplicity in this MVP wiring step.
@@ -59,6 +81,25 @@ export class InternalDocumentController {
     return { id: analysis.id, status: analysis.status };
   }
 
+  @Post("analyses/:analysisId/progress")
+  @ApiOperation({ summary: "Internal: record per-page partial results" })
+  @ApiParam({ name: "analysisId", type: "string", format: "uuid" })
+  async recordProgress(
+    @Param("analysisId") analysisId: string,
+    @Body() body: { page_count?: number | null; pages: Record<string, any>[] },
+  ) {
+    const analysis = await this.documentService.recordAnalysisProgress({
+      analysisId,
+      pageCount: body.page_count,
+      pages: body.pages ?? [],
+    });
+    return {
+      id: analysis.id,
+      status: analysis.status,
+      pages_done: analysis.progress?.pages_done ?? 0,
+    };
+  }
+
   @Post("analyses/:analysisId/fail")
   @ApiOperation({ summary: "Internal: mark analysis failed" })
   @ApiParam({ name: "analysisId", type: "string", format: "uuid" })
@@ -8,6 +8,12 @@ import {
 
 export type AnalysisStatus = "PROCESSING" | "COMPLETED" | "FAILED";
 
+export interface AnalysisProgress {
+  page_count: number | null;
+  pages_done: number;
+  pages: Record<string, any>[];
+}
+
 @Entity("analyses")
 export class Analysis {
   @PrimaryGeneratedColumn("uuid")
@@ -26,6 +32,10 @@ export class Analysis {
   @Column("jsonb", { nullable: true })
   results: any | null;
 
+  // Per-page partial results streamed by the agents while the analysis runs
+  @Column("jsonb", { nullable: true })
+  progress: AnalysisProgress | null;
+
   @Column({ nullable: true })
   workflow_id: string | null;
 
@@ -81,6 +81,31 @@ export class DocumentService {
     return this.analysisRepository.save(analysis);
   }
 
+  async recordAnalysisProgress(options: {
+    analysisId: string;
+    pageCount?: number | null;
+    pages: Record<string, any>[];
+  }): Promise<Analysis> {
+    const analysis = await this.getAnalysisOrThrow(options.analysisId);
+    if (analysis.status !== "PROCESSING") {
+      // A late batch must not reopen a finished analysis
+      return analysis;
+    }
+    // Pages are keyed by index so a retried activity overwrites, not duplicates
+    const pages = new Map<number, Record<string, any>>(
+      (analysis.progress?.pages ?? []).map((page) => [page.index, page]),
+    );
+    for (const page of options.pages) {
+      pages.set(page.index, page);
+    }
+    analysis.progress = {
+      page_count: options.pageCount ?? analysis.progress?.page_count ?? null,
+      pages_done: pages.size,
+      pages: [...pages.values()].sort((a, b) => a.index - b.index),
+    };
+    return this.analysisRepository.save(analysis);
+  }
+
   async failAnalysis(options: {
     analysisId: string;
     error: any;
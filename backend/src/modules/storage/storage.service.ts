@@ -1,5 +1,6 @@
 import { Injectable, Logger } from "@nestjs/common";
 import * as Minio from "minio";
+import { Readable } from "stream";
 
 @Injectable()
 export class StorageService {
@@ -59,13 +60,7 @@ export class StorageService {
   }
 
   async downloadFile(storagePath: string): Promise<Buffer> {
-    const [bucket, ...rest] = storagePath.split("/");
-    const objectName = rest.join("/");
-    if (!bucket || !objectName) {
-      throw new Error(`Invalid storage path: ${storagePath}`);
-    }
-
-    const stream = await this.minioClient.getObject(bucket, objectName);
+    const stream = await this.getFileStream(storagePath);
     const chunks: Buffer[] = [];
     await new Promise<void>((resolve, reject) => {
       stream.on("data", (chunk) => chunks.push(Buffer.from(chunk)));
@@ -74,4 +69,14 @@ export class StorageService {
     });
     return Buffer.concat(chunks);
   }
+
+  async getFileStream(storagePath: string): Promise<Readable> {
+    const [bucket, ...rest] = storagePath.split("/");
+    const objectName = rest.join("/");
+    if (!bucket || !objectName) {
+      throw new Error(`Invalid storage path: ${storagePath}`);
+    }
+
+    return this.minioClient.getObject(bucket, objectName);
+  }
 }